@@ -1,6 +0,0 @@
-# -*- coding: utf-8 -*-
-# @Time    : 5/16/2021 4:33 PM
-# @Author  : Mingdian Liu
-# @Email   : mingdian@iastate.edu lmdvigor@gmail.com
-# @File    : __init__.py
-# @Software: PyCharm
\ No newline at end of file
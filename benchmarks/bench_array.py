@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_array.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Script size (bytes and lines) and generation time of an n x n dipole array
+# created element by element versus through hfssArray(), which emits one
+# seed dipole plus DuplicateAlongLine commands. Both scripts are then run
+# through the VBScript interpreter, and must build the same parts (names
+# tracked by the ObjectRegistry) at the same places.
+#
+# Usage :
+# -------
+# python benchmarks/bench_array.py [n]
+# ----------------------------------------------------------------------------
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import general, modeler
+from hfss.interpreter import runScript
+from hfss.scriptwriter import ScriptWriter
+from hfss.spatial import ObjectRegistry
+
+
+def dipole(fid, Name, Position):
+    modeler.hfssDipole(fid, Name, 'Z', Position, 10, 0.5, 0.2, 'mm')
+
+
+def explicit(fid, Positions):
+    for i, Position in enumerate(Positions):
+        dipole(fid, 'Dip_' + str(i + 1), Position)
+
+
+def duplicated(fid, Positions):
+    modeler.hfssArray(fid, dipole, 'Dip', Positions, 'mm')
+
+
+def run(label, build, Positions):
+    registry = ObjectRegistry()
+    fid = ScriptWriter(observers=[registry.record])
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'Array')
+    t0 = time.perf_counter()
+    build(fid, Positions)
+    elapsed = time.perf_counter() - t0
+    text = fid.getvalue()
+    print('{0:<10s} {1:>12d} bytes {2:>10d} lines {3:>10.3f} s'.format(
+        label, len(text), text.count('\n'), elapsed))
+    return text, registry
+
+
+# Checks that the script runs and that the parts it creates are the ones
+# tracked by the registry; returns the sorted bounds of the parts.
+def validate(label, text, registry):
+    report = runScript(text)
+    if report.errors:
+        raise Exception('{0}: {1} !!'.format(label, report.errors[0]))
+    parts = set(key.split('/', 1)[1] for key in report.objects)
+    if parts != set(registry.boxes):
+        raise Exception('{0}: {1} parts created, {2} tracked !!'.format(
+            label, len(parts), len(registry.boxes)))
+    return sorted(tuple(np.round(np.concatenate(entry[:2]) * 1e9).astype(np.int64))
+                  for entry in registry.boxes.values())
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    ix, iy = np.meshgrid(np.arange(n), np.arange(n))
+    Positions = np.column_stack([ix.ravel(), iy.ravel(), np.zeros(n * n)]) * 15
+    print('{0}x{0} dipole array'.format(n))
+    bounds = [validate(label, *run(label, build, Positions))
+              for label, build in (('explicit', explicit), ('hfssArray', duplicated))]
+    if bounds[0] != bounds[1]:
+        raise Exception('hfssArray does not build the same parts as the explicit script !!')
+    print('both scripts build the same {0} parts'.format(len(bounds[0])))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_booleans.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Number of boolean commands, script size and generation time of a plate
+# drilled with n holes, for several chunk sizes of hfssSubtract (a chunk
+# size of 1 is one Subtract per hole, as hfssBox used to emit).
+#
+# Usage :
+# -------
+# python benchmarks/bench_booleans.py [nHoles]
+# ----------------------------------------------------------------------------
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import booleans, modeler
+
+
+def plate(fid, nHoles):
+    n = int(nHoles ** 0.5) + 1
+    Holes = []
+    for i in range(nHoles):
+        Holes += [[1 + 2 * (i % n), 1 + 2 * (i // n), 0], 0.4, 'Z']
+    modeler.hfssBox(fid, 'Plate', [0, 0, 0], [2 * n, 2 * n, 1.6], 'mm', *Holes)
+
+
+if __name__ == '__main__':
+    nHoles = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print('plate with {0} holes'.format(nHoles))
+    for ChunkSize in (1, 10, 100, 1000):
+        booleans.CHUNK_SIZE = ChunkSize
+        fid = io.StringIO()
+        t0 = time.perf_counter()
+        plate(fid, nHoles)
+        elapsed = time.perf_counter() - t0
+        text = fid.getvalue()
+        print('chunk {0:>5d}: {1:>6d} Subtracts {2:>10d} bytes {3:>8.3f} s'.format(
+            ChunkSize, text.count('oEditor.Subtract'), len(text), elapsed))
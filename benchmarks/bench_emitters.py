@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_emitters.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Script size and generation time of an n x n patch array (boxes, built one
+# by one) with the VBScript backend, the compact VBScript backend and the
+# Python backend, plus the time the Python interpreter needs to compile the
+# generated Python script (a lower bound of its replay time, without HFSS)
+# and the time the VBScript interpreter (see interpreter.py) needs to run
+# the verbose and the compact scripts, which are checked to be equivalent.
+#
+# Usage :
+# -------
+# python benchmarks/bench_emitters.py [n]
+# ----------------------------------------------------------------------------
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import general, modeler
+from hfss.emitters import CompactEmitter, PythonEmitter, VBScriptEmitter
+from hfss.interpreter import compareScripts, runScript
+from hfss.scriptwriter import ScriptWriter
+
+
+def build(fid, n):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'Array')
+    for i in range(n):
+        for j in range(n):
+            modeler.hfssBox(fid, 'Patch_{0}_{1}'.format(i, j), [15 * i, 15 * j, 0],
+                            [10, 12, 0.035], 'mm')
+
+
+def run(label, emitter, n):
+    fid = ScriptWriter(emitter=emitter)
+    t0 = time.perf_counter()
+    build(fid, n)
+    fid.close()
+    elapsed = time.perf_counter() - t0
+    text = fid.getvalue()
+    print('{0:<10s} {1:>12d} bytes {2:>10d} lines {3:>10.3f} s'.format(
+        label, len(text), text.count('\n'), elapsed))
+    return text
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    print('{0}x{0} patch array'.format(n))
+    verbose = run('VBScript', VBScriptEmitter(), n)
+    compact = run('Compact', CompactEmitter(), n)
+    text = run('Python', PythonEmitter(), n)
+    t0 = time.perf_counter()
+    compile(text, 'array.py', 'exec')
+    print('compile of the Python script: {0:.3f} s'.format(time.perf_counter() - t0))
+    for label, script in (('verbose', verbose), ('compact', compact)):
+        print('interpretation of the {0} script: {1:.3f} s'.format(
+            label, runScript(script).seconds))
+    differences = compareScripts(verbose, compact)
+    print('compact script equivalent: ' + ('yes' if not differences else differences[0]))
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_import.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Start-up cost of a short-lived generator worker: wall time of a fresh
+# interpreter that imports part of the hfss package (and generates one
+# cylinder), compared with an interpreter that does nothing. Also shows
+# whether NumPy ended up being imported.
+#
+# Usage :
+# -------
+# python benchmarks/bench_import.py [nRuns]
+# ----------------------------------------------------------------------------
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CASES = [
+    ('python only', 'pass'),
+    ('import hfss', 'import hfss'),
+    ('hfss.general', 'from hfss.general import hfssNewProject'),
+    ('hfss.modeler + 1 cylinder',
+     'import io\n'
+     'from hfss.modeler import hfssCylinder\n'
+     'hfssCylinder(io.StringIO(), "Via1", "Z", [0, 0, 0], 0.2, 1.6, "mm")'),
+    ('hfssCylinderArray',
+     'import io\n'
+     'from hfss.modeler import hfssCylinderArray\n'
+     'hfssCylinderArray(io.StringIO(), "Via", "Z", [[0, 0, 0], [1, 0, 0]], 0.2, 1.6, "mm")'),
+    ('numpy only', 'import numpy'),
+]
+
+
+def startup(code, nRuns):
+    code += '\nimport sys\nprint("numpy" in sys.modules)'
+    times = []
+    for _ in range(nRuns):
+        t0 = time.perf_counter()
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+        times.append(time.perf_counter() - t0)
+    return sorted(times)[len(times) // 2], output.decode().strip() == 'True'
+
+
+if __name__ == '__main__':
+    nRuns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print('{0:<28s} {1:>12s} {2:>8s}'.format('case', 'median (ms)', 'numpy'))
+    for label, code in CASES:
+        median, numpy = startup(code, nRuns)
+        print('{0:<28s} {1:>12.1f} {2:>8s}'.format(label, median * 1e3, 'yes' if numpy else 'no'))
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_results.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Reading a large synthetic Touchstone file: a plain line by line parser
+# against the memory mapped Touchstone reader (opening and indexing, full
+# load, a lazy slice of 1000 points, a frequency band), then the same data
+# split over several files read by readResults with a process pool.
+#
+# Usage :
+# -------
+# python benchmarks/bench_results.py [sizeMB] [nPorts] [nFiles] [workers]
+# ----------------------------------------------------------------------------
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss.results import Touchstone, readResults
+
+
+# Writes about sizeMB of random S-parameters (RI, 1 to 2 GHz) to path.
+def writeTouchstone(path, sizeMB, nPorts, blockRows=4096):
+    rng = np.random.default_rng(0)
+    pairs = nPorts * nPorts
+    perLine = pairs if nPorts <= 2 else 4
+    values = rng.uniform(-1, 1, (blockRows, 2 * pairs))
+    block = []
+    for row in values:
+        numbers = ['{0:.9e}'.format(value) for value in row]
+        lines = [' '.join(numbers[i:i + 2 * perLine]) for i in range(0, len(numbers), 2 * perLine)]
+        block.append(' ' + '\n '.join(lines) + '\n')
+    nPoints = max(1, int(sizeMB * 2 ** 20 / (16 + sum(map(len, block)) / blockRows)))
+    frequencies = np.linspace(1, 2, nPoints)
+    with open(path, 'w') as fid:
+        fid.write('! Synthetic {0}-port data\n# GHz S RI R 50\n'.format(nPorts))
+        for start in range(0, nPoints, blockRows):
+            fid.write(''.join('{0:.12f}'.format(frequencies[k]) + block[k - start]
+                              for k in range(start, min(start + blockRows, nPoints))))
+    return nPoints
+
+
+# Line by line parsing with Python floats (the usual hand written reader).
+def readLines(path):
+    rows = []
+    with open(path) as fid:
+        for line in fid:
+            if line[:1] in ('!', '#') or not line.strip():
+                continue
+            rows.extend(float(token) for token in line.split())
+    return np.array(rows)
+
+
+def band(f, S):
+    return float(np.abs(S[:, 0, 0]).max())
+
+
+def timed(name, function, *args):
+    t0 = time.perf_counter()
+    result = function(*args)
+    print('{0:<28s} {1:>8.3f} s'.format(name, time.perf_counter() - t0))
+    return result
+
+
+if __name__ == '__main__':
+    sizeMB = float(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    nPorts = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    nFiles = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    outDir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(outDir, 'big.s{0}p'.format(nPorts))
+        nPoints = writeTouchstone(path, sizeMB, nPorts)
+        print('{0} points, {1:.0f} MB'.format(nPoints, os.path.getsize(path) / 2 ** 20))
+
+        timed('line by line', readLines, path)
+        ts = timed('open (index)', Touchstone, path)
+        f, S = timed('load', ts.load)
+        middle = slice(nPoints // 2, nPoints // 2 + 1000)
+        f1, S1 = timed('slice of 1000 points', ts.__getitem__, middle)
+        timed('band 1.50-1.51 GHz', ts.between, 1.5, 1.51)
+        assert np.array_equal(S1, S[middle])
+        ts.close()
+        del f, S
+
+        paths = [os.path.join(outDir, 'part{0}.s{1}p'.format(i, nPorts)) for i in range(nFiles)]
+        for part in paths:
+            writeTouchstone(part, sizeMB / nFiles, nPorts)
+        timed('readResults, 1 process', readResults, paths, band, None, None, 1)
+        timed('readResults, pool', readResults, paths, band, None, None, workers)
+    finally:
+        shutil.rmtree(outDir)
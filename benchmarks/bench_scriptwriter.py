@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_scriptwriter.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Throughput of the primitive generators, in primitives/second. The "before"
+# case replays every block one line per write() call, which is what the
+# generators used to do; the other cases use one write() per block, either
+# straight to a file object or through a ScriptWriter.
+#
+# Usage :
+# -------
+# python benchmarks/bench_scriptwriter.py [nElements]
+# ----------------------------------------------------------------------------
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import modeler
+from hfss.scriptwriter import ScriptWriter
+
+
+class PerLineFile(object):
+    def __init__(self, path):
+        self._file = open(path, 'w', buffering=1)
+
+    def write(self, text):
+        for line in text.splitlines(True):
+            self._file.write(line)
+
+    def close(self):
+        self._file.close()
+
+
+def build(fid, nElements):
+    for i in range(nElements):
+        modeler.hfssCylinder(fid, 'Cyl' + str(i), 'Z', [i * 0.5, 0.0, 0.0], 0.1, 10, 'mm')
+        modeler.hfssBox(fid, 'Box' + str(i), [i * 0.5, 1.0, 0.0], [0.2, 0.2, 0.2], 'mm')
+        modeler.hfssRectangle(fid, 'Rect' + str(i), 'Z', [i * 0.5, 2.0, 0.0], 0.2, 0.4, 'mm')
+        modeler.hfssSubtract(fid, ['Box' + str(i)], ['Cyl' + str(i)])
+    return 4 * nElements
+
+
+def run(label, makeFid, nElements):
+    path = os.path.join(tempfile.mkdtemp(), 'bench.vbs')
+    fid = makeFid(path)
+    t0 = time.perf_counter()
+    count = build(fid, nElements)
+    fid.close()
+    elapsed = time.perf_counter() - t0
+    print('{0:<26s} {1:>12.0f} primitives/s  ({2} primitives, {3} bytes)'.format(
+        label, count / elapsed, count, os.path.getsize(path)))
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    nElements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    run('before: per-line writes', PerLineFile, nElements)
+    run('line-buffered file', lambda path: open(path, 'w', buffering=1), nElements)
+    run('plain file object', lambda path: open(path, 'w'), nElements)
+    run('ScriptWriter', ScriptWriter, nElements)
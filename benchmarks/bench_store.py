@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_store.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Memory per object (traced Python allocations) of N vias kept in memory
+# as parameter dictionaries, as the nodes of a Model and in a
+# PrimitiveStore, and the time to write the store back out as a script.
+#
+# Usage :
+# -------
+# python benchmarks/bench_store.py [nElements]
+# ----------------------------------------------------------------------------
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import modeler
+from hfss.model import Model
+from hfss.store import PrimitiveStore
+
+
+class DictSink(object):
+    def __init__(self):
+        self.objects = []
+
+    def write(self, text):
+        pass
+
+    def emit(self, kind, params, text):
+        self.objects.append(dict(params, kind=kind))
+
+
+def build(fid, nElements):
+    for i in range(nElements):
+        modeler.hfssCylinder(fid, 'Via' + str(i), 'Z', [0.5 * (i % 1000), 0.5 * (i // 1000), 0.0],
+                             0.1, 1.6, 'mm')
+
+
+def measure(label, sinkClass, nElements):
+    tracemalloc.start()
+    sink = sinkClass()
+    build(sink, nElements)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('{0:<16s} {1:>10.1f} bytes/object'.format(label, size / float(nElements)))
+    return sink
+
+
+if __name__ == '__main__':
+    nElements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print('{0} cylinders'.format(nElements))
+    measure('dicts', DictSink, nElements)
+    measure('Model', Model, nElements)
+    store = measure('PrimitiveStore', PrimitiveStore, nElements)
+    t0 = time.perf_counter()
+    fid = io.StringIO()
+    store.writeTo(fid)
+    print('writeTo: {0:.3f} s, {1} bytes'.format(time.perf_counter() - t0, len(fid.getvalue())))
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_stream.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Peak resident memory (RSS) of building an N-dipole script in memory versus
+# streaming it with the generator API to a file and to a gzip file. Every
+# measurement runs in a fresh interpreter, so the peaks do not mix.
+#
+# Usage :
+# -------
+# python benchmarks/bench_stream.py [N1 N2 ...]
+# ----------------------------------------------------------------------------
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+
+def dipoles(nElements):
+    from hfss.streaming import hfssDipoleIter
+    for i in range(nElements):
+        Center = [15 * (i % 1000), 15 * (i // 1000), 0]
+        for chunk in hfssDipoleIter('Dip' + str(i + 1), 'Z', Center, 10, 0.5, 0.2, 'mm'):
+            yield chunk
+
+
+def build(mode, nElements, path):
+    from hfss.scriptwriter import ScriptWriter
+    from hfss.streaming import streamScript
+    if mode == 'memory':
+        fid = ScriptWriter()
+        for chunk in dipoles(nElements):
+            fid.write(chunk)
+        with open(path, 'w') as target:
+            target.write(fid.getvalue())
+    elif mode == 'stream':
+        streamScript(dipoles(nElements), path)
+    else:
+        streamScript(dipoles(nElements), path + '.gz')
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(peak // 1024 if sys.platform == 'darwin' else peak)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        build(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+        sys.exit()
+
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'stream.vbs')
+    print('{0:>10s} {1:>14s} {2:>14s} {3:>14s}'.format('dipoles', 'memory', 'stream', 'gzip'))
+    for nElements in counts:
+        peaks = []
+        for mode in ('memory', 'stream', 'gzip'):
+            output = subprocess.check_output(
+                [sys.executable, os.path.abspath(__file__), '--child', mode,
+                 str(nElements), path])
+            peaks.append(int(output) / 1024.0)
+        print('{0:>10d} {1:>11.1f} MB {2:>11.1f} MB {3:>11.1f} MB'.format(nElements, *peaks))
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
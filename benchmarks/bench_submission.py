@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_submission.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Total time of generating and solving a sweep, with the solver replaced by
+# FakeExecutor (a fixed delay per script): first generating the whole batch
+# and then solving it, then streaming each script into the SubmissionQueue
+# as soon as it is written (solveSweep).
+#
+# Usage :
+# -------
+# python benchmarks/bench_submission.py [nVariants] [solveSeconds] [licenses]
+# ----------------------------------------------------------------------------
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import general, modeler
+from hfss.submission import FakeExecutor, SubmissionQueue, solveSweep
+from hfss.sweep import generateSweep
+
+
+def buildArray(fid, Length):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'Array')
+    for i in range(16):
+        for j in range(16):
+            modeler.hfssDipole(fid, 'Dip_{0}_{1}_'.format(i, j), 'Z', [15 * i, 15 * j, 0],
+                               Length, 0.5, 0.2, 'mm')
+
+
+async def batch(paramGrid, outDir, executor, licenses):
+    manifest = generateSweep(buildArray, paramGrid, outDir, workers=1)
+    async with SubmissionQueue(executor, licenses) as queue:
+        for path in manifest.values():
+            queue.submit(path)
+    return queue.status()
+
+
+async def streamed(paramGrid, outDir, executor, licenses):
+    jobs = await solveSweep(buildArray, paramGrid, outDir, executor, licenses, workers=1)
+    return {'done': sum(job.status == 'done' for job in jobs.values())}
+
+
+if __name__ == '__main__':
+    nVariants = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    solveSeconds = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    licenses = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    paramGrid = {'Length': [40 + 0.1 * i for i in range(nVariants)]}
+    for name, run in (('batch', batch), ('streamed', streamed)):
+        outDir = tempfile.mkdtemp()
+        t0 = time.perf_counter()
+        status = asyncio.run(run(paramGrid, outDir, FakeExecutor(solveSeconds), licenses))
+        elapsed = time.perf_counter() - t0
+        print('{0:<10s} {1:>8.2f} s  {2}'.format(name, elapsed, status))
+        shutil.rmtree(outDir)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# @File    : bench_sweep.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Variants/second of generateSweep() for an increasing number of worker
+# processes. Each variant is a 16x16 dipole array script. The last lines
+# pack the same variants into projects of 50 designs (generateBatch) and
+# report how many HFSS project start-ups the batch needs.
+#
+# Usage :
+# -------
+# python benchmarks/bench_sweep.py [nVariants]
+# ----------------------------------------------------------------------------
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import general, modeler
+from hfss.sweep import generateBatch, generateSweep
+
+
+def buildArray(fid, Length, gapLen):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'Array')
+    arrayGeometry(fid, Length, gapLen)
+
+
+def arrayGeometry(fid, Length, gapLen):
+    for i in range(16):
+        for j in range(16):
+            modeler.hfssDipole(fid, 'Dip_{0}_{1}_'.format(i, j), 'Z', [15 * i, 15 * j, 0],
+                               Length, 0.5, gapLen, 'mm')
+
+
+if __name__ == '__main__':
+    nVariants = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    paramGrid = {'Length': [40 + 0.1 * i for i in range(nVariants // 4)],
+                 'gapLen': [0.1, 0.2, 0.3, 0.4]}
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        outDir = tempfile.mkdtemp()
+        t0 = time.perf_counter()
+        manifest = generateSweep(buildArray, paramGrid, outDir, workers=workers)
+        elapsed = time.perf_counter() - t0
+        print('{0:>3d} workers {1:>10.1f} variants/s'.format(workers, len(manifest) / elapsed))
+        shutil.rmtree(outDir)
+        workers *= 2
+
+    outDir = tempfile.mkdtemp()
+    t0 = time.perf_counter()
+    designs = generateBatch(arrayGeometry, paramGrid, outDir, designsPerProject=50, workers=1)
+    elapsed = time.perf_counter() - t0
+    nProjects = len([name for name in os.listdir(outDir) if name.endswith('.vbs')])
+    print('batch of 50 {0:>9.1f} variants/s, {1} projects instead of {2}'.format(
+        len(designs) / elapsed, nProjects, len(designs)))
+    shutil.rmtree(outDir)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# @File    : suite.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# Benchmark suite of the script generators. Every case builds a script into
+# an in-memory sink and records:
+#
+#   seconds   - best wall time over the repeats,
+#   bytes     - size of the script produced,
+#   peakBytes - peak of the Python allocations while building it
+#               (tracemalloc, measured in a separate run).
+#
+# The results are written as JSON to benchmarks/results/<commit>.json (the
+# current git commit, or 'local'; the directory is not tracked), so that two
+# commits can be compared with --compare, which flags the cases that got
+# bigger or hungrier by more than the threshold, or slower by more than the
+# time threshold. Wall times are noisy even as a best of N, so the time
+# threshold is larger; raise --repeat (or the threshold) on a busy machine.
+#
+# Usage :
+# -------
+# python benchmarks/suite.py [--repeat N] [--quick] [--filter TEXT] [--output FILE]
+# python benchmarks/suite.py --compare OLD.json NEW.json [--threshold 0.1]
+#                            [--time-threshold 0.25]
+# ----------------------------------------------------------------------------
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+
+from hfss import general, modeler
+
+
+def dipoles(Type, nElements):
+    def build(fid):
+        for i in range(nElements):
+            modeler.hfssDipole(fid, 'Dip' + str(i + 1) + '_', 'Z',
+                               [15 * (i % 100), 15 * (i // 100), 0], 10, 0.5, 0.2, 'mm', Type)
+    return build
+
+
+def boxHoles(nHoles):
+    def build(fid):
+        n = int(nHoles ** 0.5) + 1
+        Holes = []
+        for i in range(nHoles):
+            Holes += [[1 + 2 * (i % n), 1 + 2 * (i // n), 0], 0.4, 'Z']
+        modeler.hfssBox(fid, 'Plate', [0, 0, 0], [2 * n, 2 * n, 1.6], 'mm', *Holes)
+    return build
+
+
+def longSubtract(nTools):
+    Tools = ['Via' + str(i + 1) for i in range(nTools)]
+
+    def build(fid):
+        modeler.hfssSubtract(fid, ['Board'], Tools)
+    return build
+
+
+def project(nElements):
+    def build(fid):
+        general.hfssNewProject(fid)
+        general.hfssInsertDesign(fid, 'Array')
+        for i in range(nElements):
+            modeler.hfssDipole(fid, 'Dip' + str(i + 1) + '_', 'Z',
+                               [15 * (i % 1000), 15 * (i // 1000), 0], 10, 0.5, 0.2, 'mm')
+    return build
+
+
+# name -> (builder, part of the quick run)
+CASES = {
+    'dipole_c_1k': (dipoles('c', 1000), True),
+    'dipole_r_1k': (dipoles('r', 1000), True),
+    'dipole_s_1k': (dipoles('s', 1000), True),
+    'box_holes_0': (boxHoles(0), True),
+    'box_holes_10': (boxHoles(10), True),
+    'box_holes_1000': (boxHoles(1000), True),
+    'subtract_10k_tools': (longSubtract(10000), True),
+    'project_10': (project(10), True),
+    'project_1k': (project(1000), True),
+    'project_100k': (project(100000), False),
+}
+
+
+def measure(build, repeat):
+    best = None
+    for _ in range(repeat):
+        fid = io.StringIO()
+        t0 = time.perf_counter()
+        build(fid)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    size = len(fid.getvalue().encode('utf-8'))
+    del fid
+
+    tracemalloc.start()
+    fid = io.StringIO()
+    build(fid)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': best, 'bytes': size, 'peakBytes': peak}
+
+
+def commitId():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def run(args):
+    commit = commitId()
+    results = {}
+    print('{0:<20s} {1:>10s} {2:>12s} {3:>12s}'.format('case', 'seconds', 'bytes', 'peak bytes'))
+    for name, (build, quick) in CASES.items():
+        if (args.quick and not quick) or (args.filter and args.filter not in name):
+            continue
+        results[name] = measure(build, args.repeat)
+        print('{0:<20s} {seconds:>10.4f} {bytes:>12d} {peakBytes:>12d}'.format(
+            name, **results[name]))
+
+    output = args.output or os.path.join(HERE, 'results', commit + '.json')
+    if not os.path.isdir(os.path.dirname(os.path.abspath(output))):
+        os.makedirs(os.path.dirname(os.path.abspath(output)))
+    with open(output, 'w') as target:
+        json.dump({'commit': commit, 'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'python': platform.python_version(), 'machine': platform.machine(),
+                   'repeat': args.repeat, 'results': results}, target, indent=1, sort_keys=True)
+    print('results written to ' + output)
+
+
+def compare(args):
+    with open(args.compare[0]) as source:
+        old = json.load(source)
+    with open(args.compare[1]) as source:
+        new = json.load(source)
+    print('{0} -> {1}'.format(old['commit'], new['commit']))
+    print('{0:<20s} {1:>10s} {2:>10s} {3:>10s}'.format('case', 'seconds', 'bytes', 'peak'))
+    regressions = 0
+    for name in sorted(set(old['results']) & set(new['results'])):
+        ratios = []
+        flag = ''
+        for metric in ('seconds', 'bytes', 'peakBytes'):
+            before = old['results'][name][metric]
+            after = new['results'][name][metric]
+            ratio = after / float(before) if before else 1.0
+            ratios.append(ratio)
+            threshold = args.time_threshold if metric == 'seconds' else args.threshold
+            if ratio > 1 + threshold:
+                flag = '  <-- regression'
+        regressions += bool(flag)
+        print('{0:<20s} {1:>9.2f}x {2:>9.2f}x {3:>9.2f}x{4}'.format(name, *(ratios + [flag])))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Script generation benchmarks.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs per case, the best time is kept (default 5)')
+    parser.add_argument('--quick', action='store_true', help='skip the 100k element case')
+    parser.add_argument('--filter', default='', help='run the cases containing this text')
+    parser.add_argument('--output', help='result file (default benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative increase of the size or peak memory reported as a '
+                             'regression (default 0.1)')
+    parser.add_argument('--time-threshold', type=float, default=0.25,
+                        help='relative increase of the best time reported as a regression '
+                             '(default 0.25)')
+    args = parser.parse_args()
+    if args.compare:
+        sys.exit(1 if compare(args) else 0)
+    run(args)
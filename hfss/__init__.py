@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# @Time    : 5/16/2021 4:33 PM
+# @Author  : Mingdian Liu
+# @Email   : mingdian@iastate.edu lmdvigor@gmail.com
+# @File    : __init__.py
+# @Software: PyCharm
+
+# ----------------------------------------------------------------------------
+# HFSS-Python-API
+#
+# The generators live in the submodules (hfss.general, hfss.modeler, ...),
+# which are only imported on first use, e.g.
+#
+#   from hfss.general import hfssNewProject, hfssInsertDesign
+#   from hfss.modeler import hfssCylinder
+#
+# or, through the package itself:
+#
+#   import hfss
+#   hfss.modeler.hfssCylinder(fid, 'Via1', 'Z', [0, 0, 0], 0.2, 1.6, 'mm')
+#   fid = hfss.ScriptWriter('board.vbs')
+#
+# NumPy is only imported by the batched paths (the *Array generators,
+# hfssArray, holes of hfssBox, ObjectRegistry, PrimitiveStore, ...) and by
+# hfss.results.
+# ----------------------------------------------------------------------------
+import importlib
+
+__all__ = ['booleans', 'cache', 'emitters', 'general', 'incremental', 'instrument',
+           'interpreter', 'mesh', 'model', 'modeler', 'results', 'scriptwriter', 'spatial',
+           'store', 'streaming', 'submission', 'sweep', 'symmetry']
+
+# Classes and functions available at package level -> submodule defining them.
+_EXPORTS = {
+    'ScriptWriter': 'scriptwriter',
+    'Model': 'model',
+    'ObjectRegistry': 'spatial',
+    'PrimitiveStore': 'store',
+    'ScriptCache': 'cache',
+    'Emitter': 'emitters',
+    'PythonEmitter': 'emitters',
+    'CompactEmitter': 'emitters',
+    'Profiler': 'instrument',
+    'generateSweep': 'sweep',
+    'generateBatch': 'sweep',
+    'buildIncremental': 'incremental',
+    'streamScript': 'streaming',
+    'runScript': 'interpreter',
+    'SubmissionQueue': 'submission',
+    'Touchstone': 'results',
+    'readResults': 'results',
+}
+__all__ += sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
+    if name in __all__:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module 'hfss' has no attribute '{0}'".format(name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
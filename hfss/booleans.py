@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# @File    : booleans.py
+# @Software: PyCharm
+
+from .scriptwriter import emit, profiled
+
+
+# Default maximum number of tool parts (or parts) per boolean command.
+CHUNK_SIZE = 100
+
+
+# ----------------------------------------------------------------------------
+# hfssSubtract(fid, blankParts, toolParts, [Clone], [ChunkSize])
+#
+# Description:
+# ------------
+# Creates the necessary VB script to subtract a set of tool parts from a set
+# of blank parts, a.k.a., will produce blank parts - tool parts. Nothing is
+# written without tool parts (HFSS rejects an empty selection).
+#
+# Parameters :
+# ------------
+# fid        - file identifier of the HFSS script file.
+# blankParts - a cell array of strings that contain the blank parts.
+# toolParts  - a cell array of strings that contain the tool parts.
+# Clone      - (Optional) 'true' to keep the tool parts (default 'false').
+# ChunkSize  - (Optional) maximum number of tool parts per Subtract command
+#              (default CHUNK_SIZE). Longer tool lists are split into
+#              several Subtracts on the same blank parts.
+#
+# Example :
+# ---------
+# fid = fopen('myantenna.vbs', 'wt');
+# ...
+# hfssSubtract(fid, {'BigPlate'}, {'SmallPlate'});
+#
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# This file is part of HFSS-MATLAB-API.
+#
+# HFSS-MATLAB-API is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation; either version 2 of the License, or (at your option)
+# any later version.
+#
+# HFSS-MATLAB-API is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Foobar; if not, write to the Free Software Foundation, Inc., 59 Temple
+# Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Copyright 2004, Vijay Ramasami (rvc@ku.edu)
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# CHANGELOG
+#
+# ??-????-2014: *Initial release (VR).
+# 07-Augu-2014: *Added option to clone parts (DRP).
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# Modified by Daniel Rodriguez Prado
+# danysan@gmail.com / drprado@tsc.uniovi.es
+# 07 August 2014
+# ----------------------------------------------------------------------------
+
+# Will result in blankParts - toolParts.
+@profiled
+def hfssSubtract(fid, blankParts, toolParts, Clone='false', ChunkSize=None):
+    # A single part may be given as a plain string.
+    if isinstance(blankParts, str):
+        blankParts = [blankParts]
+    if isinstance(toolParts, str):
+        toolParts = [toolParts]
+    if not blankParts:
+        raise Exception('No blank parts to subtract from !!')
+    if not toolParts:
+        return
+
+    Blanks = ','.join(blankParts)
+    for Tools in _chunks(toolParts, ChunkSize):
+        emit(fid, 'subtract', dict(blankParts=blankParts, toolParts=Tools, Clone=Clone),
+             # Preamble.
+             '\n'
+             'oEditor.Subtract _\n'
+             'Array("NAME:Selections", _\n'
+             # Add the Blank Parts.
+             '"Blank Parts:=", _\n'
+             '"{0}", _\n'
+             # Add the Tool Parts.
+             '"Tool Parts:=", _\n'
+             '"{1}"), _\n'
+             # Post-Amble.
+             'Array("NAME:SubtractParameters", _\n'
+             '"KeepOriginals:=", {2})\n'
+             .format(Blanks, ','.join(Tools), Clone))
+
+
+# ----------------------------------------------------------------------------
+# function hfssUnite(fid, Parts, [Clone], [ChunkSize])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to unite a set of parts. The result keeps
+# the name of the first part. Nothing is written for a single part.
+#
+# Parameters :
+# ------------
+# fid       - file identifier of the HFSS script file.
+# Parts     - list of the names of the parts to unite.
+# Clone     - (Optional) 'true' to keep the original parts (default 'false').
+# ChunkSize - (Optional) maximum number of parts per Unite command (default
+#             CHUNK_SIZE). Longer lists are united chunk by chunk into the
+#             first part.
+#
+# Example :
+# ---------
+# hfssUnite(fid, ['Patch', 'Feed', 'Stub']);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssUnite(fid, Parts, Clone='false', ChunkSize=None):
+    _combine(fid, 'unite', 'Unite', Parts, Clone, ChunkSize)
+
+
+# ----------------------------------------------------------------------------
+# function hfssIntersect(fid, Parts, [Clone], [ChunkSize])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to intersect a set of parts (keep only the
+# volume common to all of them). The result keeps the name of the first
+# part. Nothing is written for a single part.
+#
+# Parameters :
+# ------------
+# fid       - file identifier of the HFSS script file.
+# Parts     - list of the names of the parts to intersect.
+# Clone     - (Optional) 'true' to keep the original parts (default 'false').
+# ChunkSize - (Optional) maximum number of parts per Intersect command
+#             (default CHUNK_SIZE).
+#
+# Example :
+# ---------
+# hfssIntersect(fid, ['Substrate', 'Window']);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssIntersect(fid, Parts, Clone='false', ChunkSize=None):
+    _combine(fid, 'intersect', 'Intersect', Parts, Clone, ChunkSize)
+
+
+# Unite and Intersect are associative, so a long list is applied as the
+# first chunk and then, chunk after chunk, the result with the next parts.
+# A single part is left as it is (HFSS rejects a one-part selection).
+def _combine(fid, kind, command, Parts, Clone, ChunkSize):
+    if isinstance(Parts, str):
+        Parts = [Parts]
+    ChunkSize = CHUNK_SIZE if ChunkSize is None else ChunkSize
+    if ChunkSize < 2:
+        raise Exception('A {0} needs chunks of at least two parts, not {1} !!'
+                        .format(command, ChunkSize))
+    if not Parts:
+        raise Exception('No parts to {0} !!'.format(command.lower()))
+    if len(Parts) == 1:
+        return
+
+    First, Others = Parts[0], Parts[1:]
+    for Chunk in _chunks(Others, ChunkSize - 1):
+        Selection = [First] + Chunk
+        emit(fid, kind, dict(Parts=Selection, Clone=Clone),
+             '\n'
+             'oEditor.{0} _\n'
+             'Array("NAME:Selections", _\n'
+             '"Selections:=", "{1}"), _\n'
+             'Array("NAME:{0}Parameters", _\n'
+             '"KeepOriginals:=", {2})\n'
+             .format(command, ','.join(Selection), Clone))
+
+
+# Splits a list of parts into consecutive chunks of at most ChunkSize parts.
+def _chunks(Parts, ChunkSize):
+    ChunkSize = CHUNK_SIZE if ChunkSize is None else ChunkSize
+    if ChunkSize < 1:
+        raise Exception('ChunkSize must be at least 1, not {0} !!'.format(ChunkSize))
+    return [Parts[i:i + ChunkSize] for i in range(0, len(Parts), ChunkSize)]
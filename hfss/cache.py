@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+# @File    : cache.py
+# @Software: PyCharm
+
+import functools
+import hashlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+
+from .scriptwriter import ScriptWriter
+
+
+# ----------------------------------------------------------------------------
+# class ScriptCache(directory, [maxBytes], [memoryEntries])
+#
+# Description :
+# -------------
+# Opt-in, content-addressed cache of generated VB script. A cached call is
+# keyed by a hash of the generator (including the source of every module of
+# the package and of the module defining it, so editing the generators or
+# anything they call invalidates the cache) and of its normalized arguments; the emitted text is kept in a small in-memory LRU and in an
+# on-disk cache directory whose total size is capped by maxBytes (least
+# recently used entries are evicted first).
+#
+# Parameters :
+# ------------
+# directory     - cache directory (created if needed, may be shared by
+#                 several processes).
+# maxBytes      - (Optional) size cap of the cache directory (default 256 MiB).
+# memoryEntries - (Optional) number of entries also kept in memory (default
+#                 1024).
+#
+# Note :
+# ------
+# Calls whose arguments cannot be hashed (e.g. a lambda passed to hfssArray)
+# and calls writing to a sink that records structure (a Model, or a
+# ScriptWriter with observers) are passed through uncached. A cache hit only
+# replays the text, so side effects of the generator (e.g. holeStats) are
+# not repeated.
+#
+# Example :
+# ---------
+# cache = ScriptCache('.hfsscache')
+# cache.call(hfssDipole, fid, 'Dip', 'Z', [0, 0, 0], 48, 0.5, 1, 'mm')
+# box = cache.wrap(hfssBox)
+# box(fid, 'FR4', [0, 0, 0], [50, 50, 1.6], 'mm', [10, 10, 0], 0.4, 'Z')
+# print(cache.stats())
+# ----------------------------------------------------------------------------
+class ScriptCache(object):
+    def __init__(self, directory, maxBytes=256 << 20, memoryEntries=1024):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.memoryEntries = memoryEntries
+        self.hits = self.misses = self.bypassed = self.evictions = 0
+        self._memory = OrderedDict()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # On-disk index (key -> size), oldest use first.
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        self._disk = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._diskBytes = sum(self._disk.values())
+
+    # Calls generator(fid, *args, **kwargs), serving the text from the cache
+    # when possible. Returns whatever the generator returns.
+    def call(self, generator, fid, *args, **kwargs):
+        if _isStructured(fid):
+            self.bypassed += 1
+            return generator(fid, *args, **kwargs)
+        try:
+            key = self.key(generator, args, kwargs)
+        except TypeError:
+            self.bypassed += 1
+            return generator(fid, *args, **kwargs)
+
+        entry = self._load(key)
+        if entry is None:
+            self.misses += 1
+            buffer = io.StringIO()
+            entry = (generator(buffer, *args, **kwargs), buffer.getvalue())
+            self._store(key, entry)
+        else:
+            self.hits += 1
+        fid.write(entry[1])
+        return entry[0]
+
+    # Returns a cached version of a generator.
+    def wrap(self, generator):
+        @functools.wraps(generator)
+        def cached(fid, *args, **kwargs):
+            return self.call(generator, fid, *args, **kwargs)
+        return cached
+
+    def key(self, generator, args, kwargs):
+        digest = hashlib.sha256()
+        digest.update(_packageDigest(_PACKAGE))
+        digest.update(_moduleDigest(generator))
+        digest.update(generator.__qualname__.encode())
+        digest.update(repr(_normalize([list(args), kwargs])).encode())
+        return digest.hexdigest()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'bypassed': self.bypassed,
+                'evictions': self.evictions, 'entries': len(self._disk),
+                'bytes': self._diskBytes}
+
+    def clear(self):
+        for key in list(self._disk):
+            self._evict(key)
+        self._memory.clear()
+
+    def _load(self, key):
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            return entry
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as cacheFile:
+                entry = pickle.load(cacheFile)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if key in self._disk:
+            self._disk.move_to_end(key)
+        self._remember(key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        self._remember(key, entry)
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as cacheFile:
+            cacheFile.write(data)
+        os.replace(temporary, self._path(key))
+
+        self._diskBytes += len(data) - self._disk.pop(key, 0)
+        self._disk[key] = len(data)
+        while self._diskBytes > self.maxBytes and len(self._disk) > 1:
+            self._evict(next(iter(self._disk)))
+            self.evictions += 1
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        if len(self._memory) > self.memoryEntries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, key):
+        self._diskBytes -= self._disk.pop(key)
+        self._memory.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+
+# True if fid needs the structured calls, not only the text written to it.
+def _isStructured(fid):
+    if isinstance(fid, ScriptWriter):
+        return bool(fid.observers) or fid.emitter is not None
+    return getattr(fid, 'emit', None) is not None
+
+
+# Directory of the hfss package, whose modules all shape the emitted text
+# (the generators share the formatting helpers of modeler, the emit() of
+# scriptwriter, the emitters, ...).
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+
+
+# Hash of the source of every module of a package directory (names included,
+# so adding or removing a module changes it too).
+@functools.lru_cache(maxsize=None)
+def _packageDigest(directory):
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py'):
+            digest.update(name.encode())
+            digest.update(_fileDigest(os.path.join(directory, name)))
+    return digest.digest()
+
+
+# Hash of the source file of the module defining a generator (which may live
+# outside the package, e.g. a user's own composite generator).
+@functools.lru_cache(maxsize=None)
+def _fileDigest(path):
+    with open(path, 'rb') as source:
+        return hashlib.sha256(source.read()).digest()
+
+
+def _moduleDigest(generator):
+    module = sys.modules.get(generator.__module__)
+    path = getattr(module, '__file__', None)
+    if path is None:
+        raise TypeError('cannot locate the source of {0!r}'.format(generator))
+    return _fileDigest(path)
+
+
+# Canonical, hashable form of generator arguments. Types are kept because
+# they change the emitted text (1 and 1.0 are written differently).
+def _normalize(value):
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return (type(value).__name__, repr(value))
+    # NumPy values can only exist once NumPy has been imported by someone.
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(value, np.generic):
+        return ('np', value.dtype.str, repr(value.item()))
+    if np is not None and isinstance(value, np.ndarray):
+        # The bytes of an object (or string) array are not its values (e.g.
+        # the pointers to the elements), so those are normalized one by one.
+        if value.dtype.kind not in 'biufc':
+            return ('ndarray', value.dtype.str, value.shape, _normalize(value.tolist()))
+        return ('ndarray', value.dtype.str, value.shape,
+                hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, [_normalize(item) for item in value])
+    if isinstance(value, dict):
+        return ('dict', sorted((str(k), _normalize(v)) for k, v in value.items()))
+    if callable(value) and '<' not in value.__qualname__:
+        return ('fn', value.__module__, value.__qualname__)
+    raise TypeError('cannot normalize {0!r}'.format(value))
@@ -0,0 +1,565 @@
+# -*- coding: utf-8 -*-
+# @File    : emitters.py
+# @Software: PyCharm
+
+from . import general, modeler
+
+
+# ----------------------------------------------------------------------------
+# class Emitter()
+#
+# Description :
+# -------------
+# Script backend of a ScriptWriter (see its emitter parameter). Every block
+# produced by the hfss* generators goes through render(kind, params, text),
+# which returns the text to write in the target language (possibly empty,
+# if the block is kept for later), and finish() returns whatever is still
+# pending when the script is closed. Raw text written to the ScriptWriter
+# arrives with kind None.
+#
+# The base class is the VBScript backend: the generators already produce
+# VBScript, so the text is passed through unchanged.
+# ----------------------------------------------------------------------------
+class Emitter(object):
+    def render(self, kind, params, text):
+        return text
+
+    def finish(self):
+        return ''
+
+
+# The default backend.
+VBScriptEmitter = Emitter
+
+
+# ----------------------------------------------------------------------------
+# class CompactEmitter()
+#
+# Description :
+# -------------
+# Compact VBScript backend. The constant parts of the primitive blocks (the
+# Array("NAME:Attributes", ...) with Color, Flags, PartCoordinateSystem,
+# MaterialName and SolveInside) are written once, in the Subs MkCyl, MkBox
+# and MkRect, and every cylinder, box or rectangle becomes a single call:
+#
+#   MkCyl "Via1", "0mm", "0mm", "0mm", "0.2mm", "1.6mm", "Z"
+#
+# The Subs are defined before the first call; all other blocks are written
+# as by the default backend. A large array script shrinks about six times.
+#
+# Note :
+# ------
+# The model built by the script is the same as in the verbose mode, which
+# can be checked with compareScripts (see interpreter.py).
+#
+# Example :
+# ---------
+# with ScriptWriter('array.vbs', emitter=CompactEmitter()) as fid:
+#     hfssNewProject(fid)
+#     hfssInsertDesign(fid, 'Array')
+#     hfssCylinderArray(fid, 'Via', 'Z', Centers, 0.1, 1.6, 'mm')
+# ----------------------------------------------------------------------------
+class CompactEmitter(Emitter):
+    def __init__(self):
+        self._subs = False
+
+    def render(self, kind, params, text):
+        lines = self._calls(kind, params)
+        if lines is None:
+            return text
+        header = '' if self._subs else _SUBS
+        self._subs = True
+        return header + ''.join(lines)
+
+    # The call lines of a primitive block, or None for any other block.
+    def _calls(self, kind, params):
+        if kind == 'cylinder':
+            Center, Units = params['Center'], params['Units']
+            return [_MKCYL.format(params['Name'], *[modeler._dim(Value, Units) for Value in
+                                                    (Center[0], Center[1], Center[2],
+                                                     params['Radius'], params['Height'])]
+                                  + [params['Axis'].upper()])]
+        if kind == 'box':
+            Start, Size, Units = params['Start'], params['Size'], params['Units']
+            return [_MKBOX.format(params['Name'], *[modeler._dim(Value, Units) for Value in
+                                                    (Start[0], Start[1], Start[2],
+                                                     Size[0], Size[1], Size[2])])]
+        if kind == 'rectangle':
+            Start, Units = params['Start'], params['Units']
+            return [_MKRECT.format(params['Name'], *[modeler._dim(Value, Units) for Value in
+                                                     (Start[0], Start[1], Start[2],
+                                                      params['Width'], params['Height'])]
+                                   + [params['Axis'].upper()])]
+        if kind == 'cylinderarray':
+            Centers, Units, N = params['Centers'], params['Units'], len(params['Names'])
+            return map(_MKCYL.format, params['Names'],
+                       *[modeler._dims(Values, Units, N) for Values in
+                         (Centers[:, 0], Centers[:, 1], Centers[:, 2], params['Radii'],
+                          params['Heights'])] + [params['Axis']])
+        if kind == 'boxarray':
+            Starts, Units, N = params['Starts'], params['Units'], len(params['Names'])
+            Sizes = modeler._broadcastRows(params['Sizes'], N)
+            return map(_MKBOX.format, params['Names'],
+                       *[modeler._dims(Values, Units, N) for Values in
+                         (Starts[:, 0], Starts[:, 1], Starts[:, 2], Sizes[:, 0], Sizes[:, 1],
+                          Sizes[:, 2])])
+        if kind == 'rectanglearray':
+            Starts, Units, N = params['Starts'], params['Units'], len(params['Names'])
+            return map(_MKRECT.format, params['Names'],
+                       *[modeler._dims(Values, Units, N) for Values in
+                         (Starts[:, 0], Starts[:, 1], Starts[:, 2], params['Widths'],
+                          params['Heights'])] + [params['Axis']])
+        return None
+
+
+_MKCYL = 'MkCyl "{0}", "{1}", "{2}", "{3}", "{4}", "{5}", "{6}"\n'
+_MKBOX = 'MkBox "{0}", "{1}", "{2}", "{3}", "{4}", "{5}", "{6}"\n'
+_MKRECT = 'MkRect "{0}", "{1}", "{2}", "{3}", "{4}", "{5}", "{6}"\n'
+
+_SUBS = (
+    '\n'
+    'Function Attributes(name, transparency)\n'
+    'Attributes = Array("NAME:Attributes", _\n'
+    '"Name:=", name, _\n'
+    '"Flags:=", "", _\n'
+    '"Color:=", "(132 132 193)", _\n'
+    '"Transparency:=", transparency, _\n'
+    '"PartCoordinateSystem:=", "Global", _\n'
+    '"MaterialName:=", "vacuum", _\n'
+    '"SolveInside:=", true)\n'
+    'End Function\n'
+    '\n'
+    'Sub MkCyl(name, x, y, z, r, h, axis)\n'
+    'oEditor.CreateCylinder _\n'
+    'Array("NAME:CylinderParameters", _\n'
+    '"XCenter:=", x, "YCenter:=", y, "ZCenter:=", z, _\n'
+    '"Radius:=", r, "Height:=", h, "WhichAxis:=", axis), _\n'
+    'Attributes(name, 0)\n'
+    'End Sub\n'
+    '\n'
+    'Sub MkBox(name, x, y, z, dx, dy, dz)\n'
+    'oEditor.CreateBox _\n'
+    'Array("NAME:BoxParameters", _\n'
+    '"XPosition:=", x, "YPosition:=", y, "ZPosition:=", z, _\n'
+    '"XSize:=", dx, "YSize:=", dy, "ZSize:=", dz), _\n'
+    'Attributes(name, 0.75)\n'
+    'End Sub\n'
+    '\n'
+    'Sub MkRect(name, x, y, z, w, h, axis)\n'
+    'oEditor.CreateRectangle _\n'
+    'Array("NAME:RectangleParameters", _\n'
+    '"IsCovered:=", true, _\n'
+    '"XStart:=", x, "YStart:=", y, "ZStart:=", z, _\n'
+    '"Width:=", w, "Height:=", h, "WhichAxis:=", axis), _\n'
+    'Attributes(name, 0.75)\n'
+    'End Sub\n'
+    '\n')
+
+
+# ----------------------------------------------------------------------------
+# class PythonEmitter()
+#
+# Description :
+# -------------
+# Backend producing an IronPython script for the HFSS (AEDT) Python
+# interpreter. Consecutive primitives of the same kind are not unrolled:
+# their parameters are collected in a data list and created by a single
+# loop, e.g. 4096 patches become 4096 short tuples and one CreateBox call.
+#
+# Note :
+# ------
+# Only the blocks of the hfss* generators can be converted; raw VB script
+# written to the ScriptWriter raises an Exception.
+#
+# Example :
+# ---------
+# with ScriptWriter('array.py', emitter=PythonEmitter()) as fid:
+#     hfssNewProject(fid)
+#     hfssInsertDesign(fid, 'Array')
+#     hfssBoxArray(fid, 'Patch', Starts, [10, 12, 0.035], 'mm')
+# ----------------------------------------------------------------------------
+class PythonEmitter(Emitter):
+    def __init__(self):
+        self._kind = None       # kind of the primitives collected in _rows
+        self._rows = []
+        self._helpers = False
+
+    def render(self, kind, params, text):
+        rows = self._primitiveRows(kind, params)
+        if rows is not None:
+            kind = kind.replace('array', '')
+            pending = self.finish() if kind != self._kind else ''
+            self._kind = kind
+            self._rows.extend(rows)
+            return pending
+
+        if kind is None:
+            if text.strip():
+                raise Exception('Raw VB script cannot be converted to Python !!')
+            return self.finish()
+        renderer = _RENDERERS.get(kind)
+        if renderer is None:
+            raise Exception('The Python backend does not support "{0}" blocks !!'.format(kind))
+        return self.finish() + renderer(params)
+
+    def finish(self):
+        if not self._rows:
+            return ''
+        header = '' if self._helpers else _HELPERS
+        self._helpers = True
+        text = header + _LOOPS[self._kind].format(',\n    '.join(self._rows))
+        self._kind = None
+        self._rows = []
+        return text
+
+    # The data tuples of a primitive block, or None for any other block.
+    def _primitiveRows(self, kind, params):
+        if kind == 'cylinder':
+            Center, Units = params['Center'], params['Units']
+            columns = [[modeler._dim(Value, Units)] for Value in
+                       (Center[0], Center[1], Center[2], params['Radius'], params['Height'])]
+            columns += [[params['Axis'].upper()], [params['Name']]]
+        elif kind == 'box':
+            Start, Size, Units = params['Start'], params['Size'], params['Units']
+            columns = [[modeler._dim(Value, Units)] for Value in
+                       (Start[0], Start[1], Start[2], Size[0], Size[1], Size[2])]
+            columns += [[params['Name']]]
+        elif kind == 'rectangle':
+            Start, Units = params['Start'], params['Units']
+            columns = [[modeler._dim(Value, Units)] for Value in
+                       (Start[0], Start[1], Start[2], params['Width'], params['Height'])]
+            columns += [[params['Axis'].upper()], [params['Name']]]
+        elif kind == 'cylinderarray':
+            Centers, Units, N = params['Centers'], params['Units'], len(params['Names'])
+            columns = [modeler._dims(Values, Units, N) for Values in
+                       (Centers[:, 0], Centers[:, 1], Centers[:, 2], params['Radii'],
+                        params['Heights'])]
+            columns += [params['Axis'], params['Names']]
+        elif kind == 'boxarray':
+            Starts, Units, N = params['Starts'], params['Units'], len(params['Names'])
+            Sizes = modeler._broadcastRows(params['Sizes'], N)
+            columns = [modeler._dims(Values, Units, N) for Values in
+                       (Starts[:, 0], Starts[:, 1], Starts[:, 2], Sizes[:, 0], Sizes[:, 1],
+                        Sizes[:, 2])]
+            columns += [params['Names']]
+        elif kind == 'rectanglearray':
+            Starts, Units, N = params['Starts'], params['Units'], len(params['Names'])
+            columns = [modeler._dims(Values, Units, N) for Values in
+                       (Starts[:, 0], Starts[:, 1], Starts[:, 2], params['Widths'],
+                        params['Heights'])]
+            columns += [params['Axis'], params['Names']]
+        else:
+            return None
+        return ['(' + ', '.join(map(_string, row)) + ')' for row in zip(*columns)]
+
+
+# Python string literal (double quoted, as in the HFSS recorded scripts).
+def _string(value):
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+_HELPERS = (
+    '\n'
+    'def attributes(name, transparency):\n'
+    '    return ["NAME:Attributes", "Name:=", name, "Flags:=", "",\n'
+    '            "Color:=", "(132 132 193)", "Transparency:=", transparency,\n'
+    '            "PartCoordinateSystem:=", "Global", "MaterialName:=", "vacuum",\n'
+    '            "SolveInside:=", True]\n')
+
+_LOOPS = {
+    'cylinder': (
+        '\n'
+        'for x, y, z, r, h, axis, name in [\n'
+        '    {0}]:\n'
+        '    oEditor.CreateCylinder(\n'
+        '        ["NAME:CylinderParameters", "XCenter:=", x, "YCenter:=", y, "ZCenter:=", z,\n'
+        '         "Radius:=", r, "Height:=", h, "WhichAxis:=", axis],\n'
+        '        attributes(name, 0))\n'),
+    'box': (
+        '\n'
+        'for x, y, z, dx, dy, dz, name in [\n'
+        '    {0}]:\n'
+        '    oEditor.CreateBox(\n'
+        '        ["NAME:BoxParameters", "XPosition:=", x, "YPosition:=", y, "ZPosition:=", z,\n'
+        '         "XSize:=", dx, "YSize:=", dy, "ZSize:=", dz],\n'
+        '        attributes(name, 0.75))\n'),
+    'rectangle': (
+        '\n'
+        'for x, y, z, w, h, axis, name in [\n'
+        '    {0}]:\n'
+        '    oEditor.CreateRectangle(\n'
+        '        ["NAME:RectangleParameters", "IsCovered:=", True, "XStart:=", x,\n'
+        '         "YStart:=", y, "ZStart:=", z, "Width:=", w, "Height:=", h,\n'
+        '         "WhichAxis:=", axis],\n'
+        '        attributes(name, 0.75))\n'),
+}
+
+
+def _project(params):
+    text = ('import ScriptEnv\n'
+            'ScriptEnv.Initialize("Ansoft.ElectronicsDesktop")\n')
+    if 'designName' not in params:
+        return text + ('oDesktop.RestoreWindow()\n'
+                       'oDesktop.NewProject()\n'
+                       'oProject = oDesktop.GetActiveProject()\n')
+    if params['designName'] is None:
+        design = 'oProject.GetActiveDesign()'
+    else:
+        design = 'oProject.SetActiveDesign({0})'.format(_string(params['designName']))
+    return text + ('oProject = oDesktop.GetActiveProject()\n'
+                   'oDesign = {0}\n'
+                   'oEditor = oDesign.SetActiveEditor("3D Modeler")\n'.format(design))
+
+
+def _design(params):
+    solutionType = {'driven terminal': 'DrivenTerminal', 'driven modal': 'DrivenModal',
+                    'eigenmode': 'Eigenmode'}.get(params['designType'].lower(), '')
+    return ('\n'
+            'oProject.InsertDesign("HFSS", {0}, {1}, "")\n'
+            'oDesign = oProject.SetActiveDesign({0})\n'
+            'oEditor = oDesign.SetActiveEditor("3D Modeler")\n'
+            .format(_string(params['designName']), _string(solutionType)))
+
+
+def _variable(params):
+    Name = params['Name']
+    if Name.startswith('$'):
+        target, tab, server = 'oProject', 'ProjectVariableTab', 'ProjectVariables'
+    else:
+        target, tab, server = 'oDesign', 'LocalVariableTab', 'LocalVariables'
+    if params['New']:
+        props, propType = 'NewProps', '"PropType:=", "VariableProp", "UserDef:=", True, '
+    else:
+        props, propType = 'ChangedProps', ''
+    return ('\n'
+            '{0}.ChangeProperty(["NAME:AllTabs", ["NAME:{1}", ["NAME:PropServers", "{2}"],\n'
+            '    ["NAME:{3}", ["NAME:{4}", {5}"Value:=", {6}]]]])\n'
+            .format(target, tab, server, props, Name, propType, _string(params['Value'])))
+
+
+def _parametric(params):
+    Units = params['Units']
+    Definitions = ',\n     '.join(
+        '["NAME:SweepDefinition", "Variable:=", {0}, "Data:=", "LIN {1} {2} {3}", '
+        '"OffsetF1:=", False, "Synchronize:=", 0]'
+        .format(_string(Variable), *[modeler._dim(Limit, Units) for Limit in (Start, Stop, Step)])
+        for Variable, Start, Stop, Step in params['Sweeps'])
+    return ('\n'
+            'oModule = oDesign.GetModule("Optimetrics")\n'
+            'oModule.InsertSetup("OptiParametric",\n'
+            '    ["NAME:{0}", "IsEnabled:=", True,\n'
+            '     ["NAME:ProdOptiSetupDataV2", "SaveFields:=", False, "CopyMesh:=", False,\n'
+            '      "SolveWithCopiedMeshOnly:=", True],\n'
+            '     ["NAME:StartingPoint"], "Sim. Setups:=", [{1}],\n'
+            '     ["NAME:Sweeps",\n'
+            '     {2}],\n'
+            '     ["NAME:Sweep Operations"], ["NAME:Goals"]])\n'
+            .format(params['Name'], _string(params['SetupName']), Definitions))
+
+
+def _subtract(params):
+    return ('\n'
+            'oEditor.Subtract(\n'
+            '    ["NAME:Selections", "Blank Parts:=", {0}, "Tool Parts:=", {1}],\n'
+            '    ["NAME:SubtractParameters", "KeepOriginals:=", {2}])\n'
+            .format(_string(','.join(params['blankParts'])),
+                    _string(','.join(params['toolParts'])),
+                    'True' if params['Clone'] == 'true' else 'False'))
+
+
+def _combine(command):
+    def render(params):
+        return ('\n'
+                'oEditor.{0}(\n'
+                '    ["NAME:Selections", "Selections:=", {1}],\n'
+                '    ["NAME:{0}Parameters", "KeepOriginals:=", {2}])\n'
+                .format(command, _string(','.join(params['Parts'])),
+                        'True' if params['Clone'] == 'true' else 'False'))
+    return render
+
+
+def _delete(params):
+    return ('\n'
+            'oEditor.Delete(["NAME:Selections", "Selections:=", {0}])\n'
+            .format(_string(','.join(params['Parts']))))
+
+
+def _duplicate(params):
+    Selections = _string(','.join(params['Parts']))
+    if 'Vector' in params:
+        Vector, Units = params['Vector'], params['Units']
+        return ('\n'
+                'oEditor.DuplicateAlongLine(\n'
+                '    ["NAME:Selections", "Selections:=", {0}, "NewPartsModelFlag:=", "Model"],\n'
+                '    ["NAME:DuplicateToAlongLineParameters", "CreateNewObjects:=", True,\n'
+                '     "XComponent:=", {1}, "YComponent:=", {2}, "ZComponent:=", {3},\n'
+                '     "NumClones:=", "{4}"],\n'
+                '    ["NAME:Options", "DuplicateAssignments:=", False])\n'
+                .format(Selections, *[_string(modeler._dim(Vector[i], Units)) for i in range(3)]
+                        + [params['NumClones']]))
+    return ('\n'
+            'oEditor.DuplicateAroundAxis(\n'
+            '    ["NAME:Selections", "Selections:=", {0}, "NewPartsModelFlag:=", "Model"],\n'
+            '    ["NAME:DuplicateAroundAxisParameters", "CreateNewObjects:=", True,\n'
+            '     "WhichAxis:=", "{1}", "AngleStr:=", {2}, "NumClones:=", "{3}"],\n'
+            '    ["NAME:Options", "DuplicateAssignments:=", False])\n'
+            .format(Selections, params['Axis'].upper(),
+                    _string(modeler._dim(params['Angle'], 'deg')), params['NumClones']))
+
+
+def _setup(params):
+    return ('\n'
+            'oModule = oDesign.GetModule("AnalysisSetup")\n'
+            'oModule.InsertSetup("HfssDriven",\n'
+            '    ["NAME:{0}", "Frequency:=", "{1}GHz", "PortsOnly:=", False,\n'
+            '     "MaxDeltaS:=", {2}, "UseMatrixConv:=", False, "MaximumPasses:=", {3},\n'
+            '     "MinimumPasses:=", {4}, "MinimumConvergedPasses:=", {5},\n'
+            '     "PercentRefinement:=", {6}, "IsEnabled:=", True, "BasisOrder:=", 1,\n'
+            '     "DoLambdaRefine:=", True, "DoMaterialLambda:=", True,\n'
+            '     "SetLambdaTarget:=", False, "Target:=", 0.3333, "PortAccuracy:=", 2,\n'
+            '     "EnableSolverDomains:=", {7}])\n'
+            .format(params['Name'], params['fGHz'], params['maxDeltaS'], params['maxPass'],
+                    params['minPass'], params['minConvPass'], params['PercentRefinement'],
+                    bool(params['SolverDomains'])))
+
+
+def _frequencySweep(params):
+    options = ''
+    if params['Type'] == 'Interpolating':
+        options = ('"InterpTolerance:=", {0}, "InterpMaxSolns:=", {1},\n'
+                   '     "InterpMinSolns:=", 0, "InterpMinSubranges:=", 1,\n     '
+                   .format(params['tolPercent'], params['nMaxSols']))
+    return ('\n'
+            'oModule = oDesign.GetModule("AnalysisSetup")\n'
+            'oModule.InsertFrequencySweep({0},\n'
+            '    ["NAME:{1}", "IsEnabled:=", True, "SetupType:=", "LinearCount",\n'
+            '     "StartValue:=", "{2}GHz", "StopValue:=", "{3}GHz", "Count:=", {4},\n'
+            '     "Type:=", "{5}", "SaveFields:=", False,\n'
+            '     {6}"ExtrapToDC:=", False])\n'
+            .format(_string(params['SolutionName']), params['Name'], params['fStartGHz'],
+                    params['fStopGHz'], params['nPoints'], params['Type'], options))
+
+
+def _hpc(params):
+    return ('\n'
+            'oFile = open({0}, "w")\n'
+            'oFile.write({1})\n'
+            'oFile.close()\n'
+            'oDesktop.SetRegistryFromFile({0})\n'
+            .format(_string(params['acfPath']),
+                    ' +\n    '.join(repr(line + '\n') for line in params['Lines'])))
+
+
+def _analyze(params):
+    if params.get('HPC') is None:
+        return ('\n'
+                'oDesign.Analyze({0})\n'.format(_string(params['SolutionName'])))
+    return ('\n'
+            'hpcActive = oDesktop.GetRegistryString({0})\n'
+            'oDesktop.SetRegistryString({0}, {1})\n'
+            'oDesign.Analyze({2})\n'
+            'oDesktop.SetRegistryString({0}, hpcActive)\n'
+            .format(_string(general._ACTIVE_HPC), _string(params['HPC']),
+                    _string(params['SolutionName'])))
+
+
+def _meshOperation(params):
+    Objects = ', '.join(map(_string, params['Parts']))
+    MaxElements = params['MaxElements']
+    restrict = '"RestrictElem:=", {0}, "NumMaxElem:=", "{1}"'.format(
+        MaxElements is not None, 1000 if MaxElements is None else MaxElements)
+    if params['Type'] == 'length':
+        return ('\n'
+                'oModule = oDesign.GetModule("MeshSetup")\n'
+                'oModule.AssignLengthOp(\n'
+                '    ["NAME:{0}", "RefineInside:=", {1}, "Enabled:=", True,\n'
+                '     "Objects:=", [{2}],\n'
+                '     {3}, "RestrictLength:=", True, "MaxLength:=", {4}])\n'
+                .format(params['Name'], bool(params['RefineInside']), Objects, restrict,
+                        _string(modeler._dim(params['MaxLength'], params['Units']))))
+    return ('\n'
+            'oModule = oDesign.GetModule("MeshSetup")\n'
+            'oModule.AssignSkinDepthOp(\n'
+            '    ["NAME:{0}", "Enabled:=", True,\n'
+            '     "Objects:=", [{1}],\n'
+            '     {2}, "SkinDepth:=", {3}, "SurfTriMaxLength:=", {4},\n'
+            '     "NumLayers:=", "{5}"])\n'
+            .format(params['Name'], Objects, restrict,
+                    _string(modeler._dim(params['SkinDepth'], params['Units'])),
+                    _string(modeler._dim(params['SurfTriLength'], params['Units'])),
+                    params['NumLayers']))
+
+
+def _split(params):
+    return ('\n'
+            'oEditor.Split(\n'
+            '    ["NAME:Selections", "Selections:=", {0}, "NewPartsModelFlag:=", "Model"],\n'
+            '    ["NAME:SplitToParameters", "SplitPlane:=", "{1}", "WhichSide:=", "{2}",\n'
+            '     "ToolType:=", "PlaneTool", "ToolEntityID:=", -1,\n'
+            '     "SplitCrossingObjectsOnly:=", False, "DeleteInvalidObjects:=", True])\n'
+            .format(_string(','.join(params['Parts'])),
+                    {'X': 'YZ', 'Y': 'ZX', 'Z': 'XY'}[params['Axis']],
+                    {'positive': 'PositiveOnly', 'negative': 'NegativeOnly',
+                     'both': 'Both'}[params['Side']]))
+
+
+def _symmetry(params):
+    Position, Units = params['Position'], params['Units']
+    return ('\n'
+            'oModule = oDesign.GetModule("BoundarySetup")\n'
+            'oModule.AssignSymmetry(\n'
+            '    ["NAME:{0}",\n'
+            '     "Faces:=", [oEditor.GetFaceByPosition(["NAME:FaceParameters",\n'
+            '         "BodyName:=", {1}, "XPosition:=", {2}, "YPosition:=", {3},\n'
+            '         "ZPosition:=", {4}])],\n'
+            '     "IsPerfectE:=", {5}])\n'
+            .format(params['Name'], _string(params['Part']),
+                    *[_string(modeler._dim(Position[i], Units)) for i in range(3)]
+                    + [bool(params['PerfectE'])]))
+
+
+def _activate(params):
+    if params['designName'] is None:
+        return ''
+    return 'oDesign = oProject.SetActiveDesign({0})\n'.format(_string(params['designName']))
+
+
+def _networkData(params):
+    return ('\n'
+            '{0}'
+            'oModule = oDesign.GetModule("Solutions")\n'
+            'oModule.ExportNetworkData("", [{1}], 3, {2}, ["All"], True, 50, "S", -1, {3}, 15)\n'
+            .format(_activate(params), _string(params['SolutionName'] + ':' + params['SweepName']),
+                    _string(params['FileName'].replace('\\', '/')),
+                    {'MA': 0, 'RI': 1, 'DB': 2}[params['Format'].upper()]))
+
+
+def _report(params):
+    Context = '"Domain:=", "Sweep"' if params['Context'] is None else \
+        '"Context:=", {0}'.format(_string(params['Context']))
+    Families = ', '.join('"{0}:=", ["All"]'.format(Variable)
+                         for Variable in [params['Primary']] + params['Sweeps'])
+    return ('\n'
+            '{0}'
+            'oModule = oDesign.GetModule("ReportSetup")\n'
+            'oModule.CreateReport({1}, {2}, "Rectangular Plot", {3},\n'
+            '    [{4}],\n'
+            '    [{5}],\n'
+            '    ["X Component:=", {6}, "Y Component:=", [{7}]],\n'
+            '    [])\n'
+            'oModule.ExportToFile({1}, {8})\n'
+            .format(_activate(params), _string(params['ReportName']),
+                    _string(params['ReportType']),
+                    _string('{0} : {1}'.format(params['SolutionName'],
+                                               params['SweepName'] or 'LastAdaptive')),
+                    Context, Families, _string(params['Primary']),
+                    ', '.join(map(_string, params['Expressions'])),
+                    _string(params['FileName'].replace('\\', '/'))))
+
+
+_RENDERERS = {'project': _project, 'design': _design, 'variable': _variable,
+              'parametric': _parametric, 'subtract': _subtract, 'unite': _combine('Unite'),
+              'intersect': _combine('Intersect'), 'delete': _delete,
+              'duplicate': _duplicate, 'setup': _setup, 'frequencysweep': _frequencySweep,
+              'hpc': _hpc, 'analyze': _analyze, 'meshop': _meshOperation, 'split': _split,
+              'symmetry': _symmetry, 'networkdata': _networkData, 'report': _report}
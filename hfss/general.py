@@ -0,0 +1,586 @@
+# -*- coding: utf-8 -*-
+# @Time    : 5/16/2021 4:35 PM
+# @Author  : Mingdian Liu
+# @Email   : mingdian@iastate.edu lmdvigor@gmail.com
+# @File    : hfssGeneral.py
+# @Software: PyCharm
+
+import os
+
+from .scriptwriter import emit, profiled
+
+
+# -------------------------------------------------------------------------- #
+# function hfssNewProject(fid)
+#
+# Description :
+# -------------
+# This function creates the necessary VBScript to create a new HFSS project
+# file, set it as the active project.
+#
+# Parameters:
+# -----------
+# fid         - file identifier of the VBScript File.
+# -------------------------------------------------------------------------- #
+
+# ----------------------------------------------------------------------------
+# This file is part of HFSS-MATLAB-API.
+#
+# HFSS-MATLAB-API is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation; either version 2 of the License, or (at your option)
+# any later version.
+#
+# HFSS-MATLAB-API is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Foobar; if not, write to the Free Software Foundation, Inc., 59 Temple
+# Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Copyright 2004, Vijay Ramasami (rvc@ku.edu)
+# ----------------------------------------------------------------------------
+
+@profiled
+def hfssNewProject(fid):
+    emit(fid, 'project', dict(),
+         # Preamble.
+         'Dim oHfssApp\n'
+         'Dim oDesktop\n'
+         'Dim oProject\n'
+         'Dim oDesign\n'
+         'Dim oEditor\n'
+         'Dim oModule\n'
+         '\n'
+         # Create a New Project.
+         'Set oHfssApp  = CreateObject("AnsoftHfss.HfssScriptInterface")\n'
+         'Set oDesktop = oHfssApp.GetAppDesktop()\n'
+         'oDesktop.RestoreWindow\n'
+         'oDesktop.NewProject\n'
+         # The new project created is the active project.
+         'Set oProject = oDesktop.GetActiveProject\n')
+
+
+# ----------------------------------------------------------------------------
+# function hfssInsertDesign(fid, designName, [designType = 'driven modal'])
+#
+# Description :
+# -------------
+# Create the necessary VB Script to insert an HFSS Design into the Project
+# and set it as the active design.
+#
+# Parameters :
+# ------------
+# fid        - file identifier of the HFSS script file.
+# designName - name of the new design to be inserted.
+# designType - (Optional String) choose from the following:
+#              1. 'driven modal' (default)
+#              2. 'driven terminal'
+#              3. 'eigenmode'
+#
+# Note :
+# ------
+# This function is usually called after a call to either hfssNewProject()
+# or hfssOpenProject(), but this is not necessary.
+#
+# Example :
+# ---------
+# fid = fopen('myantenna.vbs', 'wt');
+# ...
+# hfssInsertDesign(fid, 'Dipole_SingleElement');
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# This file is part of HFSS-MATLAB-API.
+#
+# HFSS-MATLAB-API is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation; either version 2 of the License, or (at your option)
+# any later version.
+#
+# HFSS-MATLAB-API is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Foobar; if not, write to the Free Software Foundation, Inc., 59 Temple
+# Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Copyright 2004, Vijay Ramasami (rvc@ku.edu)
+# ----------------------------------------------------------------------------
+@profiled
+def hfssInsertDesign(fid, designName, designType='driven modal'):
+    if designType.lower() == 'driven terminal':
+        solutionType = '"DrivenTerminal", ""\n'
+    elif designType.lower() == 'driven modal':
+        solutionType = '"DrivenModal", ""\n'
+    elif designType.lower() == 'eigenmode':
+        solutionType = '"Eigenmode", ""\n'
+    else:
+        solutionType = ''
+
+    # create the necessary script.
+    emit(fid, 'design', dict(designName=designName, designType=designType),
+         '\n'
+         'oProject.InsertDesign "HFSS", "{0}", {1}'
+         'Set oDesign = oProject.SetActiveDesign("{0}")\n'
+         'Set oEditor = oDesign.SetActiveEditor("3D Modeler")\n'
+         .format(designName, solutionType))
+
+
+# ----------------------------------------------------------------------------
+# function hfssDefineVariable(fid, Name, Value, [Units])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to define a design variable (or, if Name
+# starts with '$', a project variable). Variables can then be used in place
+# of numbers in the dimensions of the 3D Modeler primitives, e.g.
+# hfssCylinder(fid, 'Arm', 'Z', [0, 0, 'gap/2'], 'r', 'len', 'mm'), and
+# swept by HFSS itself (see hfssParametricSweep) instead of regenerating
+# one script per sweep point.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Name    - name of the variable.
+# Value   - value of the variable: a number (in Units) or a string holding
+#           an HFSS expression (e.g. '2*len', '10mm').
+# Units   - (Optional) units appended to a numeric Value (default none).
+#
+# Example :
+# ---------
+# hfssDefineVariable(fid, 'len', 48, 'mm');
+# hfssDefineVariable(fid, 'gap', '0.02*len');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssDefineVariable(fid, Name, Value, Units=''):
+    _variable(fid, 'NewProps', Name, Value, Units,
+              '"PropType:=", "VariableProp", "UserDef:=", true, ')
+
+
+# ----------------------------------------------------------------------------
+# function hfssChangeVariable(fid, Name, Value, [Units])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to change the value of an existing design
+# (or '$' project) variable. See hfssDefineVariable().
+#
+# Example :
+# ---------
+# hfssChangeVariable(fid, 'len', 52, 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssChangeVariable(fid, Name, Value, Units=''):
+    _variable(fid, 'ChangedProps', Name, Value, Units, '')
+
+
+# Shared body of hfssDefineVariable and hfssChangeVariable.
+def _variable(fid, props, Name, Value, Units, propType):
+    if not isinstance(Value, str):
+        Value = '{0}{1}'.format(Value, Units)
+    if Name.startswith('$'):
+        target, tab, server = 'oProject', 'ProjectVariableTab', 'ProjectVariables'
+    else:
+        target, tab, server = 'oDesign', 'LocalVariableTab', 'LocalVariables'
+
+    emit(fid, 'variable', dict(Name=Name, Value=Value, New=props == 'NewProps'),
+         '\n'
+         '{0}.ChangeProperty _\n'
+         'Array("NAME:AllTabs", _\n'
+         'Array("NAME:{1}", _\n'
+         'Array("NAME:PropServers", "{2}"), _\n'
+         'Array("NAME:{3}", _\n'
+         'Array("NAME:{4}", {5}"Value:=", "{6}"))))\n'
+         .format(target, tab, server, props, Name, propType, Value))
+
+
+# ----------------------------------------------------------------------------
+# function hfssParametricSweep(fid, Name, SetupName, Sweeps, [Units])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to insert an Optimetrics parametric setup
+# that sweeps one or more design variables over a solution setup, so that a
+# single project covers the whole sweep.
+#
+# Parameters :
+# ------------
+# fid       - file identifier of the HFSS script file.
+# Name      - name of the parametric setup (e.g. 'ParametricSetup1').
+# SetupName - name of the solution setup to be solved at every point.
+# Sweeps    - list of (Variable, Start, Stop, Step) tuples, one per swept
+#             variable. Start, Stop and Step are numbers (in Units) or
+#             strings with their own units.
+# Units     - (Optional) units of the numeric sweep limits (default none).
+#
+# Example :
+# ---------
+# hfssDefineVariable(fid, 'len', 48, 'mm');
+# ...
+# hfssParametricSweep(fid, 'LenSweep', 'Setup1', [('len', 40, 56, 0.5)], 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssParametricSweep(fid, Name, SetupName, Sweeps, Units=''):
+    Definitions = ', _\n'.join(
+        'Array("NAME:SweepDefinition", "Variable:=", "{0}", '
+        '"Data:=", "LIN {1} {2} {3}", "OffsetF1:=", false, "Synchronize:=", 0)'
+        .format(Variable, *[Limit if isinstance(Limit, str) else '{0}{1}'.format(Limit, Units)
+                            for Limit in (Start, Stop, Step)])
+        for Variable, Start, Stop, Step in Sweeps)
+
+    emit(fid, 'parametric', dict(Name=Name, SetupName=SetupName, Sweeps=Sweeps, Units=Units),
+         '\n'
+         'Set oModule = oDesign.GetModule("Optimetrics")\n'
+         'oModule.InsertSetup "OptiParametric", _\n'
+         'Array("NAME:{0}", _\n'
+         '"IsEnabled:=", true, _\n'
+         'Array("NAME:ProdOptiSetupDataV2", _\n'
+         '"SaveFields:=", false, _\n'
+         '"CopyMesh:=", false, _\n'
+         '"SolveWithCopiedMeshOnly:=", true), _\n'
+         'Array("NAME:StartingPoint"), _\n'
+         '"Sim. Setups:=", Array("{1}"), _\n'
+         'Array("NAME:Sweeps", _\n'
+         '{2}), _\n'
+         'Array("NAME:Sweep Operations"), _\n'
+         'Array("NAME:Goals"))\n'
+         .format(Name, SetupName, Definitions))
+
+
+# ----------------------------------------------------------------------------
+# function hfssUseActiveDesign(fid, [designName])
+#
+# Description :
+# -------------
+# Creates the VB Script preamble that attaches to the project already open
+# in HFSS (instead of creating a new one, see hfssNewProject) and makes
+# either the given design or the active design the target of the following
+# commands.
+#
+# Parameters :
+# ------------
+# fid        - file identifier of the HFSS script file.
+# designName - (Optional) name of the design to activate (default: the
+#              active design).
+# ----------------------------------------------------------------------------
+@profiled
+def hfssUseActiveDesign(fid, designName=None):
+    if designName is None:
+        design = 'oProject.GetActiveDesign'
+    else:
+        design = 'oProject.SetActiveDesign("{0}")'.format(designName)
+
+    emit(fid, 'project', dict(designName=designName),
+         'Dim oHfssApp\n'
+         'Dim oDesktop\n'
+         'Dim oProject\n'
+         'Dim oDesign\n'
+         'Dim oEditor\n'
+         'Dim oModule\n'
+         '\n'
+         'Set oHfssApp  = CreateObject("AnsoftHfss.HfssScriptInterface")\n'
+         'Set oDesktop = oHfssApp.GetAppDesktop()\n'
+         'Set oProject = oDesktop.GetActiveProject\n'
+         'Set oDesign = {0}\n'
+         'Set oEditor = oDesign.SetActiveEditor("3D Modeler")\n'
+         .format(design))
+
+
+# ----------------------------------------------------------------------------
+# function hfssInsertSolution(fid, Name, fGHz, [maxDeltaS], [maxPass],
+#                             [minPass], [minConvPass], [PercentRefinement],
+#                             [SolverDomains])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to insert a (driven) solution setup, i.e.
+# the adaptive meshing at the solution frequency and its convergence
+# criteria.
+#
+# Parameters :
+# ------------
+# fid               - file identifier of the HFSS script file.
+# Name              - name of the solution setup (e.g. 'Setup1').
+# fGHz              - solution frequency (in GHz).
+# maxDeltaS         - (Optional) maximum change of the S-parameters between
+#                     two passes for convergence (default 0.02).
+# maxPass           - (Optional) maximum number of adaptive passes
+#                     (default 20).
+# minPass           - (Optional) minimum number of adaptive passes
+#                     (default 1).
+# minConvPass       - (Optional) number of consecutive converged passes
+#                     required (default 1).
+# PercentRefinement - (Optional) percentage of tetrahedra refined at every
+#                     pass (default 30).
+# SolverDomains     - (Optional) if True, the setup is solved with the
+#                     domain decomposition method (DDM), see hfssSetHPC
+#                     (default False).
+#
+# Example :
+# ---------
+# hfssInsertSolution(fid, 'Setup1', 2.4, 0.01, 15);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssInsertSolution(fid, Name, fGHz, maxDeltaS=0.02, maxPass=20, minPass=1,
+                       minConvPass=1, PercentRefinement=30, SolverDomains=False):
+    emit(fid, 'setup',
+         dict(Name=Name, fGHz=fGHz, maxDeltaS=maxDeltaS, maxPass=maxPass, minPass=minPass,
+              minConvPass=minConvPass, PercentRefinement=PercentRefinement,
+              SolverDomains=SolverDomains),
+         '\n'
+         'Set oModule = oDesign.GetModule("AnalysisSetup")\n'
+         'oModule.InsertSetup "HfssDriven", _\n'
+         'Array("NAME:{0}", _\n'
+         '"Frequency:=", "{1}GHz", _\n'
+         '"PortsOnly:=", false, _\n'
+         '"MaxDeltaS:=", {2}, _\n'
+         '"UseMatrixConv:=", false, _\n'
+         '"MaximumPasses:=", {3}, _\n'
+         '"MinimumPasses:=", {4}, _\n'
+         '"MinimumConvergedPasses:=", {5}, _\n'
+         '"PercentRefinement:=", {6}, _\n'
+         '"IsEnabled:=", true, _\n'
+         '"BasisOrder:=", 1, _\n'
+         '"DoLambdaRefine:=", true, _\n'
+         '"DoMaterialLambda:=", true, _\n'
+         '"SetLambdaTarget:=", false, _\n'
+         '"Target:=", 0.3333, _\n'
+         '"PortAccuracy:=", 2, _\n'
+         '"EnableSolverDomains:=", {7})\n'
+         .format(Name, fGHz, maxDeltaS, maxPass, minPass, minConvPass, PercentRefinement,
+                 'true' if SolverDomains else 'false'))
+
+
+# ----------------------------------------------------------------------------
+# function hfssInterpolatingSweep(fid, Name, SolutionName, fStartGHz,
+#                                 fStopGHz, [nPoints], [nMaxSols],
+#                                 [tolPercent])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to add an interpolating frequency sweep
+# to an existing solution setup: HFSS solves at most nMaxSols frequencies
+# and interpolates the nPoints of the sweep until the error is below
+# tolPercent.
+#
+# Parameters :
+# ------------
+# fid          - file identifier of the HFSS script file.
+# Name         - name of the sweep (e.g. 'Sweep1').
+# SolutionName - name of the solution setup (see hfssInsertSolution).
+# fStartGHz    - first frequency of the sweep (in GHz).
+# fStopGHz     - last frequency of the sweep (in GHz).
+# nPoints      - (Optional) number of frequency points (default 1001).
+# nMaxSols     - (Optional) maximum number of solved frequencies
+#                (default 101).
+# tolPercent   - (Optional) interpolation tolerance in % (default 0.5).
+#
+# Example :
+# ---------
+# hfssInterpolatingSweep(fid, 'Sweep1', 'Setup1', 1, 4, 3001);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssInterpolatingSweep(fid, Name, SolutionName, fStartGHz, fStopGHz, nPoints=1001,
+                           nMaxSols=101, tolPercent=0.5):
+    _frequencySweep(fid, 'Interpolating', Name, SolutionName, fStartGHz, fStopGHz, nPoints,
+                    '"InterpTolerance:=", {0}, _\n'
+                    '"InterpMaxSolns:=", {1}, _\n'
+                    '"InterpMinSolns:=", 0, _\n'
+                    '"InterpMinSubranges:=", 1, _\n'
+                    .format(tolPercent, nMaxSols),
+                    dict(nMaxSols=nMaxSols, tolPercent=tolPercent))
+
+
+# ----------------------------------------------------------------------------
+# function hfssFastSweep(fid, Name, SolutionName, fStartGHz, fStopGHz,
+#                        [nPoints])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to add a fast (ALPS) frequency sweep to
+# an existing solution setup. See hfssInterpolatingSweep for the
+# parameters.
+# ----------------------------------------------------------------------------
+@profiled
+def hfssFastSweep(fid, Name, SolutionName, fStartGHz, fStopGHz, nPoints=1001):
+    _frequencySweep(fid, 'Fast', Name, SolutionName, fStartGHz, fStopGHz, nPoints, '', {})
+
+
+# ----------------------------------------------------------------------------
+# function hfssDiscreteSweep(fid, Name, SolutionName, fStartGHz, fStopGHz,
+#                            [nPoints])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to add a discrete frequency sweep (one
+# full solution per point) to an existing solution setup. See
+# hfssInterpolatingSweep for the parameters.
+# ----------------------------------------------------------------------------
+@profiled
+def hfssDiscreteSweep(fid, Name, SolutionName, fStartGHz, fStopGHz, nPoints=101):
+    _frequencySweep(fid, 'Discrete', Name, SolutionName, fStartGHz, fStopGHz, nPoints, '', {})
+
+
+# Shared body of the frequency sweeps.
+def _frequencySweep(fid, Type, Name, SolutionName, fStartGHz, fStopGHz, nPoints, options,
+                    params):
+    params.update(Type=Type, Name=Name, SolutionName=SolutionName, fStartGHz=fStartGHz,
+                  fStopGHz=fStopGHz, nPoints=nPoints)
+    emit(fid, 'frequencysweep', params,
+         '\n'
+         'Set oModule = oDesign.GetModule("AnalysisSetup")\n'
+         'oModule.InsertFrequencySweep "{0}", _\n'
+         'Array("NAME:{1}", _\n'
+         '"IsEnabled:=", true, _\n'
+         '"SetupType:=", "LinearCount", _\n'
+         '"StartValue:=", "{2}GHz", _\n'
+         '"StopValue:=", "{3}GHz", _\n'
+         '"Count:=", {4}, _\n'
+         '"Type:=", "{5}", _\n'
+         '"SaveFields:=", false, _\n'
+         '{6}'
+         '"ExtrapToDC:=", false)\n'
+         .format(SolutionName, Name, fStartGHz, fStopGHz, nPoints, Type, options))
+
+
+# ----------------------------------------------------------------------------
+# function hfssSetHPC(fid, acfPath, Cores, [Tasks], [Distribute],
+#                     [RAMLimit], [Machines], [ConfigName])
+#
+# Description :
+# -------------
+# Creates the VB Script that defines an HPC configuration: the script writes
+# the configuration (.acf) file and loads it into the desktop. The
+# configuration is only made active around the analyses of a design that
+# asks for it (see the HPC option of hfssAnalyze), so every design can be
+# solved with its own cores, tasks and distribution, and the desktop keeps
+# its own settings for the others.
+#
+# Parameters :
+# ------------
+# fid        - file identifier of the HFSS script file.
+# acfPath    - path of the configuration file, as seen from the machine
+#              running the script.
+# Cores      - number of cores used on each machine.
+# Tasks      - (Optional) number of parallel tasks (solver engines) on
+#              each machine (default 1).
+# Distribute - (Optional) what the tasks share out: 'frequencies' (the
+#              points of the sweeps, default), 'variations' (the points of
+#              parametric sweeps), 'domains' (domain decomposition, see
+#              the SolverDomains option of hfssInsertSolution), or a list
+#              of them.
+# RAMLimit   - (Optional) percentage of the RAM of each machine the solver
+#              may use (default 90).
+# Machines   - (Optional) list of the machines (default ['localhost']).
+# ConfigName - (Optional) name of the configuration (default: the name of
+#              acfPath without its extension).
+#
+# Returns :
+# ---------
+# The name of the configuration, to be given to hfssAnalyze.
+#
+# Example :
+# ---------
+# hfssInsertDesign(fid, 'Array');
+# ...
+# HPC = hfssSetHPC(fid, 'C:/hpc/array.acf', 16, 4, 'frequencies');
+# hfssAnalyze(fid, 'Setup1', HPC);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssSetHPC(fid, acfPath, Cores, Tasks=1, Distribute='frequencies', RAMLimit=90,
+               Machines=None, ConfigName=None):
+    if isinstance(Distribute, str):
+        Distribute = [Distribute]
+    unknown = [Option for Option in Distribute if Option not in _DISTRIBUTE]
+    if unknown:
+        raise Exception('Unknown distribution type: {0} !!'.format(', '.join(unknown)))
+    if Machines is None:
+        Machines = ['localhost']
+    acfPath = acfPath.replace('\\', '/')
+    if ConfigName is None:
+        ConfigName = os.path.splitext(os.path.basename(acfPath))[0]
+    lines = _acfLines(ConfigName, Machines, Cores, Tasks, Distribute, RAMLimit)
+
+    emit(fid, 'hpc',
+         dict(acfPath=acfPath, Cores=Cores, Tasks=Tasks, Distribute=Distribute,
+              RAMLimit=RAMLimit, Machines=Machines, ConfigName=ConfigName, Lines=lines),
+         '\n'
+         'Set oFileSystem = CreateObject("Scripting.FileSystemObject")\n'
+         'Set oFile = oFileSystem.CreateTextFile("{0}", True)\n'
+         '{1}'
+         'oFile.Close\n'
+         'oDesktop.SetRegistryFromFile "{0}"\n'
+         .format(acfPath, ''.join('oFile.WriteLine "{0}"\n'.format(line) for line in lines)))
+    return ConfigName
+
+
+# Distribution types of hfssSetHPC -> entry of the .acf file.
+_DISTRIBUTE = {'variations': 'Variations', 'frequencies': 'Frequencies',
+               'domains': 'DomainSolver'}
+
+# Registry key of the active HPC configuration of HFSS.
+_ACTIVE_HPC = 'Desktop/ActiveDSOConfigurations/HFSS'
+
+
+# Lines of the HPC configuration file of hfssSetHPC.
+def _acfLines(ConfigName, Machines, Cores, Tasks, Distribute, RAMLimit):
+    lines = ["$begin 'Configs'",
+             "\t$begin 'DSOConfig'",
+             "\t\tName='{0}'".format(ConfigName),
+             "\t\tDesignType='HFSS'",
+             "\t\t$begin 'DSOMachineList'"]
+    for Machine in Machines:
+        lines += ["\t\t\t$begin 'DSOMachineInfo'",
+                  "\t\t\t\tMachineName='{0}'".format(Machine),
+                  "\t\t\t\tEnabled=true",
+                  "\t\t\t\tCores={0}".format(Cores),
+                  "\t\t\t\tNumEngines={0}".format(Tasks),
+                  "\t\t\t\tRAMLimitPercent={0}".format(RAMLimit),
+                  "\t\t\t$end 'DSOMachineInfo'"]
+    lines += ["\t\t$end 'DSOMachineList'",
+              "\t\t$begin 'JobDistribution'"]
+    lines += ["\t\t\t{0}={1}".format(Entry, 'true' if Option in Distribute else 'false')
+              for Option, Entry in sorted(_DISTRIBUTE.items())]
+    lines += ["\t\t$end 'JobDistribution'",
+              "\t$end 'DSOConfig'",
+              "$end 'Configs'"]
+    return lines
+
+
+# ----------------------------------------------------------------------------
+# function hfssAnalyze(fid, SolutionName, [HPC])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to solve a solution setup (with its
+# frequency sweeps) of the active design.
+#
+# Parameters :
+# ------------
+# fid          - file identifier of the HFSS script file.
+# SolutionName - name of the solution setup.
+# HPC          - (Optional) name of an HPC configuration (see hfssSetHPC),
+#                made active for this analysis only: the configuration
+#                active before is restored once the design is solved.
+#
+# Example :
+# ---------
+# hfssAnalyze(fid, 'Setup1');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssAnalyze(fid, SolutionName, HPC=None):
+    if HPC is None:
+        text = 'oDesign.Analyze "{0}"\n'.format(SolutionName)
+    else:
+        text = ('hpcActive = oDesktop.GetRegistryString("{0}")\n'
+                'oDesktop.SetRegistryString "{0}", "{1}"\n'
+                'oDesign.Analyze "{2}"\n'
+                'oDesktop.SetRegistryString "{0}", hpcActive\n'
+                .format(_ACTIVE_HPC, HPC, SolutionName))
+
+    emit(fid, 'analyze', dict(SolutionName=SolutionName, HPC=HPC), '\n' + text)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# @File    : incremental.py
+# @Software: PyCharm
+
+import hashlib
+import json
+import os
+
+from . import general, modeler
+from .scriptwriter import ScriptWriter, emit
+
+
+# ----------------------------------------------------------------------------
+# function buildIncremental(model, scriptPath, [manifestPath], [deltaPath])
+#
+# Description :
+# -------------
+# Writes the full script of a Model together with a manifest holding a
+# fingerprint of every object, and, when a manifest from a previous build
+# exists, a delta script that brings the project built from that previous
+# script up to date: it deletes the objects that changed or disappeared and
+# recreates only the changed and new ones (with the Subtracts, Duplicates,
+# ... they depend on), leaving the rest of the open project untouched.
+#
+# An object is identified by the first part of its construction (e.g. a box
+# and the hole cylinders subtracted from it form a single object named after
+# the box) and fingerprinted by the script of all its construction steps.
+# Changes outside the geometry (project preamble, design variables, raw
+# text) cannot be applied incrementally; the delta is then the full script.
+#
+# Parameters :
+# ------------
+# model        - the Model the geometry was recorded into.
+# scriptPath   - path of the full script.
+# manifestPath - (Optional) path of the manifest (default:
+#                scriptPath + '.manifest.json').
+# deltaPath    - (Optional) path of the delta script (default: scriptPath
+#                with '_delta' inserted before the extension).
+#
+# Returns :
+# ---------
+# A dictionary with the 'changed', 'added' and 'removed' objects, whether
+# the delta is a 'full' rebuild, and the path of the 'delta' script (None on
+# a first build).
+#
+# Example :
+# ---------
+# model = Model()
+# hfssNewProject(model)
+# hfssInsertDesign(model, 'Array')
+# ... build the geometry into model ...
+# report = buildIncremental(model, 'array.vbs')
+# # run array.vbs on the first build, then array_delta.vbs on later builds.
+# ----------------------------------------------------------------------------
+def buildIncremental(model, scriptPath, manifestPath=None, deltaPath=None):
+    if manifestPath is None:
+        manifestPath = scriptPath + '.manifest.json'
+    if deltaPath is None:
+        base, extension = os.path.splitext(scriptPath)
+        deltaPath = base + '_delta' + (extension or '.vbs')
+
+    objects, globalHash = fingerprint(model.nodes)
+    manifest = {'globals': globalHash,
+                'objects': {key: {'hash': entry['hash'], 'design': entry['design'],
+                                  'parts': entry['parts']}
+                            for key, entry in objects.items()}}
+
+    previous = None
+    if os.path.exists(manifestPath):
+        with open(manifestPath) as manifestFile:
+            previous = json.load(manifestFile)
+
+    with ScriptWriter(scriptPath) as fid:
+        model.writeTo(fid)
+
+    report = {'changed': [], 'added': [], 'removed': [], 'full': previous is None,
+              'delta': None}
+    if previous is not None:
+        old = previous['objects']
+        report['changed'] = [key for key in objects
+                             if key in old and old[key]['hash'] != objects[key]['hash']]
+        report['added'] = [key for key in objects if key not in old]
+        report['removed'] = [key for key in old if key not in objects]
+        report['full'] = previous['globals'] != globalHash
+        report['delta'] = deltaPath
+        with ScriptWriter(deltaPath) as fid:
+            if report['full']:
+                model.writeTo(fid)
+            else:
+                _writeDelta(fid, model.nodes, objects, old, report)
+
+    with open(manifestPath, 'w') as manifestFile:
+        json.dump(manifest, manifestFile, indent=1)
+    return report
+
+
+# ----------------------------------------------------------------------------
+# function fingerprint(nodes)
+#
+# Description :
+# -------------
+# Groups the nodes of a Model into objects and fingerprints them. Returns a
+# dictionary mapping each object key ('design/firstPart') to its 'hash',
+# 'design', surviving 'parts' and construction 'nodes' (indices), and the
+# hash of all the nodes that are not part of any object.
+# ----------------------------------------------------------------------------
+def fingerprint(nodes):
+    objects = {}
+    owner = {}      # (design, part) -> object key
+    globalHash = hashlib.sha256()
+    design = ''
+
+    for index, node in enumerate(nodes):
+        if node.kind == 'design':
+            design = node.params['designName']
+            continue
+        created = node.creates()
+        used = node.uses()
+        if not created and not used:
+            globalHash.update(node.text.encode())
+            continue
+
+        # Every object this node touches becomes one object.
+        keys = []
+        for part in used + created:
+            key = owner.get((design, part))
+            if key is not None and key not in keys:
+                keys.append(key)
+        if keys:
+            key = keys[0]
+            entry = objects[key]
+            for other in keys[1:]:
+                merged = objects.pop(other)
+                entry['nodes'].extend(merged['nodes'])
+                entry['parts'].extend(merged['parts'])
+                for part in merged['parts']:
+                    owner[(design, part)] = key
+            entry['nodes'].sort()
+        else:
+            key = design + '/' + (created or used)[0]
+            entry = objects[key] = {'design': design, 'parts': [], 'nodes': []}
+        entry['nodes'].append(index)
+
+        for part in created:
+            owner[(design, part)] = key
+            entry['parts'].append(part)
+        consumed = []
+        if node.kind == 'delete':
+            consumed = node.params['Parts']
+        elif node.kind == 'subtract' and node.params['Clone'] != 'true':
+            consumed = node.params['toolParts']
+        elif node.kind in ('unite', 'intersect') and node.params['Clone'] != 'true':
+            consumed = node.params['Parts'][1:]
+        if consumed:
+            entry['parts'] = [part for part in entry['parts'] if part not in consumed]
+
+    for entry in objects.values():
+        digest = hashlib.sha256()
+        for index in entry['nodes']:
+            digest.update(nodes[index].text.encode())
+        entry['hash'] = digest.hexdigest()
+    return objects, globalHash.hexdigest()
+
+
+# Writes the delete-and-recreate script of the changed objects, design by
+# design.
+def _writeDelta(fid, nodes, objects, old, report):
+    stale = {}
+    for key in report['changed'] + report['removed']:
+        stale.setdefault(old[key]['design'], []).extend(old[key]['parts'])
+    fresh = {}
+    for key in report['changed'] + report['added']:
+        fresh.setdefault(objects[key]['design'], []).extend(objects[key]['nodes'])
+
+    first = True
+    for design in sorted(set(stale) | set(fresh)):
+        if first:
+            general.hfssUseActiveDesign(fid, design or None)
+            first = False
+        else:
+            fid.write('\nSet oDesign = oProject.SetActiveDesign("{0}")\n'
+                      'Set oEditor = oDesign.SetActiveEditor("3D Modeler")\n'.format(design))
+        if stale.get(design):
+            modeler.hfssDelete(fid, stale[design])
+        for index in sorted(fresh.get(design, [])):
+            node = nodes[index]
+            emit(fid, node.kind, node.params, node.text)
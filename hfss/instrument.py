@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# @File    : instrument.py
+# @Software: PyCharm
+
+import json
+import time
+from collections import defaultdict
+
+from . import scriptwriter
+
+
+# Pseudo function charged with the blocks emitted outside any instrumented
+# function (e.g. a Model replayed into a ScriptWriter).
+OTHER = '<other>'
+
+
+# ----------------------------------------------------------------------------
+# class Profiler([modules], [assemblies])
+#
+# Description :
+# -------------
+# Instrumentation of the public hfss* generators. While the profiler is
+# enabled (as a context manager, or between enable() and disable()) the
+# calls of every hfss* function are counted and timed, and every emitted
+# block is charged (bytes and parts created) to the functions on the call
+# stack. Each top-level call, e.g. one hfssDipole together with its two
+# child cylinders, is also kept as an assembly.
+#
+# The generators are decorated with scriptwriter.profiled where they are
+# defined, so the calls are seen however the functions were imported.
+# While the profiler is disabled the only remaining cost is one None check
+# per call and per emitted block. One profiler can be enabled at a time.
+#
+# Parameters :
+# ------------
+# modules    - (Optional) modules (or module names) whose hfss* functions
+#              are profiled (default: all of them).
+# assemblies - (Optional) keep one record per top-level call (default True).
+#
+# Note :
+# ------
+# Times, bytes and parts are inclusive: a function is charged with those
+# of the functions it calls. The collapsed stack file has the exclusive
+# time in microseconds of every call path, as read by flamegraph.pl or
+# speedscope.
+#
+# Example :
+# ---------
+# with Profiler() as profiler:
+#     buildArray(fid)
+# profiler.writeJson('profile.json')
+# profiler.writeCollapsed('profile.folded')
+# ----------------------------------------------------------------------------
+class Profiler(object):
+    def __init__(self, modules=None, assemblies=True):
+        self.modules = None if modules is None else \
+            set(getattr(module, '__name__', module) for module in modules)
+        self.keepAssemblies = assemblies
+        self.functions = defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'bytes': 0,
+                                              'objects': 0})
+        self.assemblies = []
+        self.stacks = defaultdict(float)    # 'f;g;h' -> exclusive seconds
+        self._stack = []                    # [name, path, child seconds, record]
+
+    def enable(self):
+        if scriptwriter.profiler is self:
+            return self
+        if scriptwriter.profiler is not None:
+            raise Exception('Another profiler is already enabled !!')
+        scriptwriter.profiler = self
+        scriptwriter.hook = self._emitted
+        return self
+
+    def disable(self):
+        if scriptwriter.profiler is self:
+            scriptwriter.profiler = None
+            scriptwriter.hook = None
+        return self
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, excType, excValue, traceback):
+        self.disable()
+
+    # ------------------------------------------------------------------------
+    # Returns the collected data as a dictionary: per function calls,
+    # seconds, bytes and objects, and the list of top-level assemblies.
+    # ------------------------------------------------------------------------
+    def report(self):
+        return {'functions': {name: dict(entry) for name, entry in
+                              sorted(self.functions.items())},
+                'assemblies': self.assemblies}
+
+    def writeJson(self, path):
+        with open(path, 'w') as target:
+            json.dump(self.report(), target, indent=1)
+
+    def writeCollapsed(self, path):
+        with open(path, 'w') as target:
+            for stack, seconds in sorted(self.stacks.items()):
+                target.write('{0} {1}\n'.format(stack, int(round(seconds * 1e6))))
+
+    # Runs one call of a generator (see scriptwriter.profiled).
+    def call(self, function, args, kwargs):
+        if self.modules is not None and function.__module__ not in self.modules:
+            return function(*args, **kwargs)
+        name = function.__name__
+        parent = self._stack[-1] if self._stack else None
+        path = name if parent is None else parent[1] + ';' + name
+        record = None
+        if parent is None and self.keepAssemblies:
+            record = {'function': name, 'name': _partName(args), 'seconds': 0.0,
+                      'bytes': 0, 'objects': 0}
+        frame = [name, path, 0.0, record]
+        self._stack.append(frame)
+        t0 = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._stack.pop()
+            entry = self.functions[name]
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+            self.stacks[path] += elapsed - frame[2]
+            if parent is not None:
+                parent[2] += elapsed
+            if record is not None:
+                record['seconds'] = elapsed
+                self.assemblies.append(record)
+
+    # scriptwriter.hook: charges one block to every function on the stack
+    # (once per function, even if recursive).
+    def _emitted(self, kind, params, text):
+        nBytes = len(text)
+        nObjects = _created(kind, params)
+        names = set(frame[0] for frame in self._stack) or (OTHER,)
+        for name in names:
+            entry = self.functions[name]
+            entry['bytes'] += nBytes
+            entry['objects'] += nObjects
+        if self._stack and self._stack[0][3] is not None:
+            self._stack[0][3]['bytes'] += nBytes
+            self._stack[0][3]['objects'] += nObjects
+
+
+# Number of parts a block creates.
+def _created(kind, params):
+    if kind in ('cylinder', 'box', 'rectangle'):
+        return 1
+    if kind in ('cylinderarray', 'boxarray', 'rectanglearray'):
+        return len(params['Names'])
+    if kind == 'duplicate':
+        return len(params['Clones'])
+    return 0
+
+
+# Name given to a top-level call: the first string argument after fid (the
+# part, design or project name of most generators).
+def _partName(args):
+    for arg in args[1:]:
+        if isinstance(arg, str):
+            return arg
+    return None
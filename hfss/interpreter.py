@@ -0,0 +1,825 @@
+# -*- coding: utf-8 -*-
+# @File    : interpreter.py
+# @Software: PyCharm
+
+import re
+import sys
+import time
+from collections import Counter
+
+
+# ----------------------------------------------------------------------------
+# function runScript(text)
+#
+# Description :
+# -------------
+# Executes a VB script produced by the hfss* generators without HFSS. Only
+# the subset of VBScript the generators emit is understood (Dim, Set, calls
+# with or without parentheses, string/number literals, Array(...),
+# CreateObject and Sub/Function definitions), and the HFSS objects are replaced by stand-ins that keep an
+# in-memory table of the parts of each design, so that errors such as
+# undefined variables, unknown methods, duplicated part names or booleans
+# on parts that do not exist are caught.
+#
+# Parameters :
+# ------------
+# text - the VB script.
+#
+# Returns :
+# ---------
+# A Report with the parts left in the model (objects), the number of
+# commands of each kind, the number of boolean operations, the errors found
+# ('line N: message') and the time it took (seconds).
+#
+# Note :
+# ------
+# Scripts that attach to an already open project (see hfssUseActiveDesign)
+# may refer to parts created by an earlier script; such references are
+# accepted.
+#
+# Example :
+# ---------
+# report = runScript(open('myantenna.vbs').read())
+# print(report)
+# ----------------------------------------------------------------------------
+def runScript(text):
+    return Interpreter().run(text)
+
+
+# Same as runScript, for a script file.
+def runFile(path):
+    with open(path) as script:
+        return runScript(script.read())
+
+
+# ----------------------------------------------------------------------------
+# function compareScripts(textA, textB)
+#
+# Description :
+# -------------
+# Checks that two VB scripts build the same model, e.g. the verbose and the
+# compact (see CompactEmitter) forms of a script: both are interpreted and
+# the sequences of calls made to the HFSS objects, with all their
+# arguments, must be identical.
+#
+# Returns :
+# ---------
+# The list of differences found (empty if the scripts are equivalent).
+#
+# Example :
+# ---------
+# assert not compareScripts(verbose.getvalue(), compact.getvalue())
+# ----------------------------------------------------------------------------
+def compareScripts(textA, textB):
+    reports = [Interpreter(trace=True).run(text) for text in (textA, textB)]
+    differences = []
+    for label, report in zip('AB', reports):
+        differences += ['script {0}, {1}'.format(label, error) for error in report.errors[:5]]
+    traceA, traceB = reports[0].trace, reports[1].trace
+    for i, (callA, callB) in enumerate(zip(traceA, traceB)):
+        if callA != callB:
+            differences.append('call {0} differs: {1} != {2}'.format(i + 1, callA, callB))
+            break
+    if len(traceA) != len(traceB):
+        differences.append('{0} calls != {1} calls'.format(len(traceA), len(traceB)))
+    if reports[0].objects != reports[1].objects:
+        differences.append('the models differ')
+    return differences
+
+
+# ----------------------------------------------------------------------------
+# class Report()
+#
+# Description :
+# -------------
+# Outcome of an interpreted script (see runScript).
+# ----------------------------------------------------------------------------
+class Report(object):
+    def __init__(self):
+        self.objects = {}       # 'design/part' -> kind of the part
+        self.commands = Counter()
+        self.errors = []
+        self.nLines = 0
+        self.nStatements = 0
+        self.seconds = 0.0
+        self.trace = []         # (method, args) of every call (with trace)
+        self.files = {}         # path -> text of the files written by the script
+
+    @property
+    def nObjects(self):
+        return len(self.objects)
+
+    @property
+    def nBooleans(self):
+        return sum(self.commands[command] for command in ('subtract', 'unite', 'intersect'))
+
+    def __str__(self):
+        lines = ['{0} lines, {1} statements in {2:.3f} s'.format(
+                     self.nLines, self.nStatements, self.seconds),
+                 '{0} objects, {1} boolean operations'.format(self.nObjects, self.nBooleans),
+                 'commands: ' + ', '.join('{0}={1}'.format(command, count) for command, count
+                                          in sorted(self.commands.items()))]
+        lines += ['error: ' + error for error in self.errors[:20]]
+        if len(self.errors) > 20:
+            lines.append('... {0} more errors'.format(len(self.errors) - 20))
+        return '\n'.join(lines)
+
+
+# Runtime error of the interpreted script.
+class ScriptError(Exception):
+    pass
+
+
+# Tokens: strings ("" escapes a quote), numbers, names and single characters.
+_TOKENS = re.compile(r'"(?:[^"]|"")*"|\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+|[A-Za-z_]\w*|\S')
+
+
+# ----------------------------------------------------------------------------
+# class Interpreter()
+#
+# Description :
+# -------------
+# The executor behind runScript. Statements are evaluated while they are
+# parsed (there is no syntax tree), which keeps a million-line script within
+# a few seconds. The statements of a Sub or Function are tokenized once,
+# when it is defined, and evaluated at every call with its arguments as
+# local variables. With trace, every call made to the HFSS objects is
+# recorded in report.trace.
+# ----------------------------------------------------------------------------
+class Interpreter(object):
+    def __init__(self, trace=False):
+        self.report = Report()
+        self.variables = {}     # lower case name -> value (None until Set)
+        self.procedures = {}    # lower case name -> _Procedure
+        self.trace = trace
+        self._tokens = []
+        self._i = 0
+        self._locals = None     # variables of the Sub/Function being run
+        self._defining = None   # _Procedure whose body is being read
+        self._explicit = False  # Option Explicit: assigned variables must be declared
+
+    def run(self, text):
+        t0 = time.perf_counter()
+        lines = text.splitlines()
+        self.report.nLines = len(lines)
+        statement = []
+        first = 0
+        for number, line in enumerate(lines, 1):
+            stripped = line.strip()
+            if not statement:
+                first = number
+                if not stripped or stripped[0] == "'":
+                    continue
+            if stripped.endswith(' _') or stripped == '_':
+                statement.append(stripped[:-1])
+                continue
+            statement.append(stripped)
+            self._execute(' '.join(statement), first)
+            statement = []
+        if statement:
+            self._execute(' '.join(statement), first)
+        if self._defining is not None:
+            self.report.errors.append('line {0}: expected "End {1}"'.format(
+                self.report.nLines, 'Function' if self._defining.isFunction else 'Sub'))
+        self.report.seconds = time.perf_counter() - t0
+        return self.report
+
+    def _execute(self, statement, line):
+        self.report.nStatements += 1
+        self._tokens = _TOKENS.findall(statement)
+        self._i = 0
+        try:
+            keyword = self._tokens[0].lower()
+            if self._defining is not None:
+                self._define(keyword, line)
+            elif keyword in ('sub', 'function'):
+                self._header(keyword == 'function')
+            else:
+                self._statement()
+        except ScriptError as error:
+            self.report.errors.append('line {0}: {1}'.format(line, error))
+        except (IndexError, ValueError):
+            self.report.errors.append('line {0}: syntax error'.format(line))
+
+    # Sub name(arg1, ...) / Function name(arg1, ...).
+    def _header(self, isFunction):
+        self._next()
+        name = self._next()
+        params = []
+        if self._peek() == '(':
+            self._next()
+            while self._peek() != ')':
+                token = self._next()
+                if token.lower() in ('byval', 'byref'):
+                    token = self._next()
+                params.append(token.lower())
+                if self._peek() == ',':
+                    self._next()
+            self._next()
+        if self._i != len(self._tokens):
+            raise ScriptError('unexpected "{0}"'.format(self._tokens[self._i]))
+        if self._locals is not None or name.lower() in self.procedures:
+            raise ScriptError("Name redefined: '{0}'".format(name))
+        self._defining = _Procedure(name.lower(), params, isFunction)
+
+    # A statement of the body being defined, up to End Sub / End Function.
+    def _define(self, keyword, line):
+        procedure = self._defining
+        if keyword == 'end' and len(self._tokens) == 2:
+            if self._tokens[1].lower() != ('function' if procedure.isFunction else 'sub'):
+                raise ScriptError('expected "End {0}"'.format(
+                    'Function' if procedure.isFunction else 'Sub'))
+            self.procedures[procedure.name] = procedure
+            self._defining = None
+        elif keyword in ('sub', 'function'):
+            raise ScriptError('syntax error')
+        else:
+            procedure.body.append((self._tokens, line))
+
+    # Runs a Sub or Function (from within the statement being evaluated).
+    def _invoke(self, procedure, args):
+        if len(args) != len(procedure.params):
+            raise ScriptError("Wrong number of arguments: '{0}'".format(procedure.name))
+        saved = self._tokens, self._i, self._locals
+        self._locals = dict(zip(procedure.params, args))
+        if procedure.isFunction:
+            self._locals[procedure.name] = None
+        try:
+            for tokens, line in procedure.body:
+                self.report.nStatements += 1
+                self._tokens = tokens
+                self._i = 0
+                try:
+                    self._statement()
+                except ScriptError as error:
+                    raise ScriptError('{0} (in {1}, line {2})'.format(error, procedure.name, line))
+            return self._locals.get(procedure.name)
+        finally:
+            self._tokens, self._i, self._locals = saved
+
+    # ------------------------------------------------------------------------
+    # Parser / evaluator.
+    # ------------------------------------------------------------------------
+    def _next(self):
+        token = self._tokens[self._i]
+        self._i += 1
+        return token
+
+    def _peek(self):
+        return self._tokens[self._i] if self._i < len(self._tokens) else None
+
+    def _expect(self, token):
+        if self._next() != token:
+            raise ScriptError('expected "{0}"'.format(token))
+
+    def _statement(self):
+        keyword = self._peek().lower()
+        if keyword == 'dim':
+            self._next()
+            scope = self.variables if self._locals is None else self._locals
+            while True:
+                scope.setdefault(self._next().lower(), None)
+                if self._peek() != ',':
+                    break
+                self._next()
+        elif keyword == 'option':
+            self._next()
+            self._explicit = self._peek() is not None and self._peek().lower() == 'explicit'
+            self._i = len(self._tokens)
+        elif keyword == 'set':
+            self._next()
+            name = self._next().lower()
+            self._expect('=')
+            self._assign(name, self._expression())
+        elif keyword == 'call':
+            self._next()
+            procedure = self._procedure(self._next())
+            self._invoke(procedure, self._arguments() if self._peek() == '(' else [])
+        else:
+            name = self._next()
+            if self._peek() == '=':
+                self._next()
+                self._assign(name.lower(), self._expression())
+            elif keyword in self.procedures:
+                args = []
+                if self._peek() is not None:
+                    args.append(self._expression())
+                    while self._peek() == ',':
+                        self._next()
+                        args.append(self._expression())
+                self._invoke(self.procedures[keyword], args)
+            else:
+                self._callStatement(name)
+        if self._i != len(self._tokens):
+            raise ScriptError('unexpected "{0}"'.format(self._tokens[self._i]))
+
+    # Without Option Explicit, assigning an undeclared variable declares it
+    # (in the Sub or Function being run, if any).
+    def _assign(self, name, value):
+        if self._locals is not None and (name in self._locals or
+                                         name not in self.variables and not self._explicit):
+            self._locals[name] = value
+            return
+        if name not in self.variables and self._explicit:
+            raise ScriptError("Variable is undefined: '{0}'".format(name))
+        self.variables[name] = value
+
+    # obj.Method arg1, arg2 ... (or obj.Method(arg1, ...)).
+    def _callStatement(self, name):
+        target = self._variable(name)
+        method = None
+        while self._peek() == '.':
+            self._next()
+            if method is not None:
+                target = self._call(target, method, [])
+            method = self._next()
+        if method is None:
+            raise ScriptError('syntax error')
+        args = []
+        if self._peek() is not None:
+            args.append(self._expression())
+            while self._peek() == ',':
+                self._next()
+                args.append(self._expression())
+        self._call(target, method, args)
+
+    def _expression(self):
+        value = self._term()
+        while self._peek() in ('&', '+', '-'):
+            operator = self._next()
+            other = self._term()
+            if operator == '&':
+                value = _text(value) + _text(other)
+            elif operator == '+' and isinstance(value, str) and isinstance(other, str):
+                value = value + other
+            elif operator == '+':
+                value = _number(value) + _number(other)
+            else:
+                value = _number(value) - _number(other)
+        return value
+
+    def _term(self):
+        token = self._next()
+        first = token[0]
+        if first == '"':
+            return token[1:-1].replace('""', '"')
+        if first.isdigit() or first == '.':
+            return float(token)
+        if first == '-':
+            return -self._term()
+        if first == '(':
+            value = self._expression()
+            self._expect(')')
+            return value
+        lower = token.lower()
+        if lower == 'true':
+            return True
+        if lower == 'false':
+            return False
+        if lower == 'array':
+            return self._arguments()
+        if lower == 'createobject':
+            args = self._arguments()
+            if args and _text(args[0]).lower() == 'scripting.filesystemobject':
+                return _FileSystem(self.report)
+            if not args or 'hfss' not in _text(args[0]).lower():
+                raise ScriptError("ActiveX component can't create object")
+            return _Application(self.report)
+        if not (first.isalpha() or first == '_'):
+            raise ScriptError('unexpected "{0}"'.format(token))
+        if lower in self.procedures and (self._locals is None or lower not in self._locals):
+            return self._invoke(self.procedures[lower],
+                                self._arguments() if self._peek() == '(' else [])
+
+        value = self._variable(token)
+        while self._peek() == '.':
+            self._next()
+            method = self._next()
+            args = self._arguments() if self._peek() == '(' else []
+            value = self._call(value, method, args)
+        return value
+
+    # (arg1, arg2, ...)
+    def _arguments(self):
+        self._expect('(')
+        args = []
+        if self._peek() == ')':
+            self._next()
+            return args
+        while True:
+            args.append(self._expression())
+            token = self._next()
+            if token == ')':
+                return args
+            if token != ',':
+                raise ScriptError('expected "," or ")"')
+
+    def _variable(self, name):
+        lower = name.lower()
+        if self._locals is not None and lower in self._locals:
+            return self._locals[lower]
+        if lower not in self.variables:
+            raise ScriptError("Variable is undefined: '{0}'".format(name))
+        return self.variables[lower]
+
+    def _procedure(self, name):
+        procedure = self.procedures.get(name.lower())
+        if procedure is None:
+            raise ScriptError("Sub or Function not defined: '{0}'".format(name))
+        return procedure
+
+    def _call(self, target, method, args):
+        if not isinstance(target, _VBObject):
+            raise ScriptError("Object required: '{0}'".format(method))
+        if self.trace:
+            self.report.trace.append((method.lower(), args))
+        function = getattr(target, 'vb_' + method.lower(), None)
+        if function is None:
+            if not target.acceptsAll:
+                raise ScriptError("Object doesn't support this property or method: '{0}'"
+                                  .format(method))
+            self.report.commands[method.lower()] += 1
+            return None
+        return function(*args)
+
+
+# A Sub or Function: its parameters and its tokenized statements.
+class _Procedure(object):
+    def __init__(self, name, params, isFunction):
+        self.name = name
+        self.params = params
+        self.isFunction = isFunction
+        self.body = []          # (tokens, line) of each statement
+
+
+def _text(value):
+    if isinstance(value, bool):
+        return 'True' if value else 'False'
+    if isinstance(value, float) and value == int(value):
+        return str(int(value))
+    return str(value)
+
+
+# Numeric value of an operand of + or -, as in VBScript: Empty is 0, True
+# is -1 and strings must hold a number.
+def _number(value):
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return -1.0 if value else 0.0
+    if not isinstance(value, (float, str)):
+        raise ScriptError('Type mismatch')
+    try:
+        return float(value)
+    except ValueError:
+        raise ScriptError("Type mismatch: '{0}'".format(value))
+
+
+# Fields of an Array("NAME:...", "Key:=", value, ..., Array("NAME:Sub", ...))
+# as a dictionary (nested arrays under their NAME).
+def _fields(array):
+    if not isinstance(array, list):
+        raise ScriptError('Array expected')
+    fields = {}
+    i = 1 if array and isinstance(array[0], str) and array[0].startswith('NAME:') else 0
+    while i < len(array):
+        item = array[i]
+        if isinstance(item, str) and item.endswith(':='):
+            fields[item[:-2]] = array[i + 1] if i + 1 < len(array) else None
+            i += 2
+            continue
+        if isinstance(item, list) and item and isinstance(item[0], str) \
+                and item[0].startswith('NAME:'):
+            fields[item[0][5:]] = item
+        i += 1
+    return fields
+
+
+def _names(value):
+    return [name for name in _text(value).split(',') if name]
+
+
+# ----------------------------------------------------------------------------
+# Stand-ins of the HFSS scripting objects. A method M of the VB object is
+# implemented as vb_m; objects with acceptsAll take (and count) any call.
+# ----------------------------------------------------------------------------
+class _VBObject(object):
+    acceptsAll = False
+
+    def __init__(self, report):
+        self.report = report
+
+
+class _Application(_VBObject):
+    def vb_getappdesktop(self):
+        return _Desktop(self.report)
+
+
+class _Desktop(_VBObject):
+    def __init__(self, report):
+        _VBObject.__init__(self, report)
+        self.active = None
+        self.registry = {}
+
+    def vb_restorewindow(self):
+        pass
+
+    def vb_newproject(self):
+        self.report.commands['newproject'] += 1
+        self.active = _Project(self.report, external=False)
+        return self.active
+
+    def vb_getactiveproject(self):
+        if self.active is None:
+            # Attaching to a project opened before the script.
+            self.active = _Project(self.report, external=True)
+        return self.active
+
+    def vb_setregistryfromfile(self, path):
+        self.report.commands['setregistryfromfile'] += 1
+
+    def vb_getregistrystring(self, key):
+        return self.registry.get(_text(key), '')
+
+    def vb_setregistrystring(self, key, value):
+        self.registry[_text(key)] = _text(value)
+        self.report.commands['setregistrystring'] += 1
+
+
+# Scripting.FileSystemObject: the files the script writes are kept in
+# report.files instead of being written to disk.
+class _FileSystem(_VBObject):
+    def vb_createtextfile(self, path, overwrite=False):
+        path = _text(path)
+        if path in self.report.files and not overwrite:
+            raise ScriptError("File already exists: '{0}'".format(path))
+        self.report.files[path] = ''
+        return _TextFile(self.report, path)
+
+
+class _TextFile(_VBObject):
+    def __init__(self, report, path):
+        _VBObject.__init__(self, report)
+        self.path = path
+
+    def vb_write(self, text):
+        self.report.files[self.path] += _text(text)
+
+    def vb_writeline(self, text=''):
+        self.report.files[self.path] += _text(text) + '\n'
+
+    def vb_close(self):
+        pass
+
+
+class _Project(_VBObject):
+    def __init__(self, report, external):
+        _VBObject.__init__(self, report)
+        self.external = external
+        self.designs = {}
+        self.active = None
+
+    def vb_insertdesign(self, tool, name, solutionType='', extra=''):
+        name = _text(name)
+        if name in self.designs:
+            raise ScriptError("Design '{0}' already exists".format(name))
+        self.report.commands['insertdesign'] += 1
+        self.designs[name] = self.active = _Design(self.report, name, external=False)
+
+    def vb_setactivedesign(self, name):
+        name = _text(name)
+        if name not in self.designs:
+            if not self.external:
+                raise ScriptError("Design '{0}' does not exist".format(name))
+            self.designs[name] = _Design(self.report, name, external=True)
+        self.active = self.designs[name]
+        return self.active
+
+    def vb_getactivedesign(self):
+        if self.active is None:
+            if not self.external:
+                raise ScriptError('The project has no design')
+            self.active = self.designs[''] = _Design(self.report, '', external=True)
+        return self.active
+
+    def vb_changeproperty(self, tabs):
+        self.report.commands['changeproperty'] += 1
+
+
+class _Design(_VBObject):
+    def __init__(self, report, name, external):
+        _VBObject.__init__(self, report)
+        self.name = name
+        self.external = external
+        self.editor = _Editor(report, name, external)
+        self.setups = set()
+        self.meshOperations = set()
+
+    def vb_setactiveeditor(self, name):
+        if _text(name) != '3D Modeler':
+            raise ScriptError("Unknown editor '{0}'".format(name))
+        return self.editor
+
+    def vb_getmodule(self, name):
+        if _text(name) == 'AnalysisSetup':
+            return _AnalysisSetup(self.report, self)
+        if _text(name) == 'MeshSetup':
+            return _MeshSetup(self.report, self)
+        if _text(name) == 'BoundarySetup':
+            return _BoundarySetup(self.report, self)
+        return _Module(self.report)
+
+    def vb_analyze(self, name):
+        self.requireSetup(name)
+        self.report.commands['analyze'] += 1
+
+    def requireSetup(self, name):
+        if not self.external and _text(name) not in self.setups:
+            raise ScriptError("Unknown solution setup '{0}'".format(name))
+
+    def vb_changeproperty(self, tabs):
+        self.report.commands['changeproperty'] += 1
+
+
+class _Module(_VBObject):
+    acceptsAll = True
+
+
+class _AnalysisSetup(_Module):
+    def __init__(self, report, design):
+        _Module.__init__(self, report)
+        self.design = design
+
+    def vb_insertsetup(self, setupType, parameters):
+        if not isinstance(parameters, list) or not parameters:
+            raise ScriptError('Setup parameters expected')
+        name = _text(parameters[0])[5:]
+        if name in self.design.setups:
+            raise ScriptError("Solution setup '{0}' already exists".format(name))
+        self.design.setups.add(name)
+        self.report.commands['insertsetup'] += 1
+
+    def vb_insertfrequencysweep(self, setup, parameters):
+        self.design.requireSetup(setup)
+        self.report.commands['insertfrequencysweep'] += 1
+
+
+class _BoundarySetup(_Module):
+    def __init__(self, report, design):
+        _Module.__init__(self, report)
+        self.design = design
+
+    def vb_assignsymmetry(self, parameters):
+        faces = _fields(parameters).get('Faces')
+        if not isinstance(faces, list) or not faces:
+            raise ScriptError('The symmetry boundary has no faces')
+        self.report.commands['assignsymmetry'] += 1
+
+
+class _MeshSetup(_Module):
+    def __init__(self, report, design):
+        _Module.__init__(self, report)
+        self.design = design
+
+    def vb_assignlengthop(self, parameters):
+        self._assign('assignlengthop', parameters)
+
+    def vb_assignskindepthop(self, parameters):
+        self._assign('assignskindepthop', parameters)
+
+    def _assign(self, command, parameters):
+        if not isinstance(parameters, list) or not parameters:
+            raise ScriptError('Mesh operation parameters expected')
+        name = _text(parameters[0])[5:]
+        if name in self.design.meshOperations:
+            raise ScriptError("Mesh operation '{0}' already exists".format(name))
+        objects = _fields(parameters).get('Objects')
+        if not isinstance(objects, list) or not objects:
+            raise ScriptError('The mesh operation has no objects')
+        self.design.editor._require([_text(part) for part in objects])
+        self.design.meshOperations.add(name)
+        self.report.commands[command] += 1
+
+
+class _Editor(_VBObject):
+    def __init__(self, report, design, external):
+        _VBObject.__init__(self, report)
+        self.prefix = design + '/'
+        self.external = external
+
+    def vb_createcylinder(self, parameters, attributes):
+        self._create('cylinder', parameters, attributes, 'CylinderParameters')
+
+    def vb_createbox(self, parameters, attributes):
+        self._create('box', parameters, attributes, 'BoxParameters')
+
+    def vb_createrectangle(self, parameters, attributes):
+        self._create('rectangle', parameters, attributes, 'RectangleParameters')
+
+    def vb_subtract(self, selections, parameters):
+        fields = _fields(selections)
+        blanks = _names(fields.get('Blank Parts', ''))
+        tools = _names(fields.get('Tool Parts', ''))
+        if not blanks or not tools:
+            raise ScriptError('Subtract needs blank and tool parts')
+        self._require(blanks + tools)
+        if not _fields(parameters).get('KeepOriginals'):
+            self._remove(tools)
+        self.report.commands['subtract'] += 1
+
+    def vb_unite(self, selections, parameters):
+        self._combine('unite', selections, parameters)
+
+    def vb_intersect(self, selections, parameters):
+        self._combine('intersect', selections, parameters)
+
+    def vb_delete(self, selections):
+        parts = _names(_fields(selections).get('Selections', ''))
+        self._require(parts)
+        self._remove(parts)
+        self.report.commands['delete'] += 1
+
+    def vb_split(self, selections, parameters):
+        parts = _names(_fields(selections).get('Selections', ''))
+        self._require(parts)
+        if _fields(parameters).get('SplitPlane') not in ('XY', 'YZ', 'ZX'):
+            raise ScriptError('Invalid split plane')
+        self.report.commands['split'] += 1
+
+    def vb_getfacebyposition(self, parameters):
+        body = _fields(parameters).get('BodyName')
+        if not body:
+            raise ScriptError('The face has no body')
+        self._require([_text(body)])
+        self.report.commands['getfacebyposition'] += 1
+        return float(self.report.commands['getfacebyposition'])
+
+    def vb_duplicatealongline(self, selections, parameters, options=None):
+        self._duplicate(selections, parameters)
+
+    def vb_duplicatearoundaxis(self, selections, parameters, options=None):
+        self._duplicate(selections, parameters)
+
+    def _create(self, kind, parameters, attributes, expected):
+        if not isinstance(parameters, list) or not parameters or \
+                parameters[0] != 'NAME:' + expected:
+            raise ScriptError('{0} expected'.format(expected))
+        axis = _fields(parameters).get('WhichAxis', 'Z')
+        if axis not in ('X', 'Y', 'Z'):
+            raise ScriptError("Invalid axis '{0}'".format(axis))
+        name = _fields(attributes).get('Name')
+        if not name:
+            raise ScriptError('The part has no name')
+        self._add(_text(name), kind)
+        self.report.commands[kind] += 1
+
+    def _combine(self, command, selections, parameters):
+        parts = _names(_fields(selections).get('Selections', ''))
+        if len(parts) < 2:
+            raise ScriptError('{0} needs at least two parts'.format(command.capitalize()))
+        self._require(parts)
+        if not _fields(parameters).get('KeepOriginals'):
+            self._remove(parts[1:])
+        self.report.commands[command] += 1
+
+    def _duplicate(self, selections, parameters):
+        parts = _names(_fields(selections).get('Selections', ''))
+        self._require(parts)
+        nClones = int(float(_fields(parameters).get('NumClones', 0)))
+        for part in parts:
+            kind = self.report.objects.get(self.prefix + part, 'external')
+            # Like HFSS, clones are named part_1, part_2, ... skipping the
+            # names already taken.
+            k = 0
+            for _ in range(1, nClones):
+                k += 1
+                while self.prefix + '{0}_{1}'.format(part, k) in self.report.objects:
+                    k += 1
+                self._add('{0}_{1}'.format(part, k), kind)
+        self.report.commands['duplicate'] += 1
+
+    def _add(self, name, kind):
+        key = self.prefix + name
+        if key in self.report.objects:
+            raise ScriptError("A part named '{0}' already exists".format(name))
+        self.report.objects[key] = kind
+
+    def _require(self, parts):
+        if self.external:
+            return
+        missing = [part for part in parts if self.prefix + part not in self.report.objects]
+        if missing:
+            raise ScriptError('Unknown parts: ' + ','.join(missing))
+
+    def _remove(self, parts):
+        for part in parts:
+            self.report.objects.pop(self.prefix + part, None)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print('usage: python interpreter.py script.vbs')
+        sys.exit(2)
+    report = runFile(sys.argv[1])
+    print(report)
+    sys.exit(1 if report.errors else 0)
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+# @File    : mesh.py
+# @Software: PyCharm
+
+import math
+
+from . import modeler
+from .scriptwriter import emit, profiled
+
+# Speed of light (m/s) and permeability of free space (H/m).
+C0 = 299792458.0
+MU0 = 4e-7 * math.pi
+
+
+# ----------------------------------------------------------------------------
+# function hfssAssignLengthOp(fid, Name, Parts, MaxLength, Units,
+#                             [MaxElements], [RefineInside])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to assign a length based mesh operation
+# to a set of parts: the initial mesh of their surfaces (and, with
+# RefineInside, their volumes) has no edge longer than MaxLength.
+#
+# Parameters :
+# ------------
+# fid          - file identifier of the HFSS script file.
+# Name         - name of the mesh operation (e.g. 'Length1').
+# Parts        - list of the names of the parts (or a single name).
+# MaxLength    - maximum length of the mesh elements.
+# Units        - units of MaxLength ('mm', 'in', ...).
+# MaxElements  - (Optional) maximum number of elements added by the
+#                operation (default: no limit).
+# RefineInside - (Optional) if True, the inside of the parts is refined as
+#                well (default False).
+#
+# Example :
+# ---------
+# hfssAssignLengthOp(fid, 'FeedGap', ['Dip1', 'Dip2'], 0.05, 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssAssignLengthOp(fid, Name, Parts, MaxLength, Units, MaxElements=None,
+                       RefineInside=False):
+    if isinstance(Parts, str):
+        Parts = [Parts]
+
+    emit(fid, 'meshop',
+         dict(Type='length', Name=Name, Parts=Parts, MaxLength=MaxLength, Units=Units,
+              MaxElements=MaxElements, RefineInside=RefineInside),
+         '\n'
+         'Set oModule = oDesign.GetModule("MeshSetup")\n'
+         'oModule.AssignLengthOp _\n'
+         'Array("NAME:{0}", _\n'
+         '"RefineInside:=", {1}, _\n'
+         '"Enabled:=", true, _\n'
+         '"Objects:=", Array({2}), _\n'
+         '"RestrictElem:=", {3}, _\n'
+         '"NumMaxElem:=", "{4}", _\n'
+         '"RestrictLength:=", true, _\n'
+         '"MaxLength:=", "{5}")\n'
+         .format(Name, 'true' if RefineInside else 'false', _objects(Parts),
+                 'false' if MaxElements is None else 'true',
+                 1000 if MaxElements is None else MaxElements,
+                 modeler._dim(MaxLength, Units)))
+
+
+# ----------------------------------------------------------------------------
+# function hfssAssignSkinDepthOp(fid, Name, Parts, SkinDepth, Units,
+#                                [NumLayers], [SurfTriLength], [MaxElements])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to assign a skin depth based mesh
+# operation to a set of (conducting) parts: NumLayers layers of elements
+# are placed within SkinDepth below their surfaces.
+#
+# Parameters :
+# ------------
+# fid           - file identifier of the HFSS script file.
+# Name          - name of the mesh operation (e.g. 'SkinDepth1').
+# Parts         - list of the names of the parts (or a single name).
+# SkinDepth     - skin depth (see skinDepth).
+# Units         - units of SkinDepth and SurfTriLength.
+# NumLayers     - (Optional) number of layers of elements (default 2).
+# SurfTriLength - (Optional) maximum length of the surface triangles
+#                 (default: 20 skin depths).
+# MaxElements   - (Optional) maximum number of elements added by the
+#                 operation (default: no limit).
+#
+# Example :
+# ---------
+# hfssAssignSkinDepthOp(fid, 'Copper', ['Dip1', 'Dip2'], 1.3, 'um');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssAssignSkinDepthOp(fid, Name, Parts, SkinDepth, Units, NumLayers=2, SurfTriLength=None,
+                          MaxElements=None):
+    if isinstance(Parts, str):
+        Parts = [Parts]
+    if SurfTriLength is None:
+        SurfTriLength = 20 * SkinDepth if not isinstance(SkinDepth, str) else \
+            '20*(' + SkinDepth + ')'
+
+    emit(fid, 'meshop',
+         dict(Type='skindepth', Name=Name, Parts=Parts, SkinDepth=SkinDepth, Units=Units,
+              NumLayers=NumLayers, SurfTriLength=SurfTriLength, MaxElements=MaxElements),
+         '\n'
+         'Set oModule = oDesign.GetModule("MeshSetup")\n'
+         'oModule.AssignSkinDepthOp _\n'
+         'Array("NAME:{0}", _\n'
+         '"Enabled:=", true, _\n'
+         '"Objects:=", Array({1}), _\n'
+         '"RestrictElem:=", {2}, _\n'
+         '"NumMaxElem:=", "{3}", _\n'
+         '"SkinDepth:=", "{4}", _\n'
+         '"SurfTriMaxLength:=", "{5}", _\n'
+         '"NumLayers:=", "{6}")\n'
+         .format(Name, _objects(Parts), 'false' if MaxElements is None else 'true',
+                 1000 if MaxElements is None else MaxElements,
+                 modeler._dim(SkinDepth, Units), modeler._dim(SurfTriLength, Units),
+                 NumLayers))
+
+
+# "A", "B", ... for the Objects:= of a mesh operation.
+def _objects(Parts):
+    return ', '.join('"' + part + '"' for part in Parts)
+
+
+# ----------------------------------------------------------------------------
+# function skinDepth(fGHz, Conductivity, [RelPermeability])
+#
+# Description :
+# -------------
+# Skin depth (in meters) of a conductor at fGHz:
+# 1 / sqrt(pi * f * mu * sigma).
+#
+# Example :
+# ---------
+# skinDepth(10, 5.8e7)      # copper at 10 GHz: 0.66 um
+# ----------------------------------------------------------------------------
+def skinDepth(fGHz, Conductivity, RelPermeability=1.0):
+    return 1.0 / math.sqrt(math.pi * fGHz * 1e9 * MU0 * RelPermeability * Conductivity)
+
+
+# ----------------------------------------------------------------------------
+# function featureSizes(registry, [Margin])
+#
+# Description :
+# -------------
+# Smallest geometric feature (in meters) of every part tracked by an
+# ObjectRegistry: the smallest non-zero dimension of the part (diameter of
+# a thin cylinder, width of a strip, thickness of a plate), of the holes
+# subtracted from it (e.g. the holes of hfssBox), and of the gaps narrower
+# than Margin that separate it from another part (e.g. the feed gap
+# between the two arms made by hfssDipole).
+# ----------------------------------------------------------------------------
+def featureSizes(registry, Margin=0.0, Tol=1e-12):
+    import numpy as np
+    sizes = {}
+    for Name, (lo, hi, _, cuts) in registry.boxes.items():
+        extents = [hi - lo] + [b - a for a, b in cuts]
+        smallest = [extent[extent > Tol].min() for extent in extents if np.any(extent > Tol)]
+        if smallest:
+            sizes[Name] = float(min(smallest))
+
+    if Margin > 0:
+        for A, B in registry.overlaps(Margin):
+            loA, hiA = registry.boxes[A][:2]
+            loB, hiB = registry.boxes[B][:2]
+            gap = float(np.max(np.maximum(loB - hiA, loA - hiB)))
+            if gap > Tol:
+                for Name in (A, B):
+                    if Name in sizes:
+                        sizes[Name] = min(sizes[Name], gap)
+    return sizes
+
+
+# ----------------------------------------------------------------------------
+# function hfssAutoMeshOps(fid, registry, fGHz, Units, [Resolution],
+#                          [Margin], [Conductors], [Conductivity],
+#                          [Prefix])
+#
+# Description :
+# -------------
+# Seeds the initial mesh from the known geometry, so that the adaptive
+# passes do not have to discover the small features one refinement at a
+# time. The feature size of every part is found from an ObjectRegistry
+# (see featureSizes): parts whose features call for elements smaller than
+# a tenth of the wavelength at fGHz (the initial mesh is already about
+# lambda/3) get a length based mesh operation with
+#
+#   MaxLength = feature size / Resolution,
+#
+# rounded down to the 1-2-5 series so that the parts of a dense array
+# share a handful of operations instead of one each. With Conductors, the
+# parts thicker than two skin depths also get a skin depth operation.
+#
+# Parameters :
+# ------------
+# fid          - file identifier of the HFSS script file.
+# registry     - ObjectRegistry that recorded the geometry of the design.
+# fGHz         - solution frequency (in GHz, see hfssInsertSolution).
+# Units        - units of the lengths written to the script.
+# Resolution   - (Optional) number of elements across the smallest feature
+#                of a part (default 4).
+# Margin       - (Optional) gaps narrower than Margin (meters) count as
+#                features (default: a twentieth of the wavelength).
+# Conductors   - (Optional) list of the conducting parts.
+# Conductivity - (Optional) conductivity of the Conductors in S/m
+#                (default 5.8e7, copper).
+# Prefix       - (Optional) prefix of the names of the operations
+#                (default 'Auto').
+#
+# Returns :
+# ---------
+# The list of (operation name, parts, size in Units) emitted.
+#
+# Example :
+# ---------
+# registry = ObjectRegistry()
+# fid = ScriptWriter('array.vbs', observers=[registry.record])
+# ...
+# for i in range(256):
+#     hfssDipole(fid, 'Dip' + str(i) + '_', 'Z', Centers[i], 10, 0.5, 0.2, 'mm')
+# hfssAutoMeshOps(fid, registry, 10, 'mm')
+# hfssInsertSolution(fid, 'Setup1', 10)
+# ----------------------------------------------------------------------------
+@profiled
+def hfssAutoMeshOps(fid, registry, fGHz, Units, Resolution=4, Margin=None, Conductors=None,
+                    Conductivity=5.8e7, Prefix='Auto'):
+    from .spatial import UNITS
+    wavelength = C0 / (fGHz * 1e9)
+    if Margin is None:
+        Margin = wavelength / 20
+    sizes = featureSizes(registry, Margin)
+
+    groups = {}
+    for Name, size in sizes.items():
+        if size / Resolution < wavelength / 10:
+            groups.setdefault(_roundDown(size / Resolution / UNITS[Units]), []).append(Name)
+
+    operations = []
+    for i, MaxLength in enumerate(sorted(groups)):
+        Name = '{0}Length{1}'.format(Prefix, i + 1)
+        hfssAssignLengthOp(fid, Name, groups[MaxLength], MaxLength, Units)
+        operations.append((Name, groups[MaxLength], MaxLength))
+
+    if Conductors:
+        depth = skinDepth(fGHz, Conductivity)
+        Parts = [Name for Name in Conductors if sizes.get(Name, 0.0) > 2 * depth]
+        if Parts:
+            Name = Prefix + 'SkinDepth'
+            SkinDepth = float('{0:.3g}'.format(depth / UNITS[Units]))
+            hfssAssignSkinDepthOp(fid, Name, Parts, SkinDepth, Units)
+            operations.append((Name, Parts, SkinDepth))
+    return operations
+
+
+# Largest value of the 1-2-5 series not above x.
+def _roundDown(x):
+    decade = 10.0 ** math.floor(math.log10(x))
+    for step in (5, 2, 1):
+        if step * decade <= x * (1 + 1e-9):
+            return float('{0:.3g}'.format(step * decade))
+    return float('{0:.3g}'.format(decade))
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# @File    : model.py
+# @Software: PyCharm
+
+from . import modeler
+from .scriptwriter import emit
+
+
+# Kinds of nodes that create the single part named in params['Name'].
+PRIMITIVES = ('cylinder', 'box', 'rectangle')
+
+
+# ----------------------------------------------------------------------------
+# class Node(kind, params, text)
+#
+# Description :
+# -------------
+# One recorded generator call: its kind ('cylinder', 'subtract', 'design',
+# ...), the parameters it was called with and the VB script it produced.
+# Raw text written directly to the model is kept as a node of kind None.
+# ----------------------------------------------------------------------------
+class Node(object):
+    __slots__ = ('kind', 'params', 'text')
+
+    def __init__(self, kind, params, text):
+        self.kind = kind
+        self.params = params
+        self.text = text
+
+    # Names of the parts this node creates.
+    def creates(self):
+        if self.kind in PRIMITIVES:
+            return [self.params['Name']]
+        if self.kind in ('cylinderarray', 'boxarray', 'rectanglearray'):
+            return list(self.params['Names'])
+        if self.kind == 'duplicate':
+            return self.params['Clones']
+        return []
+
+    # Names of the existing parts this node uses.
+    def uses(self):
+        if self.kind == 'subtract':
+            return self.params['blankParts'] + self.params['toolParts']
+        if self.kind in ('delete', 'duplicate', 'unite', 'intersect', 'split'):
+            return self.params['Parts']
+        return []
+
+    # Raw text, design level commands, mesh operations, boundaries and
+    # analyses may refer to anything (or need the model complete), so no
+    # node is moved or dropped across them.
+    def isBarrier(self):
+        return self.kind is None or self.kind in ('project', 'design', 'meshop', 'symmetry',
+                                                  'analyze')
+
+
+# ----------------------------------------------------------------------------
+# class Model()
+#
+# Description :
+# -------------
+# An in-memory script sink. Passed as fid to the hfss* generators, it
+# records one Node per generated block instead of writing text, so that a
+# pipeline of optimization passes can rewrite the whole model before any
+# VB script is emitted.
+#
+# Example :
+# ---------
+# model = Model()
+# hfssNewProject(model)
+# hfssInsertDesign(model, 'PCB')
+# hfssBox(model, 'FR4', [0, 0, 0], [50, 50, 1.6], 'mm', [10, 10, 0], 0.4, 'Z', ...)
+# model.optimize()
+# with ScriptWriter('pcb.vbs') as fid:
+#     model.writeTo(fid)
+# ----------------------------------------------------------------------------
+class Model(object):
+    def __init__(self):
+        self.nodes = []
+
+    def write(self, text):
+        self.nodes.append(Node(None, None, text))
+
+    def emit(self, kind, params, text):
+        self.nodes.append(Node(kind, params, text))
+
+    # Runs the passes (functions mapping a node list to a new node list) in
+    # order.
+    def optimize(self, passes=None):
+        for optimizationPass in (PASSES if passes is None else passes):
+            self.nodes = optimizationPass(self.nodes)
+        return self
+
+    # Replays the model into another script sink.
+    def writeTo(self, fid):
+        for node in self.nodes:
+            if node.kind is None:
+                fid.write(node.text)
+            else:
+                emit(fid, node.kind, node.params, node.text)
+
+    def getvalue(self):
+        return ''.join(node.text for node in self.nodes)
+
+
+# ----------------------------------------------------------------------------
+# function mergeSubtracts(nodes)
+#
+# Description :
+# -------------
+# Merges the Subtracts applied to the same blank part into a single
+# multi-tool Subtract, e.g. the one-Subtract-per-hole sequence produced by
+# hfssBox. A Subtract is postponed until the last mergeable one, which is
+# only allowed while no other node touches the blank or the tools already
+# collected.
+# ----------------------------------------------------------------------------
+def mergeSubtracts(nodes):
+    result = []
+    pending = {}    # blank -> [index in result, toolParts, Clone, merged]
+    watched = {}    # part -> blank whose pending Subtract involves it
+
+    def close(blank):
+        index, toolParts, Clone, merged = pending.pop(blank)
+        for part in [blank] + toolParts:
+            watched.pop(part, None)
+        if merged:
+            # May come back as several Subtracts if the tools exceed a chunk.
+            result[index] = _renderAll(modeler.hfssSubtract, [blank], toolParts, Clone)
+
+    for node in nodes:
+        if node.isBarrier():
+            for blank in list(pending):
+                close(blank)
+        elif node.kind == 'subtract' and len(node.params['blankParts']) == 1:
+            blank = node.params['blankParts'][0]
+            Clone = node.params['Clone']
+            toolParts = node.params['toolParts']
+            entry = pending.get(blank)
+            if entry is not None and entry[2] == Clone and \
+                    not any(watched.get(part) for part in toolParts):
+                # Move the pending Subtract here and add the new tools.
+                result[entry[0]] = None
+                entry[0] = len(result)
+                entry[1] = entry[1] + toolParts
+                entry[3] = True
+                for part in toolParts:
+                    watched[part] = blank
+                result.append(node)
+                continue
+            for part in [blank] + toolParts:
+                if part in watched:
+                    close(watched[part])
+            pending[blank] = [len(result), list(toolParts), Clone, False]
+            for part in [blank] + toolParts:
+                watched[part] = blank
+        else:
+            for part in node.uses() + node.creates():
+                if part in watched:
+                    close(watched[part])
+        result.append(node)
+
+    for blank in list(pending):
+        close(blank)
+    flat = []
+    for node in result:
+        if isinstance(node, list):
+            flat.extend(node)
+        elif node is not None:
+            flat.append(node)
+    return flat
+
+
+# ----------------------------------------------------------------------------
+# function dropDeadObjects(nodes)
+#
+# Description :
+# -------------
+# Drops the parts that are created and later deleted without being used in
+# between, together with their entry in the Delete.
+# ----------------------------------------------------------------------------
+def dropDeadObjects(nodes):
+    created = {}    # part -> index of the node that created it, while unused
+    dead = set()
+    deletes = {}    # index of a Delete node -> parts left to delete
+
+    for index, node in enumerate(nodes):
+        if node.isBarrier():
+            created.clear()
+        elif node.kind == 'delete':
+            Parts = []
+            for part in node.params['Parts']:
+                if part in created:
+                    dead.add(created.pop(part))
+                else:
+                    Parts.append(part)
+            deletes[index] = Parts
+        else:
+            for part in node.uses():
+                created.pop(part, None)
+            if node.kind in PRIMITIVES:
+                created[node.params['Name']] = index
+
+    result = []
+    for index, node in enumerate(nodes):
+        if index in dead:
+            continue
+        if index in deletes and len(deletes[index]) != len(node.params['Parts']):
+            if not deletes[index]:
+                continue
+            node = _render(modeler.hfssDelete, deletes[index])
+        result.append(node)
+    return result
+
+
+# ----------------------------------------------------------------------------
+# function foldRedundant(nodes)
+#
+# Description :
+# -------------
+# Removes commands that have no effect on the model: Subtracts without tool
+# parts, Unites and Intersects of a single part, Deletes without parts,
+# duplications into a single copy and empty raw text.
+# ----------------------------------------------------------------------------
+def foldRedundant(nodes):
+    result = []
+    for node in nodes:
+        if node.kind is None and not node.text:
+            continue
+        if node.kind == 'subtract' and not node.params['toolParts']:
+            continue
+        if node.kind == 'delete' and not node.params['Parts']:
+            continue
+        if node.kind in ('unite', 'intersect') and len(node.params['Parts']) < 2:
+            continue
+        if node.kind == 'duplicate' and int(node.params['NumClones']) <= 1:
+            continue
+        result.append(node)
+    return result
+
+
+# Default optimization pipeline.
+PASSES = (dropDeadObjects, mergeSubtracts, foldRedundant)
+
+
+# Calls a generator on a scratch model and returns the single node it makes.
+def _render(generator, *args):
+    return _renderAll(generator, *args)[0]
+
+
+# Calls a generator on a scratch model and returns all the nodes it makes.
+def _renderAll(generator, *args):
+    scratch = Model()
+    generator(scratch, *args)
+    return scratch.nodes
@@ -0,0 +1,1030 @@
+# -*- coding: utf-8 -*-
+# @Time    : 5/16/2021 5:17 PM
+# @Author  : Mingdian Liu
+# @Email   : mingdian@iastate.edu lmdvigor@gmail.com
+# @File    : modeler.py
+# @Software: PyCharm
+
+from .booleans import hfssSubtract, hfssUnite, hfssIntersect
+from .scriptwriter import emit, profiled
+
+# ----------------------------------------------------------------------------
+# function hfssDipole(fid, Name, Axis, Center, Length, Size, gapLen, ...
+#                     Units, [Type], [StrpNrmlAxis])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to model a dipole antenna in HFSS. The
+# dipole can be either a cylinder, a strip or a cuboid.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Name    - name of the dipole (the actual names will appears Name1 and Name2
+#           in the 3D Modeller).
+# Axis    - specify as either 'X', 'Y' or 'Z' - the axis of the dipole.
+# Center  - center of the dipole antenna.
+# Length  - total length of the dipole antenna (including the center gap).
+# Size    - if the dipole is cylindrical (default), this represents the dipole
+#           diameter. Similarly, for a cuboid, Size represents the
+#           cross-section dimension, and for a strip, Size represents the
+#           strip width.
+# gapLen  - the length of the dipole gap.
+# Units   - can be specified as 'in', 'mm', 'meter' or anything else defined
+#           in HFSS.
+# [Type]  - (optional) type of the dipole. Specify as:
+#           'c' - cylinder (default).
+#           'r' - cuboid.
+#           's' - strip.
+# [StrpNrmlAxis] - (optional) if the dipole type is a strip, then this
+#                  specifies the axis that is normal to the strip. By default,
+#                  the axis next to 'Axis' in the right-hand sense is taken.
+#                  (i.e., 'X' for 'Z', 'Y' for 'X', ...)
+#
+# Note :
+# ------
+# Each arm of the dipole will be (Length - gapLen)/2 long.
+#
+# ----------------------------------------------------------------------------
+
+@profiled
+def hfssDipole(fid, Name, Axis, Center, Length, Size, gapLen, Units, Type='c', StrpAxis=''):
+    if StrpAxis == '':
+        if Axis == 'X':
+            StrpAxis = 'Y'
+        elif Axis == 'Y':
+            StrpAxis = 'Z'
+        elif Axis == 'Z':
+            StrpAxis = 'X'
+
+    if StrpAxis == Axis:
+        raise Exception('The Strip Axis and the Antenna Axis cannot be the same !!')
+
+    # The offsets below are element-wise (see _offset), so Center may be given
+    # as a list, a tuple or an array.
+
+    Name1 = Name + '1'
+    Name2 = Name + '2'
+
+    if Axis == 'X':
+        Start1c = _offset(Center, [gapLen / 2, 0, 0])
+        Start2c = _offset(Center, [gapLen / 2, 0, 0], -1)
+        Start1b = _offset(Center, [gapLen / 2, -Size / 2, -Size / 2])
+        Start2b = _offset(Center, [gapLen / 2, +Size / 2, +Size / 2], -1)
+        bSize1 = [+(Length - gapLen) / 2, Size, Size]
+        bSize2 = [-(Length - gapLen) / 2, Size, Size]
+    elif Axis == 'Y':
+        Start1c = _offset(Center, [0, gapLen / 2, 0])
+        Start2c = _offset(Center, [0, gapLen / 2, 0], -1)
+        Start1b = _offset(Center, [-Size / 2, gapLen / 2, -Size / 2])
+        Start2b = _offset(Center, [+Size / 2, gapLen / 2, +Size / 2], -1)
+        bSize1 = [Size, +(Length - gapLen) / 2, Size]
+        bSize2 = [Size, -(Length - gapLen) / 2, Size]
+    elif Axis == 'Z':
+        Start1c = _offset(Center, [0, 0, gapLen / 2])
+        Start2c = _offset(Center, [0, 0, gapLen / 2], -1)
+        Start1b = _offset(Center, [-Size / 2, -Size / 2, -gapLen / 2])
+        Start2b = _offset(Center, [+Size / 2, +Size / 2, -gapLen / 2], -1)
+        bSize1 = [Size, Size, +(Length - gapLen) / 2]
+        bSize2 = [Size, Size, -(Length - gapLen) / 2]
+
+    if Type == 'c':
+
+        hfssCylinder(fid, Name1, Axis, Start1c, Size / 2,
+                     (Length - gapLen) / 2, Units)
+        hfssCylinder(fid, Name2, Axis, Start2c, Size / 2,
+                     -(Length - gapLen) / 2, Units)
+
+    elif Type == 'r':
+        hfssBox(fid, Name1, Start1b, bSize1, Units)
+        hfssBox(fid, Name2, Start2b, bSize2, Units)
+
+    elif Type == 's':
+        if Axis == 'X':
+            if StrpAxis == 'Y':
+                sStart1 = _offset(Center, [gapLen / 2, 0, -Size / 2])
+                sStart2 = _offset(Center, [gapLen / 2, 0, +Size / 2], -1)
+                Width1 = Size
+                Width2 = Size
+                Height1 = Length - gapLen / 2
+                Height2 = -Height1
+            elif StrpAxis == 'Z':
+                sStart1 = _offset(Center, [gapLen / 2, -Size / 2, 0])
+                sStart2 = _offset(Center, [gapLen / 2, +Size / 2, 0], -1)
+                Width1 = Length - gapLen / 2
+                Width2 = - Width1
+                Height1 = Size
+                Height2 = Size
+        elif Axis == 'Y':
+            if StrpAxis == 'Z':
+                sStart1 = _offset(Center, [-Size / 2, gapLen / 2, 0])
+                sStart2 = _offset(Center, [+Size / 2, gapLen / 2, 0], -1)
+                Width1 = Size
+                Width2 = Size
+                Height1 = Length - gapLen / 2
+                Height2 = -Height1
+            elif StrpAxis == 'X':
+                sStart1 = _offset(Center, [0, gapLen / 2, -Size / 2])
+                sStart2 = _offset(Center, [0, gapLen / 2, +Size / 2], -1)
+                Width1 = Length - gapLen / 2
+                Width2 = -Width1
+                Height1 = Size
+                Height2 = Size
+        elif Axis == 'Z':
+            if StrpAxis == 'Y':
+                sStart1 = _offset(Center, [-Size / 2, 0, gapLen / 2])
+                sStart2 = _offset(Center, [+Size / 2, 0, gapLen / 2], -1)
+                Width1 = Length - gapLen / 2
+                Width2 = - Width1
+                Height1 = Size
+                Height2 = Size
+            elif StrpAxis == 'X':
+                sStart1 = _offset(Center, [0, -Size / 2, gapLen / 2])
+                sStart2 = _offset(Center, [0, +Size / 2, gapLen / 2], -1)
+                Width1 = Size
+                Width2 = Size
+                Height1 = Length - gapLen / 2
+                Height2 = - Height1
+
+        hfssRectangle(fid, Name1, StrpAxis, sStart1, Width1, Height1, Units)
+        hfssRectangle(fid, Name2, StrpAxis, sStart2, Width2, Height2, Units)
+
+
+# Element-wise Center + Sign * Offset, as a list of floats.
+def _offset(Center, Offset, Sign=1):
+    return [float(c) + Sign * o for c, o in zip(Center, Offset)]
+
+
+_CYLINDER = (
+    # Cylinder Parameters.
+    '\n'
+    'oEditor.CreateCylinder _\n'
+    'Array("NAME:CylinderParameters", _\n'
+    '"XCenter:=", "{0}", _\n'
+    '"YCenter:=", "{1}", _\n'
+    '"ZCenter:=", "{2}", _\n'
+    '"Radius:=", "{3}", _\n'
+    '"Height:=", "{4}", _\n'
+    '"WhichAxis:=", "{5}"), _\n'
+    # Cylinder Properties.
+    'Array("NAME:Attributes", _\n'
+    '"Name:=", "{6}", _\n'
+    '"Flags:=", "", _\n'
+    '"Color:=", "(132 132 193)", _\n'
+    '"Transparency:=", 0, _\n'
+    '"PartCoordinateSystem:=", "Global", _\n'
+    '"MaterialName:=", "vacuum", _\n'
+    '"SolveInside:=", true)\n'
+    '\n')
+
+
+# ----------------------------------------------------------------------------
+# function hfssCylinder(fid, Name, Axis, Center, Radius, Height, Units)
+#
+# Description :
+# -------------
+# Creates the VB script necessary to model a cylinder in HFSS.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Name    - name of the cylinder (in HFSS).
+# Center  - center of the cylinder (specify as [x, y, z]). This is also the
+#           starting point of the cylinder.
+# Axis    - axis of the cylinder (specify as 'X', 'Y', or 'Z').
+# Radius  - radius of the cylinder (scalar).
+# Height  - height of the cylidner (from the point specified by Center).
+# Units   - specify as 'in', 'mm', 'meter' or anything else defined in HFSS.
+#
+# Note :
+# ------
+# Any dimension may also be given as a string holding an HFSS expression
+# of design variables (see hfssDefineVariable), e.g. 'len/2' or '3mm+gap'.
+# Such strings are written to the script as is, without Units.
+#
+# Example :
+# ---------
+# fid = fopen('myantenna.vbs', 'wt');
+# ...
+# hfssCylinder(fid, 'Cyl1', 'Z', [0, 0, 0], 0.1, 10, 'in');
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# This file is part of HFSS-MATLAB-API.
+#
+# HFSS-MATLAB-API is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation; either version 2 of the License, or (at your option)
+# any later version.
+#
+# HFSS-MATLAB-API is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Foobar; if not, write to the Free Software Foundation, Inc., 59 Temple
+# Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Copyright 2004, Vijay Ramasami (rvc@ku.edu)
+# ----------------------------------------------------------------------------
+@profiled
+def hfssCylinder(fid, Name, Axis, Center, Radius, Height, Units):
+    emit(fid, 'cylinder',
+         dict(Name=Name, Axis=Axis, Center=Center, Radius=Radius, Height=Height, Units=Units),
+         _CYLINDER.format(_dim(Center[0], Units), _dim(Center[1], Units),
+                          _dim(Center[2], Units), _dim(Radius, Units),
+                          _dim(Height, Units), Axis.upper(), Name))
+
+
+# ----------------------------------------------------------------------------
+# function hfssCylinderArray(fid, Names, Axis, Centers, Radii, Heights, Units)
+#
+# Description :
+# -------------
+# Batched version of hfssCylinder(): creates N cylinders in a single
+# formatting pass. The VB script of each element is byte-identical to the
+# one produced by hfssCylinder() for the same (row of) arguments.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Names   - list of N cylinder names, or a single string prefix in which case
+#           the cylinders are named Names1, Names2, ..., NamesN.
+# Axis    - axis of the cylinders ('X', 'Y' or 'Z'), or an (N,) array of axes.
+# Centers - (N,3) array of cylinder centers (starting points).
+# Radii   - (N,) array of radii, or a scalar shared by all cylinders.
+# Heights - (N,) array of heights, or a scalar shared by all cylinders.
+# Units   - specify as 'in', 'mm', 'meter' or anything else defined in HFSS.
+#
+# Example :
+# ---------
+# # a 64x64 lattice of vias.
+# ix, iy = np.meshgrid(np.arange(64), np.arange(64))
+# Centers = np.column_stack([ix.ravel(), iy.ravel(), np.zeros(4096)]) * 0.5
+# hfssCylinderArray(fid, 'Via', 'Z', Centers, 0.1, 1.6, 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssCylinderArray(fid, Names, Axis, Centers, Radii, Heights, Units):
+    import numpy as np
+    Centers = _asArray(Centers)
+    N = len(Centers)
+    Axes = np.broadcast_to(np.char.upper(np.asarray(Axis, dtype=str)), (N,))
+    Names = _arrayNames(Names, N)
+
+    emit(fid, 'cylinderarray',
+         dict(Names=Names, Axis=Axes, Centers=Centers, Radii=Radii, Heights=Heights,
+              Units=Units),
+         ''.join(map(_CYLINDER.format,
+                     _dims(Centers[:, 0], Units, N),
+                     _dims(Centers[:, 1], Units, N),
+                     _dims(Centers[:, 2], Units, N),
+                     _dims(Radii, Units, N),
+                     _dims(Heights, Units, N),
+                     Axes, Names)))
+
+
+_BOX = (
+    # Preamble.
+    '\n'
+    'oEditor.CreateBox _\n'
+    # Box Parameters.
+    'Array("NAME:BoxParameters", _\n'
+    '"XPosition:=", "{0}", _\n'
+    '"YPosition:=", "{1}", _\n'
+    '"ZPosition:=", "{2}", _\n'
+    '"XSize:=", "{3}", _\n'
+    '"YSize:=", "{4}", _\n'
+    '"ZSize:=", "{5}"), _\n'
+    # Box Attributes.
+    'Array("NAME:Attributes", _\n'
+    '"Name:=", "{6}", _\n'
+    '"Flags:=", "", _\n'
+    '"Color:=", "(132 132 193)", _\n'
+    '"Transparency:=", 0.75, _\n'
+    '"PartCoordinateSystem:=", "Global", _\n'
+    '"MaterialName:=", "vacuum", _\n'
+    '"SolveInside:=", true)\n')
+
+
+# ----------------------------------------------------------------------------
+# function hfssBox(fid, Name, Start, Size, Units, [Center1], [Radius1], ...
+#                  [Axis1], [Center2], [Radius2], [Axis2], ...)
+#
+# Description :
+# -------------
+# Create the VB Script necessary to create a Box (or Cuboid) in HFSS. This
+# function also provides for optional holes (specified by their Center,
+# Radii and Axes) in the box. This feature is useful to allow things like
+# vias, cables etc., to penetrate the box without intersection violations.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Name    - name of the box (appears in HFSS).
+# Start   - starting location of the box (specify as [x, y, z]).
+# Size    - size of the box (specify as [sx, sy, sz]).
+# Units   - units of the box (specify using either 'in', 'mm', 'meter' or
+#           anything else defined in HFSS).
+# Center  - (Optional) center of the hole to be punched through the box.
+#           It can lie anywhere within or on the surface of the box.
+# Radius  - (Optional) radius of the hole to be punched through the box.
+# Axis    - (Optional) axis of the hole to be punched through the box.
+#
+# Note :
+# ------
+# A hole that lies outside the box would have no effect, so it is not
+# written to the script at all. hfssBox returns the number of such holes
+# (the running total is kept in holeStats['pruned']).
+#
+# Any dimension may also be given as a string holding an HFSS expression
+# of design variables (see hfssDefineVariable), e.g. 'len/2' or '3mm+gap'.
+# Such strings are written to the script as is, without Units. Holes
+# are only pruned when all the dimensions involved are numbers.
+#
+# Example :
+# ---------
+# fid = fopen('myantenna.vbs', 'wt');
+# ...
+# # a Box with 2 holes punched thro' it.
+# hfssBox(fid, 'FR4_Base', [-bpHeight/2, -baseLength/2, 0], [bpHeight, ...
+#         baseLength, -baseThick], 'in', [cX1, cY1, cZ1], R1, 'Z',...
+#         [cX2, cY2, cZ2], R2, 'X');
+#
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# This file is part of HFSS-MATLAB-API.
+#
+# HFSS-MATLAB-API is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation; either version 2 of the License, or (at your option)
+# any later version.
+#
+# HFSS-MATLAB-API is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Foobar; if not, write to the Free Software Foundation, Inc., 59 Temple
+# Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Copyright 2004, Vijay Ramasami (rvc@ku.edu)
+# ----------------------------------------------------------------------------
+@profiled
+def hfssBox(fid, Name, Start, Size, Units, *varargin):
+    emit(fid, 'box', dict(Name=Name, Start=Start, Size=Size, Units=Units),
+         _BOX.format(_dim(Start[0], Units), _dim(Start[1], Units), _dim(Start[2], Units),
+                     _dim(Size[0], Units), _dim(Size[1], Units), _dim(Size[2], Units),
+                     Name))
+
+    # For each Hole Request that can reach the box create cylinder that
+    # satisfies the request, then subtract all of them from the Box in as
+    # few Subtracts as the chunk size allows.
+    Holes, nPruned = _boxHoles(Start, Size, varargin)
+    for iH, Center, Radius, Axis, Length in Holes:
+        hfssCylinder(fid, Name + '_subhole' + str(iH), Axis, Center, Radius, Length, Units)
+    if Holes:
+        hfssSubtract(fid, Name, [Name + '_subhole' + str(Hole[0]) for Hole in Holes])
+
+    return nPruned
+
+
+# Number of holes emitted and pruned (because they miss their box) by hfssBox
+# since the module was loaded.
+holeStats = {'emitted': 0, 'pruned': 0}
+
+
+# Expands the (Center, Radius, Axis) hole requests of hfssBox into the list of
+# (iH, Center, Radius, Axis, Length) cylinders that run through the box, and
+# the number of requests dropped because their cylinder cannot intersect the
+# box.
+def _boxHoles(Start, Size, varargin):
+    Holes = list(_iterBoxHoles(Start, Size, varargin))
+    return Holes, len(varargin) // 3 - len(Holes)
+
+
+# Generator form of _boxHoles: yields the cylinders that run through the box,
+# testing blockSize holes at a time. A hole along Axis hits the box only if
+# its circle, in the plane normal to Axis, overlaps the box cross-section;
+# this is tested for all the holes of a block at once.
+def _iterBoxHoles(Start, Size, varargin, blockSize=4096):
+    nHoles = len(varargin) // 3
+    if nHoles == 0:
+        return
+
+    import numpy as np
+
+    for first in range(0, nHoles, blockSize):
+        last = min(first + blockSize, nHoles)
+        nBlock = last - first
+        Axes = [Axis.upper() for Axis in varargin[3 * first + 2:3 * last:3]]
+        iAxes = np.array(['XYZ'.index(Axis) for Axis in Axes])
+
+        try:
+            Centers = np.array(varargin[3 * first:3 * last:3], dtype=float).reshape(nBlock, 3)
+            Radii = np.array(varargin[3 * first + 1:3 * last:3], dtype=float)
+            Corner = np.asarray(Start, dtype=float)
+            Far = Corner + np.asarray(Size, dtype=float)
+        except ValueError:
+            # Expressions of design variables: every hole is kept.
+            Hit = np.ones(nBlock, dtype=bool)
+        else:
+            Lo = np.minimum(Corner, Far)
+            Hi = np.maximum(Corner, Far)
+
+            # Distance from each hole axis to the box, measured normal to the axis.
+            Gap = np.maximum(np.maximum(Lo - Centers, Centers - Hi), 0)
+            Gap[np.arange(nBlock), iAxes] = 0
+            Hit = np.einsum('ij,ij->i', Gap, Gap) < Radii ** 2
+
+        nHit = int(np.count_nonzero(Hit))
+        holeStats['emitted'] += nHit
+        holeStats['pruned'] += nBlock - nHit
+        for iB in np.flatnonzero(Hit):
+            iH = first + iB
+            Center = list(varargin[3 * iH])
+            Center[iAxes[iB]] = Start[iAxes[iB]]
+            yield (iH + 1, Center, varargin[3 * iH + 1], Axes[iB], Size[iAxes[iB]])
+
+
+# ----------------------------------------------------------------------------
+# function hfssBoxArray(fid, Names, Starts, Sizes, Units)
+#
+# Description :
+# -------------
+# Batched version of hfssBox() (without holes): creates N boxes in a single
+# formatting pass. The VB script of each element is byte-identical to the
+# one produced by hfssBox() for the same (row of) arguments.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Names   - list of N box names, or a single string prefix in which case the
+#           boxes are named Names1, Names2, ..., NamesN.
+# Starts  - (N,3) array of box starting locations.
+# Sizes   - (N,3) array of box sizes, or a single [sx, sy, sz] shared by all
+#           boxes.
+# Units   - units of the boxes (specify using either 'in', 'mm', 'meter' or
+#           anything else defined in HFSS).
+#
+# Example :
+# ---------
+# # 4096 patches on a 64x64 grid.
+# hfssBoxArray(fid, 'Patch', Starts, [10, 12, 0.035], 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssBoxArray(fid, Names, Starts, Sizes, Units):
+    import numpy as np
+    Starts = _asArray(Starts)
+    N = len(Starts)
+    Names = _arrayNames(Names, N)
+    sizes = _broadcastRows(Sizes, N)
+
+    emit(fid, 'boxarray', dict(Names=Names, Starts=Starts, Sizes=Sizes, Units=Units),
+         ''.join(map(_BOX.format,
+                     _dims(Starts[:, 0], Units, N),
+                     _dims(Starts[:, 1], Units, N),
+                     _dims(Starts[:, 2], Units, N),
+                     _dims(sizes[:, 0], Units, N),
+                     _dims(sizes[:, 1], Units, N),
+                     _dims(sizes[:, 2], Units, N),
+                     Names)))
+
+
+# Formats a dimension: numbers get the units appended, while strings are
+# taken as HFSS expressions (e.g. 'Length/2' or '3mm+gap') and kept as is.
+def _dim(Value, Units):
+    if isinstance(Value, str):
+        return Value
+    return '{0}{1}'.format(Value, Units)
+
+
+# Vectorized _dim for a column of N numbers (or a single shared number).
+# Columns kept as Python objects (see _asArray) are formatted one by one,
+# and arrays of strings are HFSS expressions, written without Units.
+def _dims(Values, Units, N):
+    import numpy as np
+    Values = _asArray(Values)
+    if Values.dtype.kind in 'US':
+        return np.broadcast_to(Values.astype(str), (N,))
+    if Values.dtype != object:
+        return np.broadcast_to(np.char.add(Values.astype(str), Units), (N,))
+    if Values.ndim == 0:
+        return [_dim(Values.item(), Units)] * N
+    return [_dim(Value, Units) for Value in Values]
+
+
+# Values (rows, a column or a scalar) as an array. Lists mixing integers and
+# floats, or numbers and expressions, are kept as Python objects: NumPy
+# would write '0.0mm' where hfssCylinder & co. write '0mm', and would turn
+# the numbers into strings, which are not given Units.
+def _asArray(Values):
+    import numpy as np
+    if isinstance(Values, np.ndarray):
+        return Values
+    array = np.asarray(Values)
+    if array.dtype.kind in 'US' and array.ndim > 0:
+        return np.array(Values, dtype=object)
+    if array.dtype.kind == 'f' and array.ndim > 0:
+        objects = np.array(Values, dtype=object)
+        if any(isinstance(Value, (int, np.integer)) for Value in objects.flat):
+            return objects
+    return array
+
+
+# A single [x, y, z] shared by N elements, or an (N,3) array, as (N,3).
+def _broadcastRows(Rows, N):
+    import numpy as np
+    return np.broadcast_to(_asArray(Rows), (N, 3))
+
+
+# Expands a name prefix into N numbered names (Prefix1 ... PrefixN).
+def _arrayNames(Names, N):
+    if isinstance(Names, str):
+        return [Names + str(i) for i in range(1, N + 1)]
+    if len(Names) != N:
+        raise Exception('The number of names does not match the number of elements !!')
+    return Names
+
+
+# ----------------------------------------------------------------------------
+# function hfssRectangle(fid, Name, Axis, Start, Width, Height, Units)
+#
+# Description :
+# -------------
+# Create the VB Script necessary to construct a rectangle using the HFSS
+# 3D Modeler.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Name    - name of the rectangle object (appears in the HFSS objects tree).
+# Axis    - axis that is normal to the rectangle object.
+# Start   - starting location of the rectangle (one of its corners). Specify
+#           as [sx, sy, sz].
+# Width   - (scalar) the width of the rectangle. If the axis is 'X' then this
+#           represents the Y-axis size of the rectangle, and so on.
+# Height  - (scalar) the height of the rectangle. If the axis is 'X', then
+#           this represents the Z-axis size of the rectangle, and so on.
+# Units   - specify as 'in', 'meter', 'mm', ... or anything else defined in
+#           HFSS.
+#
+# Note :
+# ------
+# Todo: a feature to add automatic holes in the rectangle object.
+#
+# Any dimension may also be given as a string holding an HFSS expression
+# of design variables (see hfssDefineVariable), e.g. 'len/2' or '3mm+gap'.
+# Such strings are written to the script as is, without Units.
+#
+# Example :
+# ---------
+# fid = fopen('myantenna.vbs', 'wt');
+# ...
+# # in this example, Y-axis size is 10in and Z-axis size is 20in.
+# hfssRectangle(fid, 'Rect1', 'X', [0,0,0], 10, 20, 'in');
+#
+# ----------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------
+# This file is part of HFSS-MATLAB-API.
+#
+# HFSS-MATLAB-API is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the Free
+# Software Foundation; either version 2 of the License, or (at your option)
+# any later version.
+#
+# HFSS-MATLAB-API is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY
+# or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# Foobar; if not, write to the Free Software Foundation, Inc., 59 Temple
+# Place, Suite 330, Boston, MA  02111-1307  USA
+#
+# Copyright 2004, Vijay Ramasami (rvc@ku.edu)
+# ----------------------------------------------------------------------------
+_RECTANGLE = (
+    # Preamble.
+    '\n'
+    'oEditor.CreateRectangle _\n'
+    # Rectangle Parameters.
+    'Array("NAME:RectangleParameters", _\n'
+    '"IsCovered:=", true, _\n'
+    '"XStart:=", "{0}", _\n'
+    '"YStart:=", "{1}", _\n'
+    '"ZStart:=", "{2}", _\n'
+    '"Width:=", "{3}", _\n'
+    '"Height:=", "{4}", _\n'
+    '"WhichAxis:=", "{5}"), _\n'
+    # Rectangle Attributes.
+    'Array("NAME:Attributes", _\n'
+    '"Name:=", "{6}", _\n'
+    '"Flags:=", "", _\n'
+    '"Color:=", "(132 132 193)", _\n'
+    '"Transparency:=", {7}, _\n'
+    '"PartCoordinateSystem:=", "Global", _\n'
+    '"MaterialName:=", "vacuum", _\n'
+    '"SolveInside:=", true)\n')
+
+
+# Width and Height follow the right-hand rule. If the Axis is Z, then Width
+# represents X-direction size and Height represents the Y-direction size
+# and so on ...
+@profiled
+def hfssRectangle(fid, Name, Axis, Start, Width, Height, Units):
+    Transparency = 0.75
+
+    emit(fid, 'rectangle',
+         dict(Name=Name, Axis=Axis, Start=Start, Width=Width, Height=Height, Units=Units),
+         _RECTANGLE.format(_dim(Start[0], Units), _dim(Start[1], Units),
+                           _dim(Start[2], Units), _dim(Width, Units),
+                           _dim(Height, Units), Axis.upper(), Name, Transparency))
+
+
+# ----------------------------------------------------------------------------
+# function hfssRectangleArray(fid, Names, Axis, Starts, Widths, Heights, Units)
+#
+# Description :
+# -------------
+# Batched version of hfssRectangle(): creates N rectangles in a single
+# formatting pass. The VB script of each element is byte-identical to the
+# one produced by hfssRectangle() for the same (row of) arguments.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Names   - list of N rectangle names, or a single string prefix in which
+#           case the rectangles are named Names1, Names2, ..., NamesN.
+# Axis    - axis normal to the rectangles ('X', 'Y' or 'Z'), or an (N,)
+#           array of axes.
+# Starts  - (N,3) array of rectangle starting corners.
+# Widths  - (N,) array of widths, or a scalar shared by all rectangles.
+# Heights - (N,) array of heights, or a scalar shared by all rectangles.
+# Units   - specify as 'in', 'mm', 'meter' or anything else defined in HFSS.
+# ----------------------------------------------------------------------------
+@profiled
+def hfssRectangleArray(fid, Names, Axis, Starts, Widths, Heights, Units):
+    import numpy as np
+    Starts = _asArray(Starts)
+    N = len(Starts)
+    Axes = np.broadcast_to(np.char.upper(np.asarray(Axis, dtype=str)), (N,))
+    Names = _arrayNames(Names, N)
+
+    emit(fid, 'rectanglearray',
+         dict(Names=Names, Axis=Axes, Starts=Starts, Widths=Widths, Heights=Heights,
+              Units=Units),
+         ''.join(map(_RECTANGLE.format,
+                     _dims(Starts[:, 0], Units, N),
+                     _dims(Starts[:, 1], Units, N),
+                     _dims(Starts[:, 2], Units, N),
+                     _dims(Widths, Units, N),
+                     _dims(Heights, Units, N),
+                     Axes, Names, [0.75] * N)))
+
+
+# ----------------------------------------------------------------------------
+# function hfssDelete(fid, Parts)
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to delete a set of parts from the model.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Parts   - a list of the names of the parts to be deleted (or a single name).
+#
+# Example :
+# ---------
+# hfssDelete(fid, ['Dip1', 'Dip2']);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssDelete(fid, Parts):
+    if isinstance(Parts, str):
+        Parts = [Parts]
+
+    emit(fid, 'delete', dict(Parts=Parts),
+         '\n'
+         'oEditor.Delete _\n'
+         'Array("NAME:Selections", _\n'
+         '"Selections:=", "{0}")\n'
+         .format(','.join(Parts)))
+
+
+# ----------------------------------------------------------------------------
+# function hfssSplit(fid, Parts, Axis, [Side])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to split a set of parts by one of the
+# global coordinate planes through the origin (the plane normal to Axis)
+# and keep one side of them.
+#
+# Parameters :
+# ------------
+# fid     - file identifier of the HFSS script file.
+# Parts   - a list of the names of the parts to be split (or a single name).
+# Axis    - axis normal to the splitting plane ('X' splits by the YZ plane,
+#           and so on).
+# Side    - (Optional) side kept: 'positive' (default), 'negative' or
+#           'both'.
+#
+# Example :
+# ---------
+# # keep the half of the dipole with x >= 0.
+# hfssSplit(fid, ['Dip1', 'Dip2'], 'X');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssSplit(fid, Parts, Axis, Side='positive'):
+    if isinstance(Parts, str):
+        Parts = [Parts]
+    Plane = {'X': 'YZ', 'Y': 'ZX', 'Z': 'XY'}[Axis.upper()]
+    WhichSide = {'positive': 'PositiveOnly', 'negative': 'NegativeOnly', 'both': 'Both'}[Side]
+
+    emit(fid, 'split', dict(Parts=Parts, Axis=Axis.upper(), Side=Side),
+         '\n'
+         'oEditor.Split _\n'
+         'Array("NAME:Selections", _\n'
+         '"Selections:=", "{0}", _\n'
+         '"NewPartsModelFlag:=", "Model"), _\n'
+         'Array("NAME:SplitToParameters", _\n'
+         '"SplitPlane:=", "{1}", _\n'
+         '"WhichSide:=", "{2}", _\n'
+         '"ToolType:=", "PlaneTool", _\n'
+         '"ToolEntityID:=", -1, _\n'
+         '"SplitCrossingObjectsOnly:=", false, _\n'
+         '"DeleteInvalidObjects:=", true)\n'
+         .format(','.join(Parts), Plane, WhichSide))
+
+
+# ----------------------------------------------------------------------------
+# function hfssDuplicateAlongLine(fid, Parts, Vector, NumClones, Units, [Taken])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to duplicate a set of parts along a line.
+# HFSS names the clones of a part P as P_1, P_2, ..., skipping the names
+# already taken.
+#
+# Parameters :
+# ------------
+# fid       - file identifier of the HFSS script file.
+# Parts     - a list of the names of the parts to be duplicated (or a single
+#             name).
+# Vector    - the translation between consecutive clones ([dx, dy, dz]).
+# NumClones - total number of copies, including the original parts.
+# Units     - specify as 'in', 'mm', 'meter' or anything else defined in HFSS.
+# Taken     - (Optional) names already used in the design, which HFSS skips
+#             when it names the clones.
+#
+# Returns :
+# ---------
+# The names of the clones.
+#
+# Example :
+# ---------
+# # 8 cylinders spaced 5mm apart along X.
+# hfssDuplicateAlongLine(fid, 'Cyl1', [5, 0, 0], 8, 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssDuplicateAlongLine(fid, Parts, Vector, NumClones, Units, Taken=()):
+    if isinstance(Parts, str):
+        Parts = [Parts]
+    Clones = _cloneNames(Parts, NumClones, Taken)
+
+    emit(fid, 'duplicate',
+         dict(Parts=Parts, Clones=Clones, Vector=Vector,
+              NumClones=NumClones, Units=Units),
+         '\n'
+         'oEditor.DuplicateAlongLine _\n'
+         'Array("NAME:Selections", _\n'
+         '"Selections:=", "{0}", _\n'
+         '"NewPartsModelFlag:=", "Model"), _\n'
+         'Array("NAME:DuplicateToAlongLineParameters", _\n'
+         '"CreateNewObjects:=", true, _\n'
+         '"XComponent:=", "{1}", _\n'
+         '"YComponent:=", "{2}", _\n'
+         '"ZComponent:=", "{3}", _\n'
+         '"NumClones:=", "{4}"), _\n'
+         'Array("NAME:Options", _\n'
+         '"DuplicateAssignments:=", false)\n'
+         .format(','.join(Parts), _dim(Vector[0], Units), _dim(Vector[1], Units),
+                 _dim(Vector[2], Units), NumClones))
+    return Clones
+
+
+# ----------------------------------------------------------------------------
+# function hfssDuplicateAroundAxis(fid, Parts, Axis, Angle, NumClones, [Taken])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to duplicate a set of parts around one of
+# the global axes. HFSS names the clones of a part P as P_1, P_2, ...,
+# skipping the names already taken.
+#
+# Parameters :
+# ------------
+# fid       - file identifier of the HFSS script file.
+# Parts     - a list of the names of the parts to be duplicated (or a single
+#             name).
+# Axis      - the rotation axis ('X', 'Y' or 'Z').
+# Angle     - angle between consecutive clones, in degrees.
+# NumClones - total number of copies, including the original parts.
+# Taken     - (Optional) names already used in the design, which HFSS skips
+#             when it names the clones.
+#
+# Returns :
+# ---------
+# The names of the clones.
+#
+# Example :
+# ---------
+# # a ring of 12 dipoles.
+# hfssDipole(fid, 'Dip', 'Z', [20, 0, 0], 10, 0.5, 0.2, 'mm');
+# hfssDuplicateAroundAxis(fid, ['Dip1', 'Dip2'], 'Z', 30, 12);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssDuplicateAroundAxis(fid, Parts, Axis, Angle, NumClones, Taken=()):
+    if isinstance(Parts, str):
+        Parts = [Parts]
+    Clones = _cloneNames(Parts, NumClones, Taken)
+
+    emit(fid, 'duplicate',
+         dict(Parts=Parts, Clones=Clones, Axis=Axis, Angle=Angle,
+              NumClones=NumClones),
+         '\n'
+         'oEditor.DuplicateAroundAxis _\n'
+         'Array("NAME:Selections", _\n'
+         '"Selections:=", "{0}", _\n'
+         '"NewPartsModelFlag:=", "Model"), _\n'
+         'Array("NAME:DuplicateAroundAxisParameters", _\n'
+         '"CreateNewObjects:=", true, _\n'
+         '"WhichAxis:=", "{1}", _\n'
+         '"AngleStr:=", "{2}", _\n'
+         '"NumClones:=", "{3}"), _\n'
+         'Array("NAME:Options", _\n'
+         '"DuplicateAssignments:=", false)\n'
+         .format(','.join(Parts), Axis.upper(), _dim(Angle, 'deg'), NumClones))
+    return Clones
+
+
+# ----------------------------------------------------------------------------
+# function hfssArray(fid, primitiveFn, Name, Positions, Units, [Tol])
+#
+# Description :
+# -------------
+# Creates an array of identical elements (dipoles, cylinders, boxes, ...)
+# placed at the given positions. Evenly spaced runs of elements along X are
+# created as a single seed element plus a DuplicateAlongLine; evenly spaced
+# stacks of identical runs (or of single elements) along Y are further
+# collapsed into a second DuplicateAlongLine. Only elements that do not fit
+# a regular run are created explicitly.
+#
+# Parameters :
+# ------------
+# fid         - file identifier of the HFSS script file.
+# primitiveFn - function called as primitiveFn(fid, Name, Position) that
+#               creates one element at Position ([x, y, z]).
+# Name        - base name of the elements. Seeds and explicit elements are
+#               named Name_1, Name_2, ...; clones get the HFSS default names.
+# Positions   - (N,3) array of element positions.
+# Units       - units of Positions (used for the duplication vectors).
+# [Tol]       - (optional) tolerance used to compare coordinates
+#               (default 1e-9).
+#
+# Note :
+# ------
+# HFSS names the clones of a part P as P_1, P_2, ..., skipping the names
+# already taken: stacking a row [P, P_1, P_2] along Y gives P_3, P_4, ...,
+# P_1_1, ... (see hfssDuplicateAlongLine). The names of the elements are
+# assumed not to collide with the other parts of the design.
+#
+# Example :
+# ---------
+# ix, iy = np.meshgrid(np.arange(64), np.arange(64))
+# Positions = np.column_stack([ix.ravel(), iy.ravel(), np.zeros(4096)]) * 15
+# hfssArray(fid, lambda fid, Name, Position: hfssDipole(fid, Name, 'Z',
+#           Position, 10, 0.5, 0.2, 'mm'), 'Dip', Positions, 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssArray(fid, primitiveFn, Name, Positions, Units, Tol=1e-9):
+    import numpy as np
+    Positions = np.asarray(Positions, dtype=float).reshape(-1, 3)
+    Keys = np.round(Positions / Tol).astype(np.int64)
+
+    # Split the elements into rows along X, one per (z, y) pair.
+    order = np.lexsort((Keys[:, 0], Keys[:, 1], Keys[:, 2]))
+    breaks = np.flatnonzero(np.any(np.diff(Keys[order, 1:], axis=0) != 0, axis=1)) + 1
+
+    # Regular runs are grouped by (z, x0, dx, nx) so identical runs can be
+    # stacked along Y (single elements being runs with nx = 1).
+    stacks = {}
+    for row in np.split(order, breaks):
+        for run in _regularRuns(Positions[row, 0], Tol):
+            seg = row[run]
+            step = Keys[seg[1], 0] - Keys[seg[0], 0] if len(seg) > 1 else 0
+            stacks.setdefault((Keys[seg[0], 2], Keys[seg[0], 0], step, len(seg)), []).append(seg)
+
+    # Names of the seeds and clones made so far, which HFSS skips when it
+    # names the clones of the next duplications.
+    Taken = set()
+    iElement = 0
+    irregular = []
+    for rows in stacks.values():
+        ys = np.array([Positions[row[0], 1] for row in rows])
+        for run in _regularRuns(ys, Tol):
+            first = rows[run[0]]
+            nx = len(first)
+            if nx == 1 and len(run) == 1:
+                irregular.extend(first)
+                continue
+
+            iElement += 1
+            Seed = _captureParts(fid, primitiveFn, Name + '_' + str(iElement),
+                                 Positions[first[0]])
+            Taken.update(Seed)
+            Row = Seed
+            if nx > 1:
+                Row = Seed + hfssDuplicateAlongLine(
+                    fid, Seed, [Positions[first[1], 0] - Positions[first[0], 0], 0, 0], nx,
+                    Units, Taken)
+                Taken.update(Row)
+            if len(run) > 1:
+                Taken.update(hfssDuplicateAlongLine(fid, Row, [0, ys[run[1]] - ys[run[0]], 0],
+                                                    len(run), Units, Taken))
+
+    for iP in sorted(irregular):
+        iElement += 1
+        primitiveFn(fid, Name + '_' + str(iElement), Positions[iP])
+
+
+# Splits the (sorted) values ys into maximal runs of evenly spaced values and
+# returns them as lists of indices.
+def _regularRuns(ys, Tol):
+    runs = []
+    run = [0]
+    for i in range(1, len(ys)):
+        if len(run) == 1:
+            step = ys[i] - ys[run[0]]
+        if step > Tol and abs((ys[i] - ys[run[-1]]) - step) <= Tol:
+            run.append(i)
+        else:
+            runs.append(run)
+            run = [i]
+    runs.append(run)
+    return runs
+
+
+# Names HFSS gives to the clones of Parts: P_1, P_2, ... for each part P,
+# skipping the names in Taken (and those given to the previous clones).
+def _cloneNames(Parts, NumClones, Taken=()):
+    names = []
+    used = set(Taken)
+    for P in Parts:
+        k = 0
+        for _ in range(1, int(NumClones)):
+            k += 1
+            while P + '_' + str(k) in used:
+                k += 1
+            used.add(P + '_' + str(k))
+            names.append(P + '_' + str(k))
+    return names
+
+
+# Runs primitiveFn into a recorder, replays the recorded blocks into fid and
+# returns the names of the parts left in the model (i.e., not used up as tool
+# parts).
+def _captureParts(fid, primitiveFn, Name, Position):
+    recorder = _Recorder()
+    primitiveFn(recorder, Name, Position)
+
+    Parts = []
+    tools = set()
+    for kind, params, text in recorder.blocks:
+        if kind is None:
+            fid.write(text)
+            continue
+        emit(fid, kind, params, text)
+        if 'Name' in params:
+            Parts.append(params['Name'])
+        elif kind == 'subtract' and params['Clone'] != 'true':
+            tools.update(params['toolParts'])
+        elif kind in ('unite', 'intersect') and params['Clone'] != 'true':
+            tools.update(params['Parts'][1:])
+    return [P for P in Parts if P not in tools]
+
+
+# Minimal script sink that keeps every emitted block with its parameters.
+class _Recorder(object):
+    def __init__(self):
+        self.blocks = []
+
+    def write(self, text):
+        self.blocks.append((None, None, text))
+
+    def emit(self, kind, params, text):
+        self.blocks.append((kind, params, text))
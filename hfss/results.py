@@ -0,0 +1,500 @@
+# -*- coding: utf-8 -*-
+# @File    : results.py
+# @Software: PyCharm
+
+import csv
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .scriptwriter import emit, profiled
+
+
+# ----------------------------------------------------------------------------
+# function hfssExportNetworkData(fid, FileName, SolutionName, SweepName,
+#                                [Format], [designName])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to export the S-parameters of a solved
+# frequency sweep to a Touchstone file (see Touchstone to read it back).
+#
+# Parameters :
+# ------------
+# fid          - file identifier of the HFSS script file.
+# FileName     - path of the Touchstone file (e.g. 'C:/results/dip.s2p'),
+#                as seen from the machine running HFSS.
+# SolutionName - name of the solution setup (see hfssInsertSolution).
+# SweepName    - name of the frequency sweep (e.g. 'Sweep1').
+# Format       - (Optional) format of the complex numbers: 'RI' (real and
+#                imaginary parts, default), 'MA' (magnitude and angle) or
+#                'DB' (dB and angle).
+# designName   - (Optional) design to export, made the active design
+#                first (default: the active design).
+#
+# Example :
+# ---------
+# for designName in designs:
+#     hfssExportNetworkData(fid, 'C:/results/' + designName + '.s2p',
+#                           'Setup1', 'Sweep1', designName=designName);
+# ----------------------------------------------------------------------------
+@profiled
+def hfssExportNetworkData(fid, FileName, SolutionName, SweepName, Format='RI', designName=None):
+    emit(fid, 'networkdata',
+         dict(FileName=FileName, SolutionName=SolutionName, SweepName=SweepName, Format=Format,
+              designName=designName),
+         '\n'
+         '{0}'
+         'Set oModule = oDesign.GetModule("Solutions")\n'
+         'oModule.ExportNetworkData "", Array("{1}:{2}"), 3, "{3}", _\n'
+         'Array("All"), true, 50, "S", -1, {4}, 15\n'
+         .format(_activate(designName), SolutionName, SweepName, FileName.replace('\\', '/'),
+                 _COMPLEX_FORMATS[Format.upper()]))
+
+
+# Complex format of ExportNetworkData -> its code.
+_COMPLEX_FORMATS = {'MA': 0, 'RI': 1, 'DB': 2}
+
+
+# ----------------------------------------------------------------------------
+# function hfssExportReport(fid, ReportName, SolutionName, SweepName,
+#                           Expressions, FileName, [ReportType], [Primary],
+#                           [Sweeps], [Context], [designName])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to create a rectangular plot report of
+# some quantities and to export its data to a CSV file (see ReportCSV to
+# read it back).
+#
+# Parameters :
+# ------------
+# fid          - file identifier of the HFSS script file.
+# ReportName   - name of the report.
+# SolutionName - name of the solution setup.
+# SweepName    - name of the frequency sweep, or None for the last adaptive
+#                solution.
+# Expressions  - list of the quantities plotted (e.g. ['dB(S(1,1))']).
+# FileName     - path of the CSV file, as seen from the machine running
+#                HFSS.
+# ReportType   - (Optional) 'Modal Solution Data' (default), 'Terminal
+#                Solution Data', 'Far Fields', ...
+# Primary      - (Optional) primary sweep variable (X axis, default 'Freq').
+# Sweeps       - (Optional) other variables exported for all their values
+#                (e.g. ['Phi', 'Freq'] for a far-field cut along 'Theta').
+# Context      - (Optional) context of the report (e.g. the name of the
+#                infinite sphere of a far-field report).
+# designName   - (Optional) design to export, made the active design first.
+#
+# Example :
+# ---------
+# hfssExportReport(fid, 'Gain', 'Setup1', None, ['dB(GainTotal)'],
+#                  'C:/results/gain.csv', 'Far Fields', 'Theta', ['Phi', 'Freq'],
+#                  'Infinite Sphere1');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssExportReport(fid, ReportName, SolutionName, SweepName, Expressions, FileName,
+                     ReportType='Modal Solution Data', Primary='Freq', Sweeps=None, Context=None,
+                     designName=None):
+    if isinstance(Expressions, str):
+        Expressions = [Expressions]
+    Sweeps = list(Sweeps or [])
+    Families = ', '.join('"{0}:=", Array("All")'.format(Variable)
+                         for Variable in [Primary] + Sweeps)
+    Solution = '{0} : {1}'.format(SolutionName, SweepName or 'LastAdaptive')
+
+    emit(fid, 'report',
+         dict(ReportName=ReportName, SolutionName=SolutionName, SweepName=SweepName,
+              Expressions=Expressions, FileName=FileName, ReportType=ReportType,
+              Primary=Primary, Sweeps=Sweeps, Context=Context, designName=designName),
+         '\n'
+         '{0}'
+         'Set oModule = oDesign.GetModule("ReportSetup")\n'
+         'oModule.CreateReport "{1}", "{2}", "Rectangular Plot", "{3}", _\n'
+         'Array({4}), _\n'
+         'Array({5}), _\n'
+         'Array("X Component:=", "{6}", "Y Component:=", Array({7})), _\n'
+         'Array()\n'
+         'oModule.ExportToFile "{1}", "{8}"\n'
+         .format(_activate(designName), ReportName, ReportType, Solution,
+                 '"Domain:=", "Sweep"' if Context is None else '"Context:=", "{0}"'.format(Context),
+                 Families, Primary, ', '.join('"' + e + '"' for e in Expressions),
+                 FileName.replace('\\', '/')))
+
+
+def _activate(designName):
+    if designName is None:
+        return ''
+    return 'Set oDesign = oProject.SetActiveDesign("{0}")\n'.format(designName)
+
+
+# ----------------------------------------------------------------------------
+# class Touchstone(path, [nPorts])
+#
+# Description :
+# -------------
+# Reader of a Touchstone (version 1) file. The file is memory mapped and
+# only indexed when opened (one vectorized scan for the line ends); the
+# numbers are parsed by NumPy, a slice of frequency points at a time, when
+# they are asked for, so a slice of a multi-gigabyte file only reads the
+# pages holding it.
+#
+# Parameters :
+# ------------
+# path   - the .sNp file.
+# nPorts - (Optional) number of ports (default: taken from the extension).
+#
+# Attributes / methods :
+# ----------------------
+# len(ts)               - number of frequency points.
+# ts[i], ts[i:j]        - (frequencies, matrices) of the points i (to j):
+#                         frequencies in GHz, matrices as a complex
+#                         (n, nPorts, nPorts) array.
+# ts.between(f0, f1)    - same, for the points with f0 <= f <= f1 (GHz),
+#                         found by a binary search on the file.
+# ts.load()             - same, for the whole file.
+# ts.frequencies        - all the frequencies (GHz).
+# ts.parameter          - 'S', 'Y', 'Z', ... and ts.reference the
+#                         reference impedance.
+#
+# Example :
+# ---------
+# with Touchstone('dip.s2p') as ts:
+#     f, S = ts.between(2.3, 2.5)
+#     print(20 * np.log10(abs(S[:, 0, 0])).min())
+# ----------------------------------------------------------------------------
+class Touchstone(object):
+    def __init__(self, path, nPorts=None):
+        self.path = path
+        if nPorts is None:
+            match = re.search(r'\.s(\d+)p$', path, re.IGNORECASE)
+            if match is None:
+                raise Exception('Cannot tell the number of ports of {0} !!'.format(path))
+            nPorts = int(match.group(1))
+        self.nPorts = nPorts
+        self.width = 1 + 2 * nPorts * nPorts
+        self._text = _MappedText(path)
+        self._options(self._text.header(b'!#'))
+        # Lines per point: rows of at most 4 pairs, except for 1 and 2 ports.
+        linesPerPoint = 1 if nPorts <= 2 else nPorts * ((nPorts + 3) // 4)
+        self._starts = self._text.lineStarts[:-1][::linesPerPoint]
+        self._starts = np.append(self._starts, self._text.size)
+
+    # The option line: # <unit> <parameter> <format> R <reference>.
+    def _options(self, header):
+        self.unit, self.parameter, self.format, self.reference = 'GHZ', 'S', 'MA', 50.0
+        for line in header:
+            if not line.startswith(b'#'):
+                continue
+            tokens = line[1:].decode('ascii', 'replace').upper().split()
+            for i, token in enumerate(tokens):
+                if token in _FREQUENCY_UNITS:
+                    self.unit = token
+                elif token in ('S', 'Y', 'Z', 'H', 'G'):
+                    self.parameter = token
+                elif token in ('MA', 'DB', 'RI'):
+                    self.format = token
+                elif token == 'R' and i + 1 < len(tokens):
+                    self.reference = float(tokens[i + 1])
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            frequencies, matrices = self._read(start, max(start, stop))
+            return frequencies[::step], matrices[::step]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        frequencies, matrices = self._read(index, index + 1)
+        return frequencies[0], matrices[0]
+
+    def between(self, fStart, fStop):
+        return self._read(self._search(fStart, 'left'), self._search(fStop, 'right'))
+
+    def load(self):
+        return self._read(0, len(self))
+
+    @property
+    def frequencies(self):
+        chunks = [self._text.parse(self._starts, i, min(i + _CHUNK, len(self)), self.width)[:, 0]
+                  for i in range(0, len(self), _CHUNK)]
+        return np.concatenate(chunks or [np.zeros(0)]) * _FREQUENCY_UNITS[self.unit]
+
+    def close(self):
+        self._text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    # First point with frequency >= f ('left') or > f ('right').
+    def _search(self, f, side):
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self._text.firstNumber(self._starts[mid]) * _FREQUENCY_UNITS[self.unit]
+            if value < f or (side == 'right' and value == f):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _read(self, start, stop):
+        N = self.nPorts
+        data = np.concatenate(
+            [self._text.parse(self._starts, i, min(i + _CHUNK, stop), self.width)
+             for i in range(start, stop, _CHUNK)] or [np.zeros((0, self.width))])
+        a, b = data[:, 1::2], data[:, 2::2]
+        if self.format == 'RI':
+            values = a + 1j * b
+        elif self.format == 'MA':
+            values = a * np.exp(1j * np.radians(b))
+        else:
+            values = 10 ** (a / 20) * np.exp(1j * np.radians(b))
+        matrices = values.reshape(len(data), N, N)
+        if N == 2:
+            # Version 1 two-ports are written N11 N21 N12 N22.
+            matrices = matrices.transpose(0, 2, 1)
+        return data[:, 0] * _FREQUENCY_UNITS[self.unit], matrices
+
+
+# Frequency unit -> GHz.
+_FREQUENCY_UNITS = {'HZ': 1e-9, 'KHZ': 1e-6, 'MHZ': 1e-3, 'GHZ': 1.0}
+
+# Points (rows) parsed at a time.
+_CHUNK = 1 << 16
+
+
+# ----------------------------------------------------------------------------
+# class ReportCSV(path)
+#
+# Description :
+# -------------
+# Reader of a report exported to CSV (see hfssExportReport), with the same
+# lazy, memory mapped parsing as Touchstone. The first column is the
+# primary sweep variable (e.g. 'Freq [GHz]' or 'Theta [deg]').
+#
+# Attributes / methods :
+# ----------------------
+# csv.columns          - names of the columns.
+# len(csv)             - number of rows.
+# csv[i], csv[i:j]     - rows as an (n, len(columns)) array.
+# csv.between(x0, x1)  - rows with x0 <= first column <= x1 (the first
+#                        column must be sorted).
+# csv.load()           - all the rows.
+# csv.column(name)     - one column.
+# ----------------------------------------------------------------------------
+class ReportCSV(object):
+    def __init__(self, path):
+        self.path = path
+        self._text = _MappedText(path)
+        header = self._text.header(None, maxLines=1)
+        self.columns = [name.strip() for name in
+                        next(csv.reader([header[0].decode('utf-8', 'replace')]))] if header else []
+        self.width = len(self.columns)
+        self._starts = self._text.lineStarts
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return self._read(start, max(start, stop))[::step]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._read(index, index + 1)[0]
+
+    def between(self, xStart, xStop):
+        return self._read(self._search(xStart, 'left'), self._search(xStop, 'right'))
+
+    def load(self):
+        return self._read(0, len(self))
+
+    def column(self, name):
+        return self.load()[:, self.columns.index(name)]
+
+    def close(self):
+        self._text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def _search(self, x, side):
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self._text.firstNumber(self._starts[mid], b',')
+            if value < x or (side == 'right' and value == x):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _read(self, start, stop):
+        return np.concatenate(
+            [self._text.parse(self._starts, i, min(i + _CHUNK, stop), self.width, b',')
+             for i in range(start, stop, _CHUNK)] or [np.zeros((0, self.width))])
+
+
+# ----------------------------------------------------------------------------
+# function readResults(paths, [reducer], [fStart], [fStop], [workers])
+#
+# Description :
+# -------------
+# Reads many result files (Touchstone .sNp or report .csv) with a pool of
+# worker processes, each reading and reducing its files on its own, so
+# that only the reduced results travel back.
+#
+# Parameters :
+# ------------
+# paths   - list of the result files.
+# reducer - (Optional) function called as reducer(x, data) in the workers
+#           (x: frequencies or first column, data: the matrices of a
+#           Touchstone file or the rows of a CSV file); it must be defined
+#           at module level. By default (x, data) is returned as is.
+# fStart  - (Optional) only read the points with x >= fStart ...
+# fStop   - (Optional) ... and x <= fStop.
+# workers - (Optional) number of worker processes (default: one per CPU).
+#           With workers=1 the files are read in this process.
+#
+# Returns :
+# ---------
+# A dictionary mapping each path to its (reduced) result.
+#
+# Example :
+# ---------
+# def worstMatch(f, S):
+#     return 20 * np.log10(abs(S[:, 0, 0])).max()
+#
+# results = readResults(glob.glob('results/*.s2p'), worstMatch, 2.3, 2.5)
+# ----------------------------------------------------------------------------
+def readResults(paths, reducer=None, fStart=None, fStop=None, workers=None):
+    jobs = [(path, reducer, fStart, fStop) for path in paths]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        return dict(zip(paths, map(_readResult, jobs)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunkSize = max(1, len(jobs) // (4 * workers))
+        return dict(zip(paths, pool.map(_readResult, jobs, chunksize=chunkSize)))
+
+
+# Reads and reduces one result file (runs in the worker processes).
+def _readResult(job):
+    path, reducer, fStart, fStop = job
+    isCSV = path.lower().endswith('.csv')
+    with (ReportCSV(path) if isCSV else Touchstone(path)) as result:
+        if fStart is None and fStop is None:
+            data = result.load()
+        else:
+            data = result.between(-np.inf if fStart is None else fStart,
+                                  np.inf if fStop is None else fStop)
+    if isCSV:
+        data = data[:, 0], data
+    return data if reducer is None else reducer(*data)
+
+
+# ----------------------------------------------------------------------------
+# Memory mapped text file split into lines, shared by the readers.
+# lineStarts holds the offset of every data line (after the header) and the
+# size of the file; parse() turns a range of records into an array with
+# NumPy's C parser.
+# ----------------------------------------------------------------------------
+class _MappedText(object):
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if self.size else b''
+        self.begin = 0
+        self.lineStarts = None
+
+    # Reads the header: the lines starting with one of the given characters
+    # (any line if marks is None), at most maxLines of them, and indexes the
+    # lines after it.
+    def header(self, marks, maxLines=None):
+        lines = []
+        position = 0
+        while position < self.size and (maxLines is None or len(lines) < maxLines):
+            end = self._map.find(b'\n', position)
+            end = self.size if end < 0 else end + 1
+            line = self._map[position:end].strip()
+            if line and marks is not None and line[:1] not in marks:
+                break
+            if line:
+                lines.append(line)
+            position = end
+        self.begin = position
+        self.lineStarts = self._index(position)
+        return lines
+
+    # Offsets of the data lines from begin on, plus the file size.
+    def _index(self, begin, chunkSize=1 << 26):
+        if self.size <= begin:
+            return np.array([self.size], dtype=np.int64)
+        buffer = np.frombuffer(self._map, dtype=np.uint8)
+        ends = [np.flatnonzero(buffer[offset:offset + chunkSize] == 10) + offset
+                for offset in range(begin, self.size, chunkSize)]
+        starts = np.concatenate([[begin]] + [chunk + 1 for chunk in ends]).astype(np.int64)
+        starts = starts[starts < self.size]
+        # First non-blank byte of every line: blank lines and comment-only
+        # lines (e.g. the '! Gamma' and '! Port Impedance' lines HFSS writes
+        # after every point) are not records.
+        first = buffer[starts]
+        indented = np.flatnonzero((first == 32) | (first == 9))
+        offsets = starts[indented]
+        while len(indented):
+            offsets += 1
+            byte = np.full(len(offsets), 10, dtype=np.uint8)
+            inside = offsets < self.size
+            byte[inside] = buffer[offsets[inside]]
+            blank = (byte == 32) | (byte == 9)
+            first[indented[~blank]] = byte[~blank]
+            indented, offsets = indented[blank], offsets[blank]
+        starts = starts[(first != 10) & (first != 13) & (first != 33)]
+        del buffer
+        return np.append(starts, self.size)
+
+    # Value of the first number of the line at offset.
+    def firstNumber(self, offset, separator=None):
+        chunk = self._map[offset:offset + 128].split(None, 1)[0]
+        if separator is not None:
+            chunk = chunk.split(separator, 1)[0]
+        return float(chunk)
+
+    # The records i to j (their offsets in starts) as an (n, width) array.
+    def parse(self, starts, i, j, width, separator=None):
+        if j <= i:
+            return np.zeros((0, width))
+        chunk = self._map[starts[i]:starts[j]]
+        if b'!' in chunk:
+            chunk = re.sub(rb'![^\n]*', b'', chunk)
+        if separator is not None:
+            chunk = chunk.replace(separator, b' ')
+        try:
+            values = np.array(chunk.split(), dtype=float)
+        except ValueError:
+            values = ()
+        if len(values) != (j - i) * width:
+            raise Exception('Malformed data in records {0} to {1} !!'.format(i, j))
+        return values.reshape(j - i, width)
+
+    def close(self):
+        if self.size:
+            self._map.close()
+        self._file.close()
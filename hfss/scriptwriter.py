@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# @File    : scriptwriter.py
+# @Software: PyCharm
+
+import functools
+import gzip
+
+# ----------------------------------------------------------------------------
+# class ScriptWriter([target], [chunkSize], [observers], [emitter])
+#
+# Description :
+# -------------
+# A buffered replacement for the file identifier (fid) accepted by every
+# hfss* generator. Script fragments are collected in a list and joined only
+# when the buffer reaches chunkSize characters, so the file itself sees a
+# few large writes instead of one write per line.
+#
+# Parameters :
+# ------------
+# target    - (Optional) where the script goes. Either a file name (names
+#             ending in '.gz' are gzip compressed), an already opened file
+#             object, a connected socket, or None (default) to keep the
+#             whole script in memory (see getvalue()).
+# chunkSize - (Optional) number of buffered characters that triggers a
+#             flush to the target (default 1 MiB).
+# observers - (Optional) list of functions called as observer(kind, params)
+#             for every block the generators emit (see emit()), e.g. the
+#             record method of an ObjectRegistry.
+# emitter   - (Optional) script backend (see emitters.py) that renders
+#             every block, e.g. PythonEmitter() for an IronPython script.
+#             By default the VB script of the generators is written.
+#
+# Note :
+# ------
+# Any object with a write() method can still be passed to the generators,
+# so existing scripts that use plain file objects keep working.
+#
+# Example :
+# ---------
+# with ScriptWriter('myantenna.vbs') as fid:
+#     hfssNewProject(fid)
+#     hfssInsertDesign(fid, 'Dipole_SingleElement')
+# ----------------------------------------------------------------------------
+class ScriptWriter(object):
+    def __init__(self, target=None, chunkSize=1 << 20, observers=None, emitter=None):
+        self.chunkSize = chunkSize
+        self.observers = [] if observers is None else list(observers)
+        self.emitter = emitter
+        self._owner = isinstance(target, str)
+        if self._owner:
+            if target.endswith('.gz'):
+                target = gzip.open(target, 'wt')
+            else:
+                target = open(target, 'w')
+        elif target is not None and not hasattr(target, 'write'):
+            target = _SocketTarget(target)
+        self._target = target
+        self._chunks = []
+        self._size = 0
+
+    def write(self, text):
+        if self.emitter is not None:
+            text = self.emitter.render(None, None, text)
+        self._append(text)
+
+    def emit(self, kind, params, text):
+        for observer in self.observers:
+            observer(kind, params)
+        if self.emitter is not None:
+            text = self.emitter.render(kind, params, text)
+        self._append(text)
+
+    def flush(self):
+        if self._target is None:
+            return
+        if self._chunks:
+            self._target.write(''.join(self._chunks))
+            self._chunks = []
+            self._size = 0
+        self._target.flush()
+
+    # Returns the buffered script text (the whole script if no target).
+    def getvalue(self):
+        text = ''.join(self._chunks)
+        self._chunks = [text]
+        return text
+
+    def close(self):
+        if self.emitter is not None:
+            self._append(self.emitter.finish())
+        self.flush()
+        if self._owner:
+            self._target.close()
+
+    def _append(self, text):
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size >= self.chunkSize and self._target is not None:
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+# File-like view of a socket: the script is sent as UTF-8 with sendall().
+class _SocketTarget(object):
+    def __init__(self, sock):
+        self._sock = sock
+
+    def write(self, text):
+        self._sock.sendall(text.encode('utf-8'))
+
+    def flush(self):
+        pass
+
+
+# Function called as hook(kind, params, text) for every block emitted by any
+# generator, or None (see instrument.Profiler).
+hook = None
+
+# Object running every call of the hfss* generators as
+# profiler.call(function, args, kwargs) while it is enabled, or None (see
+# instrument.Profiler).
+profiler = None
+
+
+# ----------------------------------------------------------------------------
+# function profiled(function)
+#
+# Description :
+# -------------
+# Decorator of the hfss* generators, applied where they are defined so that
+# every reference to them (including names bound by "from hfss.modeler
+# import hfssDipole") goes through it. While no profiler is enabled the
+# only cost is one None check per call.
+# ----------------------------------------------------------------------------
+def profiled(function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if profiler is None:
+            return function(*args, **kwargs)
+        return profiler.call(function, args, kwargs)
+    return wrapper
+
+
+# ----------------------------------------------------------------------------
+# function emit(fid, kind, params, text)
+#
+# Description :
+# -------------
+# Hands one generated script block to fid. Plain file objects (and
+# ScriptWriter) just receive the text; sinks that also define
+# emit(kind, params, text), such as a Model, get the structured call as well
+# so they can record, analyse or rewrite it before any text is produced.
+#
+# Parameters :
+# ------------
+# fid    - file identifier of the HFSS script file (or any script sink).
+# kind   - kind of the block ('cylinder', 'box', 'subtract', 'design', ...).
+# params - dictionary with the arguments the block was generated from.
+# text   - the VB script of the block.
+# ----------------------------------------------------------------------------
+def emit(fid, kind, params, text):
+    if hook is not None:
+        hook(kind, params, text)
+    record = getattr(fid, 'emit', None)
+    if record is None:
+        fid.write(text)
+    else:
+        record(kind, params, text)
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+# @File    : spatial.py
+# @Software: PyCharm
+
+from collections import defaultdict
+from itertools import product
+
+import numpy as np
+
+
+# Length of the HFSS units, in meters.
+UNITS = {'meter': 1.0, 'm': 1.0, 'cm': 1e-2, 'mm': 1e-3, 'um': 1e-6,
+         'nm': 1e-9, 'in': 0.0254, 'mil': 2.54e-5, 'ft': 0.3048}
+
+
+# ----------------------------------------------------------------------------
+# class ObjectRegistry()
+#
+# Description :
+# -------------
+# Keeps the axis-aligned bounding box (in meters) of every part created by
+# the hfss* generators, so that intersection violations between solids can
+# be found before the script ever reaches HFSS. Subtract, Unite, Intersect,
+# Delete and the Duplicate commands are followed, and the bounding boxes of subtracted
+# tool parts are remembered as cuts in their blank part (so a via running
+# through a hole of a box does not count as an overlap).
+#
+# Note :
+# ------
+# Attach the registry to a ScriptWriter (or feed it the nodes of a Model):
+#
+#   registry = ObjectRegistry()
+#   fid = ScriptWriter('array.vbs', observers=[registry.record])
+#   ...
+#   bad = registry.overlaps()
+#
+# Parts whose dimensions are not plain numbers (e.g. design variables) are
+# not tracked; they are counted in registry.unresolved.
+# ----------------------------------------------------------------------------
+class ObjectRegistry(object):
+    def __init__(self):
+        self.boxes = {}     # part -> [lo, hi, isSolid, cuts]
+        self.unresolved = 0
+
+    def __len__(self):
+        return len(self.boxes)
+
+    # Observer entry point: updates the registry with one generated block.
+    def record(self, kind, params):
+        try:
+            if kind == 'cylinder':
+                self._add(params['Name'], *_cylinderBounds(
+                    params['Axis'], params['Center'], params['Radius'],
+                    params['Height'], params['Units']))
+            elif kind == 'box':
+                self._add(params['Name'], *_boxBounds(params['Start'], params['Size'],
+                                                      params['Units']))
+            elif kind == 'rectangle':
+                self._add(params['Name'], *_rectangleBounds(
+                    params['Axis'], params['Start'], params['Width'],
+                    params['Height'], params['Units']), isSolid=False)
+            elif kind == 'cylinderarray':
+                N = len(params['Names'])
+                Radii = np.broadcast_to(params['Radii'], (N,))
+                Heights = np.broadcast_to(params['Heights'], (N,))
+                for i, Name in enumerate(params['Names']):
+                    self._add(Name, *_cylinderBounds(
+                        params['Axis'][i], params['Centers'][i], Radii[i],
+                        Heights[i], params['Units']))
+            elif kind == 'boxarray':
+                N = len(params['Names'])
+                Sizes = np.broadcast_to(params['Sizes'], (N, 3))
+                for i, Name in enumerate(params['Names']):
+                    self._add(Name, *_boxBounds(params['Starts'][i], Sizes[i],
+                                                params['Units']))
+            elif kind == 'rectanglearray':
+                N = len(params['Names'])
+                Widths = np.broadcast_to(params['Widths'], (N,))
+                Heights = np.broadcast_to(params['Heights'], (N,))
+                for i, Name in enumerate(params['Names']):
+                    self._add(Name, *_rectangleBounds(
+                        params['Axis'][i], params['Starts'][i], Widths[i],
+                        Heights[i], params['Units']), isSolid=False)
+            elif kind == 'subtract':
+                self._subtract(params['blankParts'], params['toolParts'],
+                               params['Clone'] == 'true')
+            elif kind in ('unite', 'intersect'):
+                self._combine(params['Parts'], params['Clone'] == 'true', kind == 'unite')
+            elif kind == 'delete':
+                for part in params['Parts']:
+                    self.boxes.pop(part, None)
+            elif kind == 'duplicate':
+                self._duplicate(params)
+            elif kind == 'split':
+                self._split(params['Parts'], params['Axis'], params['Side'])
+        except (KeyError, TypeError, ValueError):
+            self.unresolved += 1
+
+    # Bounding box (lo, hi), in meters, of a part.
+    def bounds(self, Name):
+        lo, hi = self.boxes[Name][:2]
+        return lo.copy(), hi.copy()
+
+    # ------------------------------------------------------------------------
+    # Returns the sorted list of (NameA, NameB) pairs of solids whose
+    # bounding boxes overlap by more than Tol (meters) along every axis.
+    # With Margin > 0, the boxes are first grown by Margin/2 on every side,
+    # so pairs closer than Margin (including sheets) are reported as well.
+    #
+    # The boxes are hashed into a uniform grid (cell size ~ twice the median
+    # box size) so that only boxes sharing a cell are compared; boxes that
+    # span many cells are compared against everything in one vectorized
+    # step instead of being inserted in all of them.
+    # ------------------------------------------------------------------------
+    def overlaps(self, Margin=0.0, Tol=1e-12, maxCells=64):
+        Names = [Name for Name, entry in self.boxes.items() if entry[2] or Margin > 0]
+        if len(Names) < 2:
+            return []
+        Lo = np.array([self.boxes[Name][0] for Name in Names]) - Margin / 2
+        Hi = np.array([self.boxes[Name][1] for Name in Names]) + Margin / 2
+
+        Extent = Hi - Lo
+        cell = max(2 * float(np.median(Extent.max(axis=1))), Tol)
+        first = np.floor(Lo / cell).astype(np.int64)
+        last = np.floor(Hi / cell).astype(np.int64)
+        nCells = np.prod(last - first + 1, axis=1)
+
+        grid = defaultdict(list)
+        large = []
+        for i in range(len(Names)):
+            if nCells[i] > maxCells:
+                large.append(i)
+                continue
+            for key in product(*[range(first[i, d], last[i, d] + 1) for d in range(3)]):
+                grid[key].append(i)
+
+        candidates = set()
+        for members in grid.values():
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    candidates.add((members[a], members[b]))
+        everything = np.arange(len(Names))
+        for i in large:
+            near = everything[np.all((Lo <= Hi[i]) & (Hi >= Lo[i]), axis=1)]
+            candidates.update((min(i, j), max(i, j)) for j in near if j != i)
+        if not candidates:
+            return []
+
+        pairs = np.array(sorted(candidates))
+        lo = np.maximum(Lo[pairs[:, 0]], Lo[pairs[:, 1]])
+        hi = np.minimum(Hi[pairs[:, 0]], Hi[pairs[:, 1]])
+        hit = np.all(hi - lo > Tol, axis=1)
+
+        result = []
+        for (i, j), a, b in zip(pairs[hit], lo[hit], hi[hit]):
+            if not (self._isCut(Names[i], a, b) or self._isCut(Names[j], a, b)):
+                result.append(tuple(sorted((Names[i], Names[j]))))
+        return sorted(result)
+
+    def _add(self, Name, lo, hi, isSolid=True):
+        self.boxes[Name] = [lo, hi, isSolid, []]
+
+    def _subtract(self, blankParts, toolParts, Clone):
+        tools = [self.boxes[part] for part in toolParts if part in self.boxes]
+        for part in blankParts:
+            if part in self.boxes:
+                self.boxes[part][3].extend((lo, hi) for lo, hi, _, _ in tools)
+        if not Clone:
+            for part in toolParts:
+                self.boxes.pop(part, None)
+
+    # The result of a Unite (Intersect) is bounded by the union (intersection)
+    # of the boxes, and keeps the name and cuts of the first part; the cuts of
+    # the other parts are kept as well, which may hide an overlap inside a
+    # hole that another united part fills.
+    def _combine(self, Parts, Clone, isUnion):
+        entries = [self.boxes[part] for part in Parts if part in self.boxes]
+        if not entries or Parts[0] not in self.boxes:
+            return
+        lo = np.array([entry[0] for entry in entries])
+        hi = np.array([entry[1] for entry in entries])
+        if isUnion:
+            lo, hi = lo.min(axis=0), hi.max(axis=0)
+        else:
+            lo, hi = lo.max(axis=0), hi.min(axis=0)
+        cuts = [cut for entry in entries for cut in entry[3]]
+        if not Clone:
+            for part in Parts[1:]:
+                self.boxes.pop(part, None)
+        self.boxes[Parts[0]] = [lo, np.maximum(lo, hi), entries[0][2], cuts]
+
+    def _duplicate(self, params):
+        nClones = int(params['NumClones'])
+        Clones = iter(params['Clones'])
+        for part in params['Parts']:
+            entry = self.boxes.get(part)
+            for k in range(1, nClones):
+                Name = next(Clones)
+                if entry is None:
+                    continue
+                if 'Vector' in params:
+                    shift = k * _meters(params['Vector'], params['Units'])
+                    self.boxes[Name] = [entry[0] + shift, entry[1] + shift, entry[2],
+                                        [(a + shift, b + shift) for a, b in entry[3]]]
+                else:
+                    lo, hi = _rotatedBounds(entry[0], entry[1], params['Axis'],
+                                            k * float(params['Angle']))
+                    self.boxes[Name] = [lo, hi, entry[2], []]
+
+    # A split part is clipped to the side kept (both sides stay within the
+    # same bounding box).
+    def _split(self, Parts, Axis, Side):
+        a = 'XYZ'.index(Axis.upper())
+        for part in Parts:
+            entry = self.boxes.get(part)
+            if entry is None or Side == 'both':
+                continue
+            if Side == 'positive':
+                entry[0][a] = min(max(entry[0][a], 0.0), entry[1][a])
+            else:
+                entry[1][a] = max(min(entry[1][a], 0.0), entry[0][a])
+
+    # True if the region [lo, hi] lies inside one of the cuts of a part.
+    def _isCut(self, Name, lo, hi):
+        return any(np.all(lo >= a) and np.all(hi <= b) for a, b in self.boxes[Name][3])
+
+
+def _meters(values, Units):
+    if isinstance(values, str):
+        raise ValueError(values)
+    return np.asarray(values, dtype=float) * UNITS[Units]
+
+
+def _cylinderBounds(Axis, Center, Radius, Height, Units):
+    a = 'XYZ'.index(Axis.upper())
+    Center = _meters(Center, Units)
+    Radius = float(_meters(Radius, Units))
+    Height = float(_meters(Height, Units))
+    lo = Center - Radius
+    hi = Center + Radius
+    lo[a] = min(Center[a], Center[a] + Height)
+    hi[a] = max(Center[a], Center[a] + Height)
+    return lo, hi
+
+
+def _boxBounds(Start, Size, Units):
+    Start = _meters(Start, Units)
+    End = Start + _meters(Size, Units)
+    return np.minimum(Start, End), np.maximum(Start, End)
+
+
+# Width and Height follow the right-hand rule (see hfssRectangle).
+def _rectangleBounds(Axis, Start, Width, Height, Units):
+    a = 'XYZ'.index(Axis.upper())
+    Start = _meters(Start, Units)
+    End = Start.copy()
+    End[(a + 1) % 3] += float(_meters(Width, Units))
+    End[(a + 2) % 3] += float(_meters(Height, Units))
+    return np.minimum(Start, End), np.maximum(Start, End)
+
+
+# Bounding box of the box [lo, hi] rotated by Angle degrees about a global
+# axis.
+def _rotatedBounds(lo, hi, Axis, Angle):
+    a = 'XYZ'.index(Axis.upper())
+    u, v = (a + 1) % 3, (a + 2) % 3
+    c, s = np.cos(np.radians(Angle)), np.sin(np.radians(Angle))
+    corners = np.array(list(product(*zip(lo, hi))))
+    rotated = corners.copy()
+    rotated[:, u] = c * corners[:, u] - s * corners[:, v]
+    rotated[:, v] = s * corners[:, u] + c * corners[:, v]
+    return rotated.min(axis=0), rotated.max(axis=0)
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# @File    : store.py
+# @Software: PyCharm
+
+from array import array
+
+import numpy as np
+
+from . import modeler
+from .scriptwriter import emit
+
+
+# Record layout of each primitive kind. 'name' and 'units' index into the
+# names and units of the store; 'axis' is 0, 1 or 2 for X, Y or Z.
+DTYPES = {
+    'cylinder': np.dtype([('name', np.int32), ('axis', np.uint8), ('units', np.uint8),
+                          ('center', np.float64, 3), ('radius', np.float64),
+                          ('height', np.float64)], align=False),
+    'box': np.dtype([('name', np.int32), ('units', np.uint8),
+                     ('start', np.float64, 3), ('size', np.float64, 3)], align=False),
+    'rectangle': np.dtype([('name', np.int32), ('axis', np.uint8), ('units', np.uint8),
+                           ('start', np.float64, 3), ('width', np.float64),
+                           ('height', np.float64)], align=False),
+}
+
+# Codes of the kinds in the creation order log (0 is any other block).
+_CODES = {'cylinder': 1, 'box': 2, 'rectangle': 3}
+_KINDS = {code: kind for kind, code in _CODES.items()}
+
+
+# ----------------------------------------------------------------------------
+# class PrimitiveStore([capacity])
+#
+# Description :
+# -------------
+# A compact in-memory script sink for models with millions of objects.
+# Cylinders, boxes and rectangles (also when created through the *Array
+# generators) are kept as rows of one NumPy structured array per kind, about
+# 50 bytes each plus the name, instead of one parameter dictionary and
+# script block per object. Every other block (Subtract, Duplicate, design commands, ...) is
+# kept as is, and the creation order of everything is preserved.
+#
+# Rows can be inspected through light view objects (see views()), and
+# writeTo() emits the model with one hfss*Array call per run of consecutive
+# primitives of the same kind, formatting the script straight from the
+# arrays.
+#
+# Parameters :
+# ------------
+# capacity - (Optional) initial number of rows of each array (they grow
+#            as needed).
+#
+# Note :
+# ------
+# Dimensions are stored as floating point numbers, so they are written back
+# in float notation (10 becomes '10.0mm'). Primitives with HFSS expressions
+# as dimensions cannot be stored in the arrays; they are kept as plain
+# blocks.
+#
+# The record method may also be used as a ScriptWriter observer, in which
+# case only the primitives are kept (for validation).
+#
+# Example :
+# ---------
+# store = PrimitiveStore()
+# for i, Center in enumerate(Centers):
+#     hfssCylinder(store, 'Via' + str(i), 'Z', Center, 0.1, 1.6, 'mm')
+# vias = store.views('cylinder')
+# with ScriptWriter('board.vbs') as fid:
+#     store.writeTo(fid)
+# ----------------------------------------------------------------------------
+class PrimitiveStore(object):
+    def __init__(self, capacity=1024):
+        self.units = []
+        self._nameData = bytearray()    # all the names, UTF-8 encoded
+        self._nameEnds = array('q', [0])
+        self._unitIds = {}
+        self._arrays = {kind: np.zeros(capacity, dtype) for kind, dtype in DTYPES.items()}
+        self._counts = dict.fromkeys(DTYPES, 0)
+        self._order = array('q')    # code << 32 | row
+        self._blocks = []           # (kind, params, text) of the other blocks
+
+    def __len__(self):
+        return len(self._order)
+
+    def count(self, kind):
+        return self._counts[kind]
+
+    # Name of the part with the given name index.
+    def name(self, index):
+        return self._nameData[self._nameEnds[index]:self._nameEnds[index + 1]].decode('utf-8')
+
+    # The rows recorded so far for one primitive kind.
+    def rows(self, kind):
+        return self._arrays[kind][:self._counts[kind]]
+
+    # View objects (with the parameters of the hfss* generator as
+    # attributes) of all the primitives of one kind.
+    def views(self, kind):
+        View = _VIEWS[kind]
+        return [View(self, row) for row in range(self._counts[kind])]
+
+    def write(self, text):
+        self._other(None, None, text)
+
+    def emit(self, kind, params, text):
+        if not self._store(kind, params):
+            self._other(kind, params, text)
+
+    # Observer entry point (see ScriptWriter): keeps the primitives only.
+    def record(self, kind, params):
+        self._store(kind, params)
+
+    # ------------------------------------------------------------------------
+    # Replays the store into another script sink. Consecutive primitives of
+    # the same kind and units become one hfss*Array call.
+    # ------------------------------------------------------------------------
+    def writeTo(self, fid):
+        order = np.frombuffer(self._order, dtype=np.int64) if len(self._order) else \
+            np.zeros(0, np.int64)
+        codes = order >> 32
+        rows = order & 0xFFFFFFFF
+        # Runs of the same code with consecutive rows.
+        breaks = np.flatnonzero((np.diff(codes) != 0) | (np.diff(rows) != 1)) + 1
+        for start, stop in zip(np.r_[0, breaks], np.r_[breaks, len(order)]):
+            code = int(codes[start])
+            if code == 0:
+                for row in rows[start:stop]:
+                    kind, params, text = self._blocks[row]
+                    if kind is None:
+                        fid.write(text)
+                    else:
+                        emit(fid, kind, params, text)
+                continue
+            kind = _KINDS[code]
+            chunk = self._arrays[kind][rows[start]:rows[stop - 1] + 1]
+            unitBreaks = np.flatnonzero(np.diff(chunk['units'])) + 1
+            for a, b in zip(np.r_[0, unitBreaks], np.r_[unitBreaks, len(chunk)]):
+                self._emitRun(fid, kind, chunk[a:b])
+
+    def _emitRun(self, fid, kind, run):
+        Names = [self.name(i) for i in run['name']]
+        Units = self.units[run['units'][0]]
+        if kind == 'cylinder':
+            modeler.hfssCylinderArray(fid, Names, np.array(list('XYZ'))[run['axis']],
+                                      run['center'], run['radius'], run['height'], Units)
+        elif kind == 'box':
+            modeler.hfssBoxArray(fid, Names, run['start'], run['size'], Units)
+        else:
+            modeler.hfssRectangleArray(fid, Names, np.array(list('XYZ'))[run['axis']],
+                                       run['start'], run['width'], run['height'], Units)
+
+    def _other(self, kind, params, text):
+        self._order.append(len(self._blocks))
+        self._blocks.append((kind, params, text))
+
+    # Appends the primitives of one block to the arrays. Returns False if the
+    # block holds no primitive or cannot be stored as numbers.
+    def _store(self, kind, params):
+        try:
+            if kind == 'cylinder':
+                self._append('cylinder', [params['Name']], params['Units'],
+                             axis=params['Axis'], center=[params['Center']],
+                             radius=params['Radius'], height=params['Height'])
+            elif kind == 'box':
+                self._append('box', [params['Name']], params['Units'],
+                             start=[params['Start']], size=[params['Size']])
+            elif kind == 'rectangle':
+                self._append('rectangle', [params['Name']], params['Units'],
+                             axis=params['Axis'], start=[params['Start']],
+                             width=params['Width'], height=params['Height'])
+            elif kind == 'cylinderarray':
+                self._append('cylinder', params['Names'], params['Units'],
+                             axis=params['Axis'], center=params['Centers'],
+                             radius=params['Radii'], height=params['Heights'])
+            elif kind == 'boxarray':
+                self._append('box', params['Names'], params['Units'],
+                             start=params['Starts'], size=params['Sizes'])
+            elif kind == 'rectanglearray':
+                self._append('rectangle', params['Names'], params['Units'],
+                             axis=params['Axis'], start=params['Starts'],
+                             width=params['Widths'], height=params['Heights'])
+            else:
+                return False
+        except ValueError:
+            return False
+        return True
+
+    def _append(self, kind, Names, Units, axis=None, **columns):
+        N = len(Names)
+        new = np.zeros(N, DTYPES[kind])
+        # Converting first means a symbolic dimension raises ValueError before
+        # anything is stored.
+        for field, values in columns.items():
+            new[field] = np.asarray(values, dtype=float)
+        if axis is not None:
+            new['axis'] = ['XYZ'.index(Axis) for Axis in
+                           np.broadcast_to(np.char.upper(np.asarray(axis, dtype=str)), (N,))]
+        if Units not in self._unitIds:
+            self._unitIds[Units] = len(self.units)
+            self.units.append(Units)
+        new['units'] = self._unitIds[Units]
+        first = len(self._nameEnds) - 1
+        new['name'] = np.arange(first, first + N)
+        for Name in Names:
+            self._nameData += Name.encode('utf-8')
+            self._nameEnds.append(len(self._nameData))
+
+        count = self._counts[kind]
+        data = self._arrays[kind]
+        if count + N > len(data):
+            grown = np.zeros(max(2 * len(data), count + N), DTYPES[kind])
+            grown[:count] = data[:count]
+            self._arrays[kind] = data = grown
+        data[count:count + N] = new
+        self._counts[kind] = count + N
+        self._order.extend(range((_CODES[kind] << 32) | count, (_CODES[kind] << 32) | (count + N)))
+
+
+# ----------------------------------------------------------------------------
+# View objects: read-only access to one row of a PrimitiveStore, with the
+# same attribute names as the parameters of the hfss* generators.
+# ----------------------------------------------------------------------------
+class _View(object):
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    def _field(self, field):
+        return self._store._arrays[self.kind][self._row][field]
+
+    @property
+    def Name(self):
+        return self._store.name(self._field('name'))
+
+    @property
+    def Units(self):
+        return self._store.units[self._field('units')]
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(self.kind, self.Name)
+
+
+class CylinderView(_View):
+    __slots__ = ()
+    kind = 'cylinder'
+
+    @property
+    def Axis(self):
+        return 'XYZ'[self._field('axis')]
+
+    @property
+    def Center(self):
+        return self._field('center').copy()
+
+    @property
+    def Radius(self):
+        return float(self._field('radius'))
+
+    @property
+    def Height(self):
+        return float(self._field('height'))
+
+
+class BoxView(_View):
+    __slots__ = ()
+    kind = 'box'
+
+    @property
+    def Start(self):
+        return self._field('start').copy()
+
+    @property
+    def Size(self):
+        return self._field('size').copy()
+
+
+class RectangleView(_View):
+    __slots__ = ()
+    kind = 'rectangle'
+
+    @property
+    def Axis(self):
+        return 'XYZ'[self._field('axis')]
+
+    @property
+    def Start(self):
+        return self._field('start').copy()
+
+    @property
+    def Width(self):
+        return float(self._field('width'))
+
+    @property
+    def Height(self):
+        return float(self._field('height'))
+
+
+_VIEWS = {'cylinder': CylinderView, 'box': BoxView, 'rectangle': RectangleView}
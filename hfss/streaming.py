@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# @File    : streaming.py
+# @Software: PyCharm
+
+from . import modeler
+from .scriptwriter import ScriptWriter
+
+
+# ----------------------------------------------------------------------------
+# function iterCalls(generator, *args, **kwargs)
+#
+# Description :
+# -------------
+# Generator form of any hfss* function: runs generator(fid, ...) on a
+# private sink and yields the VB script blocks it produces, one per
+# command. Nothing is generated until the caller asks for the first block.
+#
+# Example :
+# ---------
+# for chunk in iterCalls(hfssCylinder, 'Via1', 'Z', [0, 0, 0], 0.2, 1.6, 'mm'):
+#     sock.sendall(chunk.encode())
+# ----------------------------------------------------------------------------
+def iterCalls(generator, *args, **kwargs):
+    sink = _Chunks()
+    generator(sink, *args, **kwargs)
+    for chunk in sink.chunks:
+        yield chunk
+
+
+# Generator forms of the primitives (same arguments as the hfss* functions,
+# without fid).
+def hfssCylinderIter(*args):
+    return iterCalls(modeler.hfssCylinder, *args)
+
+
+def hfssRectangleIter(*args):
+    return iterCalls(modeler.hfssRectangle, *args)
+
+
+def hfssDipoleIter(*args, **kwargs):
+    return iterCalls(modeler.hfssDipole, *args, **kwargs)
+
+
+def hfssSubtractIter(*args):
+    return iterCalls(modeler.hfssSubtract, *args)
+
+
+def hfssUniteIter(*args):
+    return iterCalls(modeler.hfssUnite, *args)
+
+
+def hfssIntersectIter(*args):
+    return iterCalls(modeler.hfssIntersect, *args)
+
+
+def hfssDeleteIter(*args):
+    return iterCalls(modeler.hfssDelete, *args)
+
+
+def hfssDuplicateAlongLineIter(*args):
+    return iterCalls(modeler.hfssDuplicateAlongLine, *args)
+
+
+def hfssDuplicateAroundAxisIter(*args):
+    return iterCalls(modeler.hfssDuplicateAroundAxis, *args)
+
+
+# ----------------------------------------------------------------------------
+# function hfssBoxIter(Name, Start, Size, Units, [Center, Radius, Axis], ...)
+#
+# Description :
+# -------------
+# Generator form of hfssBox(): yields the box, then the cylinder of each
+# hole one at a time and finally the (chunked) Subtracts. The holes are
+# pruned block by block as the cylinders are yielded, so neither the script
+# text nor the list of holes of a plate with many thousands of holes is held
+# in memory as a whole; only the names of the kept holes are, for the
+# Subtracts.
+# ----------------------------------------------------------------------------
+def hfssBoxIter(Name, Start, Size, Units, *varargin):
+    for chunk in iterCalls(modeler.hfssBox, Name, Start, Size, Units):
+        yield chunk
+
+    Tools = []
+    for iH, Center, Radius, Axis, Length in modeler._iterBoxHoles(Start, Size, varargin):
+        Hole = Name + '_subhole' + str(iH)
+        for chunk in iterCalls(modeler.hfssCylinder, Hole, Axis, Center, Radius, Length, Units):
+            yield chunk
+        Tools.append(Hole)
+    if Tools:
+        for chunk in iterCalls(modeler.hfssSubtract, Name, Tools):
+            yield chunk
+
+
+# ----------------------------------------------------------------------------
+# function streamScript(chunks, target, [chunkSize])
+#
+# Description :
+# -------------
+# Writes an iterable of VB script chunks (e.g. a generator expression over
+# the *Iter functions) to target through a ScriptWriter, so that at most
+# chunkSize characters are buffered at any time. target is anything
+# ScriptWriter accepts: a file name ('.gz' names are compressed), a file
+# object or a connected socket. Returns the number of characters written.
+#
+# Example :
+# ---------
+# chunks = (chunk for i, Center in enumerate(Centers)
+#           for chunk in hfssDipoleIter('Dip' + str(i), 'Z', Center, 10, 0.5, 0.2, 'mm'))
+# streamScript(chunks, 'metasurface.vbs.gz')
+# ----------------------------------------------------------------------------
+def streamScript(chunks, target, chunkSize=1 << 20):
+    nChars = 0
+    fid = ScriptWriter(target, chunkSize)
+    try:
+        for chunk in chunks:
+            fid.write(chunk)
+            nChars += len(chunk)
+    finally:
+        fid.close()
+    return nChars
+
+
+# Script sink that keeps the generated blocks in order.
+class _Chunks(object):
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+# @File    : submission.py
+# @Software: PyCharm
+
+import asyncio
+import subprocess
+import threading
+import time
+from collections import Counter
+
+from .interpreter import runFile
+from .sweep import generateSweep
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+# ----------------------------------------------------------------------------
+# class Job(script, name)
+#
+# Description :
+# -------------
+# One script handed to a SubmissionQueue, with its status (queued, running,
+# done, failed or cancelled), the result returned by the executor or the
+# exception it raised, and its submission, start and end times.
+# ----------------------------------------------------------------------------
+class Job(object):
+    def __init__(self, script, name):
+        self.script = script
+        self.name = name
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    # Time spent in the executor (None until the job has finished).
+    @property
+    def seconds(self):
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def __repr__(self):
+        return 'Job({0!r}, {1})'.format(self.name, self.status)
+
+
+# ----------------------------------------------------------------------------
+# class SubmissionQueue(executor, [concurrency])
+#
+# Description :
+# -------------
+# Asynchronous queue between the script generators and the solver. Scripts
+# are submitted as soon as they are written and run by the executor, at
+# most concurrency of them at a time (e.g. the number of HFSS licenses),
+# while the following scripts are still being generated.
+#
+# Parameters :
+# ------------
+# executor    - object with a coroutine run(script) that runs one script
+#               and returns its result, raising an exception if it failed
+#               (see SubprocessExecutor and FakeExecutor).
+# concurrency - (Optional) number of scripts run at the same time
+#               (default 1).
+#
+# Note :
+# ------
+# The queue is used from a running event loop, as an async context manager
+# (or with start() and close()). submit() must be called from the thread of
+# the event loop; submitThreadsafe() may be called from any other thread,
+# e.g. from the onScript callback of generateSweep running in an executor.
+# A failed job does not stop the queue: its exception is kept in job.error.
+#
+# Example :
+# ---------
+# async def main():
+#     async with SubmissionQueue(SubprocessExecutor(), concurrency=2) as queue:
+#         for path in ['board1.vbs', 'board2.vbs', 'board3.vbs']:
+#             queue.submit(path)
+#         await queue.join()
+#     print(queue.status())
+#
+# asyncio.run(main())
+# ----------------------------------------------------------------------------
+class SubmissionQueue(object):
+    def __init__(self, executor, concurrency=1):
+        if concurrency < 1:
+            raise Exception('concurrency must be at least 1 !!')
+        self.executor = executor
+        self.concurrency = concurrency
+        self.jobs = []
+        self._queue = None
+        self._loop = None
+        self._workers = []
+        self._lock = threading.Lock()
+
+    async def start(self):
+        if self._workers:
+            return self
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._workers = [self._loop.create_task(self._work()) for _ in range(self.concurrency)]
+        return self
+
+    def submit(self, script, name=None):
+        job = self._newJob(script, name)
+        self._put(job)
+        return job
+
+    def submitThreadsafe(self, script, name=None):
+        job = self._newJob(script, name)
+        self._loop.call_soon_threadsafe(self._put, job)
+        return job
+
+    # Waits until every job submitted so far has finished.
+    async def join(self):
+        await self._queue.join()
+        return self.jobs
+
+    # Cancels the jobs still queued or running and stops the workers. The
+    # jobs left in the queue are marked done, so that join() returns.
+    async def cancel(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                self._queue.task_done()
+        for job in self.jobs:
+            if job.status in (QUEUED, RUNNING):
+                job.status = CANCELLED
+
+    async def close(self):
+        await self.join()
+        await self.cancel()
+
+    # Number of jobs in each status.
+    def status(self):
+        with self._lock:
+            return dict(Counter(job.status for job in self.jobs))
+
+    # Name -> result of the jobs done.
+    def results(self):
+        with self._lock:
+            return dict((job.name, job.result) for job in self.jobs if job.status == DONE)
+
+    # Name -> exception of the jobs that failed.
+    def errors(self):
+        with self._lock:
+            return dict((job.name, job.error) for job in self.jobs if job.status == FAILED)
+
+    def _newJob(self, script, name):
+        if not self._workers:
+            raise Exception('the submission queue is not started !!')
+        with self._lock:
+            job = Job(script, name if name is not None else script)
+            self.jobs.append(job)
+        return job
+
+    # Queues a job, unless the queue was cancelled in the meantime (e.g.
+    # between submitThreadsafe and this call).
+    def _put(self, job):
+        if not self._workers:
+            job.status = CANCELLED
+            return
+        self._queue.put_nowait(job)
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            job.started = time.time()
+            try:
+                job.result = await self.executor.run(job.script)
+                job.status = DONE
+            except asyncio.CancelledError:
+                job.status = CANCELLED
+                raise
+            except Exception as error:
+                job.error = error
+                job.status = FAILED
+            finally:
+                job.finished = time.time()
+                self._queue.task_done()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, excType, excValue, traceback):
+        if excType is None:
+            await self.close()
+        else:
+            await self.cancel()
+
+
+# ----------------------------------------------------------------------------
+# class SubprocessExecutor([command], [timeout], [cwd])
+#
+# Description :
+# -------------
+# Runs each script with an external command, by default HFSS in batch mode
+# (ansysedt -ng -RunScriptAndExit <script>).
+#
+# Parameters :
+# ------------
+# command - (Optional) list of the program and its arguments. The script
+#           path replaces the argument '{script}', or is appended if there
+#           is none. A remote solver host can be reached with e.g.
+#           ['ssh', 'host1', 'ansysedt', '-ng', '-RunScriptAndExit'].
+# timeout - (Optional) seconds after which the process is killed and the
+#           job fails (default: no limit).
+# cwd     - (Optional) working directory of the process.
+#
+# Returns :
+# ---------
+# run() returns a subprocess.CompletedProcess with the output of the
+# command, and raises an exception if it exits with a non-zero code.
+# ----------------------------------------------------------------------------
+class SubprocessExecutor(object):
+    def __init__(self, command=None, timeout=None, cwd=None):
+        self.command = list(command) if command else ['ansysedt', '-ng', '-RunScriptAndExit']
+        self.timeout = timeout
+        self.cwd = cwd
+
+    def args(self, script):
+        if '{script}' in self.command:
+            return [script if arg == '{script}' else arg for arg in self.command]
+        return self.command + [script]
+
+    async def run(self, script):
+        args = self.args(script)
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=self.cwd)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            process.kill()
+            await process.wait()
+            if isinstance(error, asyncio.CancelledError):
+                raise
+            raise Exception('{0} timed out after {1} s !!'.format(script, self.timeout))
+        if process.returncode != 0:
+            raise Exception('{0} exited with code {1}: {2} !!'.format(
+                script, process.returncode, stderr.decode(errors='replace').strip()[-500:]))
+        return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+
+# ----------------------------------------------------------------------------
+# class FakeExecutor([delay], [check])
+#
+# Description :
+# -------------
+# Stand-in for the solver, to try a pipeline without HFSS: waits delay
+# seconds per script and, with check, runs the script through the VBScript
+# interpreter (see runScript), failing the job if it reports errors.
+#
+# Returns :
+# ---------
+# run() returns the interpreter Report of the script (None without check).
+# The scripts run are listed in the attribute scripts.
+# ----------------------------------------------------------------------------
+class FakeExecutor(object):
+    def __init__(self, delay=0.0, check=True):
+        self.delay = delay
+        self.check = check
+        self.scripts = []
+
+    async def run(self, script):
+        self.scripts.append(script)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if not self.check:
+            return None
+        report = await asyncio.get_running_loop().run_in_executor(None, runFile, script)
+        if report.errors:
+            raise Exception('{0}: {1} !!'.format(script, report.errors[0]))
+        return report
+
+
+# ----------------------------------------------------------------------------
+# function solveSweep(builderFn, paramGrid, outDir, executor, [concurrency],
+#                     [workers])
+#
+# Description :
+# -------------
+# Coroutine generating the scripts of a parametric sweep (see
+# generateSweep) and submitting each one to the executor as soon as it is
+# written, so that solving starts with the first variant instead of after
+# the whole batch.
+#
+# Returns :
+# ---------
+# A dictionary mapping each tuple of parameter values to its Job.
+#
+# Example :
+# ---------
+# jobs = asyncio.run(solveSweep(buildDipole, {'Length': [40, 45, 50]}, 'sweep',
+#                               SubprocessExecutor(), concurrency=2))
+# ----------------------------------------------------------------------------
+async def solveSweep(builderFn, paramGrid, outDir, executor, concurrency=1, workers=None):
+    jobs = {}
+
+    def onScript(values, path):
+        jobs[values] = queue.submitThreadsafe(path)
+
+    async with SubmissionQueue(executor, concurrency) as queue:
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: generateSweep(builderFn, paramGrid, outDir, workers, onScript))
+    return jobs
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# @File    : sweep.py
+# @Software: PyCharm
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from .general import hfssInsertDesign, hfssNewProject
+from .scriptwriter import ScriptWriter
+
+
+# ----------------------------------------------------------------------------
+# function generateSweep(builderFn, paramGrid, outDir, [workers], [onScript])
+#
+# Description :
+# -------------
+# Generates one VB script per point of a parametric grid. The points are
+# spread over a pool of worker processes, each of which builds and writes
+# its variants on its own.
+#
+# Parameters :
+# ------------
+# builderFn - function called as builderFn(fid, **params) that writes one
+#             complete script. It must be defined at module level so that
+#             it can be sent to the worker processes.
+# paramGrid - dictionary mapping each parameter name to the list of its
+#             values; every combination of values is generated.
+# outDir    - directory where the scripts (variant_00001.vbs, ...) and the
+#             manifest (manifest.json) are written.
+# workers   - (Optional) number of worker processes (default: one per
+#             CPU). With workers=1 the variants are built in this process.
+# onScript  - (Optional) function called as onScript(values, path) as soon
+#             as each script has been written, e.g. to hand it over to a
+#             SubmissionQueue while the other variants are still built.
+#
+# Returns :
+# ---------
+# A dictionary mapping each tuple of parameter values (in the order of
+# paramGrid) to the path of its script.
+#
+# Example :
+# ---------
+# def buildDipole(fid, Length, gapLen):
+#     hfssNewProject(fid)
+#     hfssInsertDesign(fid, 'Dipole')
+#     hfssDipole(fid, 'Dip', 'Z', [0, 0, 0], Length, 0.5, gapLen, 'mm')
+#
+# manifest = generateSweep(buildDipole, {'Length': [40, 45, 50],
+#                                        'gapLen': [0.2, 0.5]}, 'sweep')
+# ----------------------------------------------------------------------------
+def generateSweep(builderFn, paramGrid, outDir, workers=None, onScript=None):
+    Names = list(paramGrid)
+    Points = list(product(*[paramGrid[Name] for Name in Names]))
+    Paths = [os.path.join(outDir, 'variant_{0:05d}.vbs'.format(i + 1))
+             for i in range(len(Points))]
+    if not os.path.isdir(outDir):
+        os.makedirs(outDir)
+
+    jobs = [(builderFn, dict(zip(Names, Point)), Path) for Point, Path in zip(Points, Paths)]
+    _runJobs(_buildVariant, jobs, workers,
+             None if onScript is None else lambda i: onScript(Points[i], Paths[i]))
+
+    with open(os.path.join(outDir, 'manifest.json'), 'w') as fid:
+        json.dump({'parameters': Names,
+                   'variants': [{'values': list(Point), 'path': os.path.basename(Path)}
+                                for Point, Path in zip(Points, Paths)]},
+                  fid, indent=1)
+    return dict(zip(Points, Paths))
+
+
+# ----------------------------------------------------------------------------
+# function generateBatch(geometryFn, paramGrid, outDir, [designsPerProject],
+#                        [designPrefix], [designType], [workers], [onScript])
+#
+# Description :
+# -------------
+# Same as generateSweep, but packs many variants into one project: each
+# script starts HFSS and creates the project once (hfssNewProject), then
+# inserts one design per variant (hfssInsertDesign) followed by its
+# geometry. A batch of 500 variants thus pays the desktop start-up and the
+# project creation 500 / designsPerProject times instead of 500 times.
+#
+# Parameters :
+# ------------
+# geometryFn        - function called as geometryFn(fid, **params) that
+#                     writes the contents of one design (geometry,
+#                     variables, setups, ...) into the active design. It
+#                     must not create the project or the design itself.
+# paramGrid         - dictionary mapping each parameter name to the list of
+#                     its values; every combination of values is generated.
+# outDir            - directory where the scripts (project_00001.vbs, ...)
+#                     and the manifest (manifest.json) are written.
+# designsPerProject - (Optional) number of designs per project (default 50).
+# designPrefix      - (Optional) prefix of the generated design names
+#                     (default 'Variant', giving Variant_00001, ...).
+# designType        - (Optional) type of the designs, see hfssInsertDesign
+#                     (default 'driven modal').
+# workers           - (Optional) number of worker processes (default: one
+#                     per CPU).
+# onScript          - (Optional) function called as onScript(designNames,
+#                     path) as soon as each project script is written.
+#
+# Returns :
+# ---------
+# A dictionary mapping each design name to the dictionary of its parameter
+# values, so that results can be traced back to their variant. The
+# manifest also records the script holding each design.
+#
+# Example :
+# ---------
+# def dipoleGeometry(fid, Length, gapLen):
+#     hfssDipole(fid, 'Dip', 'Z', [0, 0, 0], Length, 0.5, gapLen, 'mm')
+#
+# designs = generateBatch(dipoleGeometry, {'Length': [40, 45, 50],
+#                                          'gapLen': [0.2, 0.5]}, 'batch',
+#                         designsPerProject=3)
+# ----------------------------------------------------------------------------
+def generateBatch(geometryFn, paramGrid, outDir, designsPerProject=50, designPrefix='Variant',
+                  designType='driven modal', workers=None, onScript=None):
+    if designsPerProject < 1:
+        raise Exception('designsPerProject must be at least 1 !!')
+    Names = list(paramGrid)
+    Designs = [('{0}_{1:05d}'.format(designPrefix, i + 1), dict(zip(Names, Point)))
+               for i, Point in enumerate(product(*[paramGrid[Name] for Name in Names]))]
+    Projects = [Designs[i:i + designsPerProject]
+                for i in range(0, len(Designs), designsPerProject)]
+    Paths = [os.path.join(outDir, 'project_{0:05d}.vbs'.format(i + 1))
+             for i in range(len(Projects))]
+    if not os.path.isdir(outDir):
+        os.makedirs(outDir)
+
+    jobs = [(geometryFn, designType, Project, Path) for Project, Path in zip(Projects, Paths)]
+    _runJobs(_buildProject, jobs, workers,
+             None if onScript is None else
+             lambda i: onScript([designName for designName, _ in Projects[i]], Paths[i]))
+
+    with open(os.path.join(outDir, 'manifest.json'), 'w') as fid:
+        json.dump({'parameters': Names,
+                   'designs': [{'design': designName, 'values': [params[Name] for Name in Names],
+                                'path': os.path.basename(Path)}
+                               for Project, Path in zip(Projects, Paths)
+                               for designName, params in Project]},
+                  fid, indent=1)
+    return dict(Designs)
+
+
+# Runs function(job) for every job, in this process or spread over a pool
+# of workers, calling onDone(index) after each job in order.
+def _runJobs(function, jobs, workers, onDone):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        for i, job in enumerate(jobs):
+            function(job)
+            if onDone is not None:
+                onDone(i)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunkSize = max(1, len(jobs) // (4 * workers))
+            for i, _ in enumerate(pool.map(function, jobs, chunksize=chunkSize)):
+                if onDone is not None:
+                    onDone(i)
+
+
+# Builds and writes a single variant (runs in the worker processes).
+def _buildVariant(job):
+    builderFn, params, Path = job
+    with ScriptWriter(Path) as fid:
+        builderFn(fid, **params)
+
+
+# Builds and writes a project of several designs (runs in the worker
+# processes).
+def _buildProject(job):
+    geometryFn, designType, Project, Path = job
+    with ScriptWriter(Path) as fid:
+        hfssNewProject(fid)
+        for designName, params in Project:
+            hfssInsertDesign(fid, designName, designType)
+            geometryFn(fid, **params)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+# @File    : symmetry.py
+# @Software: PyCharm
+
+from collections import Counter
+
+import numpy as np
+
+from . import modeler
+from .incremental import fingerprint
+from .model import PRIMITIVES, _renderAll
+from .scriptwriter import emit, profiled
+from .spatial import UNITS, _boxBounds, _cylinderBounds, _rectangleBounds
+
+# Kinds of nodes the symmetry analysis understands; any other node that
+# touches a part makes the model count as not symmetric.
+_SUPPORTED = PRIMITIVES + ('subtract', 'unite', 'delete')
+
+
+# ----------------------------------------------------------------------------
+# function hfssAssignSymmetry(fid, Name, Part, Position, Units, [PerfectE])
+#
+# Description :
+# -------------
+# Creates the VB Script necessary to assign a symmetry boundary to the face
+# of a part (usually the region box) found at a given position.
+#
+# Parameters :
+# ------------
+# fid      - file identifier of the HFSS script file.
+# Name     - name of the boundary.
+# Part     - name of the part owning the face.
+# Position - a point of the face ([x, y, z]).
+# Units    - units of Position.
+# PerfectE - (Optional) True for a Perfect E symmetry plane (tangential E
+#            is zero, default), False for a Perfect H one.
+#
+# Example :
+# ---------
+# hfssAssignSymmetry(fid, 'SymZ', 'Region', [20, 20, 0], 'mm');
+# ----------------------------------------------------------------------------
+@profiled
+def hfssAssignSymmetry(fid, Name, Part, Position, Units, PerfectE=True):
+    emit(fid, 'symmetry',
+         dict(Name=Name, Part=Part, Position=Position, Units=Units, PerfectE=PerfectE),
+         '\n'
+         'Set oModule = oDesign.GetModule("BoundarySetup")\n'
+         'oModule.AssignSymmetry _\n'
+         'Array("NAME:{0}", _\n'
+         '"Faces:=", Array(oEditor.GetFaceByPosition(Array("NAME:FaceParameters", _\n'
+         '"BodyName:=", "{1}", _\n'
+         '"XPosition:=", "{2}", _\n'
+         '"YPosition:=", "{3}", _\n'
+         '"ZPosition:=", "{4}"))), _\n'
+         '"IsPerfectE:=", {5})\n'
+         .format(Name, Part, modeler._dim(Position[0], Units), modeler._dim(Position[1], Units),
+                 modeler._dim(Position[2], Units), 'true' if PerfectE else 'false'))
+
+
+# ----------------------------------------------------------------------------
+# function findSymmetry(nodes, [Tol])
+#
+# Description :
+# -------------
+# Finds the coordinate planes through the origin (X=0, Y=0, Z=0) about
+# which the geometry recorded in a Model is mirror symmetric: every object
+# (a part with the parts subtracted from or united to it) must have a
+# mirror image, within Tol meters, in the same design.
+#
+# Returns :
+# ---------
+# The list of the axes normal to the symmetry planes (e.g. ['X', 'Y']).
+# Models with dimensions given as design variables, raw VB script or
+# commands other than primitives, Subtract, Unite and Delete have none.
+# ----------------------------------------------------------------------------
+def findSymmetry(nodes, Tol=1e-9):
+    objects = _objects(_expandArrays(nodes), Tol)
+    if not objects:
+        return []
+    return [Axis for a, Axis in enumerate('XYZ') if _isSymmetric(objects, a)]
+
+
+# ----------------------------------------------------------------------------
+# function applySymmetry(model, [CurrentAxis], [Boundaries], [Planes],
+#                        [Region], [Padding], [Units], [Tol])
+#
+# Description :
+# -------------
+# Cuts a mirror symmetric model down to its half (or quarter, or eighth):
+# for every symmetry plane found by findSymmetry, the objects lying on the
+# negative side are not emitted at all, the objects crossing the plane are
+# split by it (see hfssSplit), and the face of the region box on the plane
+# gets a symmetry boundary, so that HFSS only meshes and solves the
+# positive side.
+#
+# Parameters :
+# ------------
+# model       - the Model to rewrite (in place).
+# CurrentAxis - (Optional) direction of the exciting current (e.g. 'Z' for
+#               a Z directed dipole): the plane normal to it is a Perfect E
+#               symmetry plane, the planes containing it are Perfect H.
+# Boundaries  - (Optional) dictionary mapping an axis to 'E' or 'H', to
+#               choose the type of the symmetry planes explicitly.
+# Planes      - (Optional) axes of the planes that may be used (default
+#               'XYZ').
+# Region      - (Optional) name of an existing part enclosing the model
+#               (the air box) that gets the symmetry faces. By default a
+#               box 'SymmetryRegion' is added around the kept geometry.
+# Padding     - (Optional) distance (meters) between the geometry and the
+#               added region box (default: a quarter of the largest
+#               dimension of the model).
+# Units       - (Optional) units of the region box and of the face
+#               positions (default: the units of the first primitive).
+# Tol         - (Optional) tolerance of the symmetry (meters).
+#
+# Returns :
+# ---------
+# A dictionary mapping the axis of every symmetry plane used to its type
+# ('E' or 'H'); empty if the model is not symmetric.
+#
+# Note :
+# ------
+# The type of a plane depends on the excitation, not on the geometry, so
+# either CurrentAxis or Boundaries must cover every symmetry plane found.
+# Ports cut by a symmetry plane need their impedance multiplier set (2 for
+# Perfect H, 0.5 for Perfect E).
+#
+# Example :
+# ---------
+# model = Model()
+# hfssNewProject(model)
+# hfssInsertDesign(model, 'Dipole')
+# hfssDipole(model, 'Dip', 'Z', [0, 0, 0], 10, 0.5, 0.2, 'mm')
+# applySymmetry(model, CurrentAxis='Z')     # {'X': 'H', 'Y': 'H', 'Z': 'E'}
+# ----------------------------------------------------------------------------
+def applySymmetry(model, CurrentAxis=None, Boundaries=None, Planes='XYZ', Region=None,
+                  Padding=None, Units=None, Tol=1e-9):
+    nodes = _expandArrays(model.nodes)
+    objects = _objects(nodes, Tol)
+    if not objects:
+        return {}
+    axes = [a for a, Axis in enumerate('XYZ')
+            if Axis in Planes.upper() and _isSymmetric(objects, a)]
+    if not axes:
+        return {}
+
+    types = {}
+    for a in axes:
+        Axis = 'XYZ'[a]
+        if Boundaries and Axis in Boundaries:
+            types[Axis] = Boundaries[Axis].upper()
+        elif CurrentAxis is not None:
+            types[Axis] = 'E' if CurrentAxis.upper() == Axis else 'H'
+        else:
+            raise Exception('The type of the symmetry plane normal to {0} is unknown; '
+                            'give CurrentAxis or Boundaries !!'.format(Axis))
+    if Units is None:
+        Units = next(node.params['Units'] for node in nodes if node.kind in PRIMITIVES)
+
+    dropped = set()
+    crossing = {}   # design -> axis -> parts to split
+    last = {}       # design -> index of its last geometry node
+    for entry in objects:
+        lo, hi = entry['lo'], entry['hi']
+        last[entry['design']] = max([last.get(entry['design'], -1)] + entry['nodes'])
+        if any(hi[a] < Tol and lo[a] < -Tol for a in axes):
+            dropped.update(entry['nodes'])
+            continue
+        for a in axes:
+            if lo[a] < -Tol < Tol < hi[a]:
+                crossing.setdefault(entry['design'], {}).setdefault(a, []).extend(entry['parts'])
+
+    extra = {}
+    for design, index in last.items():
+        kept = [entry for entry in objects
+                if entry['design'] == design and not dropped.intersection(entry['nodes'])]
+        extra[index] = _closing(design, kept, crossing.get(design, {}), axes, types, Region,
+                                Padding, Units)
+
+    result = []
+    for index, node in enumerate(nodes):
+        if index not in dropped:
+            result.append(node)
+        result.extend(extra.get(index, []))
+    model.nodes = result
+    return types
+
+
+# The Splits, the region box and the symmetry boundaries closing the
+# geometry of a design.
+def _closing(design, kept, crossing, axes, types, Region, Padding, Units):
+    nodes = []
+    for a in axes:
+        if crossing.get(a):
+            nodes += _renderAll(modeler.hfssSplit, crossing[a], 'XYZ'[a])
+
+    lo = np.min([entry['lo'] for entry in kept], axis=0)
+    hi = np.max([entry['hi'] for entry in kept], axis=0)
+    if Region is None:
+        if Padding is None:
+            Padding = float(np.max(hi - lo)) / 4
+        lo, hi = lo - Padding, hi + Padding
+        for a in axes:
+            lo[a] = 0.0
+        Region = 'SymmetryRegion'
+        nodes += _renderAll(modeler.hfssBox, Region, _inUnits(lo, Units),
+                            _inUnits(hi - lo, Units), Units)
+    else:
+        region = [entry for entry in kept if Region in entry['parts']]
+        if not region:
+            raise Exception('Part {0} not found in design {1} !!'.format(Region, design))
+        lo, hi = region[0]['lo'].copy(), region[0]['hi'].copy()
+        for a in axes:
+            lo[a] = max(lo[a], 0.0)
+
+    for a in axes:
+        Position = (lo + hi) / 2
+        Position[a] = 0.0
+        nodes += _renderAll(hfssAssignSymmetry, 'Sym' + 'XYZ'[a], Region,
+                            _inUnits(Position, Units), Units, types['XYZ'[a]] == 'E')
+    return nodes
+
+
+def _inUnits(values, Units):
+    return [float('{0:.6g}'.format(value / UNITS[Units])) for value in values]
+
+
+# Objects of the model (see incremental.fingerprint) with their symmetry
+# signature and bounding box, or None if the model cannot be analysed.
+def _objects(nodes, Tol):
+    for node in nodes:
+        if node.kind is None and node.text.strip():
+            return None
+    objects = []
+    for entry in fingerprint(nodes)[0].values():
+        # The command consuming each part that does not survive, so that a
+        # cylinder subtracted from a box does not mirror one united to it.
+        consumedBy = {}
+        for index in entry['nodes']:
+            node = nodes[index]
+            if node.kind not in _SUPPORTED:
+                return None
+            if node.kind == 'subtract' and node.params['Clone'] != 'true':
+                consumedBy.update(dict.fromkeys(node.params['toolParts'], 'subtract'))
+            elif node.kind == 'unite' and node.params['Clone'] != 'true':
+                consumedBy.update(dict.fromkeys(node.params['Parts'][1:], 'unite'))
+            elif node.kind == 'delete':
+                consumedBy.update(dict.fromkeys(node.params['Parts'], 'delete'))
+
+        kept, consumed, solid = [], [], []
+        for index in entry['nodes']:
+            node = nodes[index]
+            if node.kind in PRIMITIVES:
+                try:
+                    signature = _signature(node, Tol)
+                except (KeyError, TypeError, ValueError):
+                    return None
+                Name = node.params['Name']
+                if Name in entry['parts']:
+                    kept.append(signature)
+                    solid.append(signature)
+                else:
+                    consumed.append((consumedBy.get(Name, 'delete'), signature))
+                    if consumedBy.get(Name) == 'unite':
+                        solid.append(signature)
+        if not kept:
+            continue
+        # United parts add to the object; subtracted ones only remove from it.
+        lo = np.min([np.array(signature[3]) * Tol for signature in solid], axis=0)
+        hi = np.max([np.array(signature[4]) * Tol for signature in solid], axis=0)
+        objects.append(dict(entry, kept=kept, consumed=consumed, lo=lo, hi=hi))
+    return objects
+
+
+# (kind, axis, radius, lo, hi) of a primitive, lengths in multiples of Tol.
+def _signature(node, Tol):
+    params = node.params
+    if node.kind == 'cylinder':
+        lo, hi = _cylinderBounds(params['Axis'], params['Center'], params['Radius'],
+                                 params['Height'], params['Units'])
+        Axis = params['Axis'].upper()
+        Radius = float(params['Radius']) * UNITS[params['Units']]
+    elif node.kind == 'box':
+        lo, hi = _boxBounds(params['Start'], params['Size'], params['Units'])
+        Axis, Radius = '', 0.0
+    else:
+        lo, hi = _rectangleBounds(params['Axis'], params['Start'], params['Width'],
+                                  params['Height'], params['Units'])
+        Axis, Radius = params['Axis'].upper(), 0.0
+    return (node.kind, Axis, int(round(Radius / Tol)),
+            tuple(int(round(v / Tol)) for v in lo), tuple(int(round(v / Tol)) for v in hi))
+
+
+def _mirror(signature, a):
+    lo, hi = list(signature[3]), list(signature[4])
+    lo[a], hi[a] = -hi[a], -lo[a]
+    return signature[:3] + (tuple(lo), tuple(hi))
+
+
+def _isSymmetric(objects, a):
+    def key(entry, mirror):
+        kept, consumed = entry['kept'], entry['consumed']
+        if mirror:
+            kept = [_mirror(signature, a) for signature in kept]
+            consumed = [(command, _mirror(signature, a)) for command, signature in consumed]
+        return entry['design'], tuple(sorted(kept)), tuple(sorted(consumed))
+    return Counter(key(entry, False) for entry in objects) == \
+        Counter(key(entry, True) for entry in objects)
+
+
+# The nodes with every *Array node replaced by one node per element, so
+# that each element can be kept or dropped on its own.
+def _expandArrays(nodes):
+    result = []
+    for node in nodes:
+        params = node.params
+        if node.kind == 'cylinderarray':
+            N = len(params['Names'])
+            Radii = np.broadcast_to(params['Radii'], (N,))
+            Heights = np.broadcast_to(params['Heights'], (N,))
+            for i, Name in enumerate(params['Names']):
+                result += _renderAll(modeler.hfssCylinder, Name, str(params['Axis'][i]),
+                                     list(params['Centers'][i]), Radii[i], Heights[i],
+                                     params['Units'])
+        elif node.kind == 'boxarray':
+            N = len(params['Names'])
+            Sizes = np.broadcast_to(params['Sizes'], (N, 3))
+            for i, Name in enumerate(params['Names']):
+                result += _renderAll(modeler.hfssBox, Name, list(params['Starts'][i]),
+                                     list(Sizes[i]), params['Units'])
+        elif node.kind == 'rectanglearray':
+            N = len(params['Names'])
+            Widths = np.broadcast_to(params['Widths'], (N,))
+            Heights = np.broadcast_to(params['Heights'], (N,))
+            for i, Name in enumerate(params['Names']):
+                result += _renderAll(modeler.hfssRectangle, Name, str(params['Axis'][i]),
+                                     list(params['Starts'][i]), Widths[i], Heights[i],
+                                     params['Units'])
+        else:
+            result.append(node)
+    return result
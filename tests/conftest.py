@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# @File    : conftest.py
+# @Software: PyCharm
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hfss import general
+from hfss.scriptwriter import ScriptWriter
+from hfss.spatial import ObjectRegistry
+
+
+# Factory of ScriptWriters holding a new project with one design, whose
+# parts are tracked by an ObjectRegistry (fid.registry).
+@pytest.fixture
+def newScript():
+    def newScript(**options):
+        registry = ObjectRegistry()
+        fid = ScriptWriter(observers=[registry.record], **options)
+        fid.registry = registry
+        general.hfssNewProject(fid)
+        general.hfssInsertDesign(fid, 'Design1')
+        return fid
+    return newScript
+
+
+@pytest.fixture
+def fid(newScript):
+    return newScript()
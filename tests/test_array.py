@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# @File    : test_array.py
+# @Software: PyCharm
+
+import io
+
+import numpy as np
+import pytest
+
+from hfss import modeler
+from hfss.interpreter import runScript
+
+
+def dipole(fid, Name, Position):
+    modeler.hfssDipole(fid, Name, 'Z', Position, 10, 0.5, 0.2, 'mm')
+
+
+def lattice(nx, ny, step=15):
+    ix, iy = np.meshgrid(np.arange(nx), np.arange(ny))
+    return np.column_stack([ix.ravel(), iy.ravel(), np.zeros(nx * ny)]) * step
+
+
+# Parts created by the script, which must be the ones the registry tracks.
+def parts(fid):
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    names = set(key.split('/', 1)[1] for key in report.objects)
+    assert names == set(fid.registry.boxes)
+    return names
+
+
+def bounds(fid):
+    return sorted(tuple(np.round(np.concatenate(entry[:2]) * 1e9).astype(np.int64))
+                  for entry in fid.registry.boxes.values())
+
+
+@pytest.mark.parametrize('Positions', [
+    lattice(4, 3),
+    lattice(1, 5),
+    lattice(5, 1),
+    np.array([[0, 0, 0], [0, 15, 0], [0, 30, 0], [50, 7, 0], [80, 7, 0], [90, 7, 0]]),
+])
+def test_array_builds_the_explicit_parts(newScript, Positions):
+    explicit, duplicated = newScript(), newScript()
+    for i, Position in enumerate(Positions):
+        dipole(explicit, 'Dip_' + str(i + 1), Position)
+    modeler.hfssArray(duplicated, dipole, 'Dip', Positions, 'mm')
+
+    assert len(parts(explicit)) == len(parts(duplicated)) == 2 * len(Positions)
+    assert bounds(explicit) == bounds(duplicated)
+
+
+def test_lattice_is_two_duplications():
+    fid = io.StringIO()
+    modeler.hfssArray(fid, dipole, 'Dip', lattice(4, 3), 'mm')
+    assert fid.getvalue().count('oEditor.DuplicateAlongLine') == 2
+    assert fid.getvalue().count('oEditor.CreateCylinder') == 2
+
+
+def test_column_is_one_duplication():
+    fid = io.StringIO()
+    modeler.hfssArray(fid, dipole, 'Dip', lattice(1, 6), 'mm')
+    assert fid.getvalue().count('oEditor.DuplicateAlongLine') == 1
+
+
+def test_clone_names_skip_taken_names():
+    assert modeler._cloneNames(['P'], 3) == ['P_1', 'P_2']
+    assert modeler._cloneNames(['P', 'P_1'], 3, {'P', 'P_1', 'P_2'}) == \
+        ['P_3', 'P_4', 'P_1_1', 'P_1_2']
+
+
+def test_duplicate_returns_clone_names():
+    fid = io.StringIO()
+    assert modeler.hfssDuplicateAlongLine(fid, ['A', 'B'], [1, 0, 0], 3, 'mm', {'A_1'}) == \
+        ['A_2', 'A_3', 'B_1', 'B_2']
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# @File    : test_benchmarks.py
+# @Software: PyCharm
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks')
+
+
+def bench(*args):
+    return subprocess.run([sys.executable, os.path.join(BENCHMARKS, args[0])] + list(args[1:]),
+                          capture_output=True, text=True, timeout=300)
+
+
+# Every benchmark runs (and validates its output) at a small size.
+@pytest.mark.parametrize('args', [
+    ['bench_array.py', '3'],
+    ['bench_booleans.py', '50'],
+    ['bench_emitters.py', '100'],
+    ['bench_import.py', '1'],
+    ['bench_results.py', '1', '2', '2', '1'],
+    ['bench_scriptwriter.py', '100'],
+    ['bench_store.py', '100'],
+    ['bench_stream.py', '100'],
+    ['bench_submission.py', '4', '0.01', '2'],
+    ['bench_sweep.py', '4'],
+])
+def test_benchmark_runs(args):
+    result = bench(*args)
+    assert result.returncode == 0, result.stderr
+
+
+def test_suite_flags_regressions(tmp_path):
+    old = str(tmp_path / 'old.json')
+    result = bench('suite.py', '--quick', '--repeat', '1', '--filter', 'project_10',
+                   '--output', old)
+    assert result.returncode == 0, result.stderr
+    with open(old) as source:
+        data = json.load(source)
+    assert list(data['results']) == ['project_10']
+    assert set(data['results']['project_10']) == {'seconds', 'bytes', 'peakBytes'}
+
+    assert bench('suite.py', '--compare', old, old).returncode == 0
+    data['results']['project_10']['seconds'] *= 1.2
+    slower = str(tmp_path / 'slower.json')
+    with open(slower, 'w') as target:
+        json.dump(data, target)
+    assert bench('suite.py', '--compare', old, slower).returncode == 0
+    assert bench('suite.py', '--compare', old, slower, '--time-threshold', '0.1').returncode == 1
+    data['results']['project_10']['bytes'] *= 2
+    new = str(tmp_path / 'new.json')
+    with open(new, 'w') as target:
+        json.dump(data, target)
+    result = bench('suite.py', '--compare', old, new)
+    assert result.returncode == 1
+    assert 'regression' in result.stdout
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# @File    : test_booleans.py
+# @Software: PyCharm
+
+import io
+
+import pytest
+
+from hfss import booleans, modeler
+from hfss.interpreter import runScript
+
+
+def script(function, *args, **kwargs):
+    fid = io.StringIO()
+    function(fid, *args, **kwargs)
+    return fid.getvalue()
+
+
+def test_long_unite_is_chunked_into_the_first_part(fid):
+    Names = ['Via' + str(i) for i in range(10)]
+    for i, Name in enumerate(Names):
+        modeler.hfssCylinder(fid, Name, 'Z', [i, 0, 0], 0.2, 1, 'mm')
+    booleans.hfssUnite(fid, Names, ChunkSize=4)
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    assert report.commands['unite'] == 3
+    assert sorted(report.objects) == ['Design1/Via0']
+
+
+def test_long_subtract_is_chunked(fid):
+    modeler.hfssBox(fid, 'Plate', [0, 0, 0], [10, 10, 1], 'mm')
+    Holes = ['Hole' + str(i) for i in range(5)]
+    for i, Name in enumerate(Holes):
+        modeler.hfssCylinder(fid, Name, 'Z', [i + 1, 5, 0], 0.2, 1, 'mm')
+    booleans.hfssSubtract(fid, 'Plate', Holes, ChunkSize=2)
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    assert report.commands['subtract'] == 3
+    assert sorted(report.objects) == ['Design1/Plate']
+
+
+@pytest.mark.parametrize('function', [booleans.hfssUnite, booleans.hfssIntersect])
+def test_single_part_writes_nothing(function):
+    assert script(function, ['Patch']) == ''
+    assert script(function, 'Patch') == ''
+
+
+@pytest.mark.parametrize('function', [booleans.hfssUnite, booleans.hfssIntersect])
+def test_no_parts(function):
+    with pytest.raises(Exception, match='No parts'):
+        script(function, [])
+
+
+def test_subtract_without_tools_writes_nothing(fid):
+    booleans.hfssSubtract(fid, 'FR4', [])
+    booleans.hfssSubtract(fid, ['FR4'], [], ChunkSize=10)
+    assert 'Subtract' not in fid.getvalue()
+    with pytest.raises(Exception, match='No blank parts'):
+        booleans.hfssSubtract(fid, [], ['Hole'])
+
+
+@pytest.mark.parametrize('ChunkSize', [0, -3, 1])
+def test_combine_chunk_size_is_checked(ChunkSize):
+    with pytest.raises(Exception, match='at least two parts'):
+        script(booleans.hfssUnite, ['A', 'B', 'C'], ChunkSize=ChunkSize)
+
+
+@pytest.mark.parametrize('ChunkSize', [0, -1])
+def test_subtract_chunk_size_is_checked(ChunkSize):
+    with pytest.raises(Exception, match='ChunkSize must be at least 1'):
+        script(booleans.hfssSubtract, 'Plate', ['A', 'B'], ChunkSize=ChunkSize)
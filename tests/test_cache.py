@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# @File    : test_cache.py
+# @Software: PyCharm
+
+import io
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from hfss import cache, modeler
+from hfss.cache import ScriptCache
+
+
+def dipole(fid, Length):
+    modeler.hfssDipole(fid, 'Dip', 'Z', [0, 0, 0], Length, 0.5, 0.2, 'mm')
+
+
+def test_hit_replays_the_same_text(tmp_path):
+    scripts = ScriptCache(str(tmp_path))
+    first, second, direct = io.StringIO(), io.StringIO(), io.StringIO()
+    scripts.call(dipole, first, 48)
+    scripts.call(dipole, second, 48)
+    dipole(direct, 48)
+    assert first.getvalue() == second.getvalue() == direct.getvalue()
+    assert (scripts.hits, scripts.misses) == (1, 1)
+
+    # A new cache on the same directory finds the entry on disk.
+    again = ScriptCache(str(tmp_path))
+    again.call(dipole, io.StringIO(), 48)
+    assert again.hits == 1
+
+
+def test_argument_types_are_part_of_the_key(tmp_path):
+    scripts = ScriptCache(str(tmp_path))
+    assert scripts.key(dipole, (1,), {}) != scripts.key(dipole, (1.0,), {})
+    assert (scripts.key(dipole, (np.arange(3),), {}) !=
+            scripts.key(dipole, (np.arange(3.0),), {}))
+    with pytest.raises(TypeError):
+        scripts.key(dipole, (lambda: 48,), {})
+
+
+def test_object_arrays_are_keyed_by_their_values(tmp_path):
+    scripts = ScriptCache(str(tmp_path))
+    texts = []
+    for i in range(4):
+        # Computed values: new objects, whose memory the next ones may reuse.
+        Starts = np.array([[i + 0.5, 0, 0], [i + 0.5, 2, 'z0']], dtype=object)
+        fid, direct = io.StringIO(), io.StringIO()
+        scripts.call(modeler.hfssBoxArray, fid, ['A', 'B'], Starts, [1, 1, 1], 'mm')
+        modeler.hfssBoxArray(direct, ['A', 'B'], Starts, [1, 1, 1], 'mm')
+        assert fid.getvalue() == direct.getvalue()
+        texts.append(fid.getvalue())
+    assert len(set(texts)) == 4
+    assert scripts.hits == 0
+
+    # Equal arrays built separately share their entry.
+    x = float('0.5')
+    Starts = np.array([[x, 0, 0], [x, 2, 'z0']], dtype=object)
+    scripts.call(modeler.hfssBoxArray, io.StringIO(), ['A', 'B'], Starts, [1, 1, 1], 'mm')
+    assert scripts.hits == 1
+
+
+def test_editing_any_package_module_invalidates(tmp_path, monkeypatch):
+    package = tmp_path / 'hfss'
+    shutil.copytree(cache._PACKAGE, str(package),
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    monkeypatch.setattr(cache, '_PACKAGE', str(package))
+    scripts = ScriptCache(str(tmp_path / 'cache'))
+    before = scripts.key(dipole, (48,), {})
+
+    with open(str(package / 'booleans.py'), 'a') as source:
+        source.write('\n# edited\n')
+    cache._fileDigest.cache_clear()
+    cache._packageDigest.cache_clear()
+    assert scripts.key(dipole, (48,), {}) != before
+
+
+def test_size_cap_evicts_oldest(tmp_path):
+    scripts = ScriptCache(str(tmp_path), maxBytes=3000)
+    for Length in range(10):
+        scripts.call(dipole, io.StringIO(), Length)
+    assert scripts.evictions > 0
+    assert scripts.stats()['bytes'] <= 3000
+    assert len(os.listdir(str(tmp_path))) == scripts.stats()['entries']
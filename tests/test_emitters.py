@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# @File    : test_emitters.py
+# @Software: PyCharm
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from hfss import booleans, general, modeler
+from hfss.emitters import CompactEmitter, PythonEmitter
+from hfss.interpreter import Interpreter, compareScripts, runScript
+from hfss.scriptwriter import ScriptWriter
+
+EDITOR = ('createcylinder', 'createbox', 'createrectangle', 'subtract', 'unite', 'intersect',
+          'delete', 'duplicatealongline', 'duplicatearoundaxis', 'split')
+
+
+def board(fid):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'PCB')
+    general.hfssDefineVariable(fid, 'h', 1.6, 'mm')
+    modeler.hfssBox(fid, 'FR4', [0, 0, 0], [40, 40, 'h'], 'mm', [5, 5, 0], 0.4, 'Z',
+                    [35, 35, 0], 0.4, 'Z')
+    ix, iy = np.meshgrid(np.arange(4), np.arange(4))
+    Centers = np.column_stack([ix.ravel() * 8 + 4, iy.ravel() * 8 + 4, np.zeros(16)])
+    modeler.hfssCylinderArray(fid, 'Via', 'Z', Centers, 0.2, 'h', 'mm')
+    modeler.hfssRectangleArray(fid, 'Pad', 'Z', Centers + [-1, -1, 1.6], 2, 2, 'mm')
+    modeler.hfssBoxArray(fid, 'Cap', Centers[:4] + [0, 0, 2], [1, 1, 0.5], 'mm')
+    modeler.hfssDipole(fid, 'Dip', 'Y', [20, 20, 10], 10, 0.5, 0.2, 'mm', 's', 'Z')
+    booleans.hfssUnite(fid, ['Pad1', 'Pad2', 'Pad3'])
+    modeler.hfssDuplicateAroundAxis(fid, ['Cap1'], 'Z', 90, 4)
+    general.hfssInsertSolution(fid, 'Setup1', 5)
+    general.hfssAnalyze(fid, 'Setup1')
+
+
+def script(emitter=None):
+    fid = ScriptWriter(emitter=emitter)
+    board(fid)
+    fid.close()
+    return fid.getvalue()
+
+
+def test_compact_script_builds_the_same_model():
+    verbose, compact = script(), script(CompactEmitter())
+    assert compareScripts(verbose, compact) == []
+    assert compact.count('Sub MkCyl') == 1
+    assert 'MkCyl "Via16", "28.0mm", "28.0mm", "0.0mm", "0.2mm", "h", "Z"' in compact
+    assert len(compact) < len(verbose) / 2
+    assert runScript(compact).errors == []
+
+
+def test_compact_is_compared_call_by_call():
+    verbose = script()
+    compact = script(CompactEmitter())
+    changed = compact.replace('"Via7", "20.0mm"', '"Via7", "21.0mm"')
+    assert changed != compact
+    assert compareScripts(verbose, changed)
+
+
+# Stand-in for the objects of the HFSS scripting interface: every method
+# call made on them is recorded as (method, args) and returns another one.
+class Recorder(object):
+    def __init__(self, calls):
+        self._calls = calls
+
+    def __getattr__(self, method):
+        def call(*args):
+            self._calls.append((method.lower(), list(args)))
+            return Recorder(self._calls)
+        return call
+
+
+def test_python_script_makes_the_same_editor_calls(monkeypatch):
+    calls = []
+    scriptEnv = types.ModuleType('ScriptEnv')
+    scriptEnv.Initialize = lambda name: None
+    monkeypatch.setitem(sys.modules, 'ScriptEnv', scriptEnv)
+    exec(compile(script(PythonEmitter()), 'board.py', 'exec'), {'oDesktop': Recorder(calls)})
+
+    trace = Interpreter(trace=True).run(script()).trace
+    assert [call for call in calls if call[0] in EDITOR] == \
+        [call for call in trace if call[0] in EDITOR]
+    assert ('analyze', ['Setup1']) in calls
+
+
+def test_python_primitives_become_loops():
+    text = script(PythonEmitter())
+    assert text.count('def attributes') == 1
+    assert text.count('oEditor.CreateCylinder(') == 2     # box holes, then the vias
+    assert text.count('oEditor.CreateRectangle(') == 2    # pads, then the dipole strips
+
+
+def test_python_rejects_raw_vb_script():
+    fid = ScriptWriter(emitter=PythonEmitter())
+    with pytest.raises(Exception):
+        fid.write('oEditor.Delete Array("NAME:Selections", "Selections:=", "Via1")\n')
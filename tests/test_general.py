@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# @File    : test_general.py
+# @Software: PyCharm
+
+import os
+
+import pytest
+
+from hfss import general, modeler
+from hfss.emitters import PythonEmitter
+from hfss.interpreter import runScript
+
+
+def solvedDesign(fid, HPC=None):
+    general.hfssInsertSolution(fid, 'Setup1', 10, maxPass=12)
+    general.hfssInterpolatingSweep(fid, 'Sweep1', 'Setup1', 8, 12, 401)
+    general.hfssFastSweep(fid, 'Sweep2', 'Setup1', 8, 12)
+    general.hfssAnalyze(fid, 'Setup1', HPC)
+
+
+def test_setup_sweeps_and_analysis_run(fid):
+    solvedDesign(fid)
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    assert report.commands['insertsetup'] == 1
+    assert report.commands['insertfrequencysweep'] == 2
+    assert report.commands['analyze'] == 1
+
+
+def test_analysis_needs_its_setup(fid):
+    general.hfssAnalyze(fid, 'Setup1')
+    assert runScript(fid.getvalue()).errors
+
+
+def test_hpc_is_written_by_the_script(fid, tmp_path):
+    path = str(tmp_path / 'hpc' / 'array.acf')
+    HPC = general.hfssSetHPC(fid, path, 16, 4, ['frequencies', 'domains'], 80,
+                             ['node1', 'node2'])
+    assert HPC == 'array'
+    assert not os.path.exists(path)
+
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    acf = report.files[path.replace('\\', '/')]
+    assert acf.count("MachineName='node") == 2
+    assert "Name='array'" in acf and 'Cores=16' in acf and 'NumEngines=4' in acf
+    assert 'Frequencies=true' in acf and 'DomainSolver=true' in acf
+    assert 'Variations=false' in acf
+
+
+def test_hpc_is_only_active_while_its_design_is_solved(fid):
+    HPC = general.hfssSetHPC(fid, 'C:/hpc/array.acf', 8)
+    solvedDesign(fid, HPC)
+    text = fid.getvalue()
+    assert text.index('"Desktop/ActiveDSOConfigurations/HFSS", "array"') < \
+        text.index('oDesign.Analyze') < text.rindex('SetRegistryString')
+    report = runScript(text)
+    assert report.errors == []
+    assert report.commands['setregistrystring'] == 2
+
+
+def test_unknown_distribution(fid):
+    with pytest.raises(Exception):
+        general.hfssSetHPC(fid, 'C:/hpc/array.acf', 8, Distribute='cores')
+
+
+def test_python_backend(newScript):
+    fid = newScript(emitter=PythonEmitter())
+    solvedDesign(fid, general.hfssSetHPC(fid, 'C:/hpc/array.acf', 8))
+    fid.close()
+    compile(fid.getvalue(), 'script.py', 'exec')
+
+
+def test_design_variables_drive_the_geometry(fid):
+    general.hfssDefineVariable(fid, 'len', 48, 'mm')
+    general.hfssDefineVariable(fid, 'gap', '0.02*len')
+    general.hfssDefineVariable(fid, '$eps', 4.4)
+    modeler.hfssCylinder(fid, 'Arm1', 'Z', [0, 0, 'gap/2'], 0.5, '(len-gap)/2', 'mm')
+    modeler.hfssCylinder(fid, 'Arm2', 'Z', [0, 0, '-gap/2'], 0.5, '-(len-gap)/2', 'mm')
+    modeler.hfssBox(fid, 'Plate', ['-len', '-len', -10], ['2*len', '2*len', 1], 'mm')
+    general.hfssInsertSolution(fid, 'Setup1', 3)
+    general.hfssParametricSweep(fid, 'LenSweep', 'Setup1', [('len', 40, 56, 0.5)], 'mm')
+    general.hfssChangeVariable(fid, 'len', 52, 'mm')
+
+    text = fid.getvalue()
+    assert '"Value:=", "48mm"' in text and '"Value:=", "0.02*len"' in text
+    assert 'oProject.ChangeProperty' in text and '"ProjectVariables"' in text
+    assert '"Data:=", "LIN 40mm 56mm 0.5mm"' in text
+    assert '"ZCenter:=", "gap/2"' in text and '"Height:=", "(len-gap)/2"' in text
+    assert '"ZPosition:=", "-10mm"' in text and '"XSize:=", "2*len"' in text
+    report = runScript(text)
+    assert report.errors == []
+    assert set(report.objects) == {'Design1/Arm1', 'Design1/Arm2', 'Design1/Plate'}
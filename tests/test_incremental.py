@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# @File    : test_incremental.py
+# @Software: PyCharm
+
+import json
+
+from hfss import booleans, general, modeler
+from hfss.incremental import buildIncremental, fingerprint
+from hfss.interpreter import runScript
+from hfss.model import Model
+
+
+def board(vias, Thickness=1.6):
+    model = Model()
+    general.hfssNewProject(model)
+    general.hfssInsertDesign(model, 'PCB')
+    general.hfssDefineVariable(model, 'h', Thickness, 'mm')
+    modeler.hfssBox(model, 'FR4', [0, 0, 0], [50, 50, 1.6], 'mm', [5, 5, 0], 1, 'Z')
+    for Name, x in vias:
+        modeler.hfssCylinder(model, Name, 'Z', [x, 20, 0], 0.3, 1.6, 'mm')
+    return model
+
+
+def read(path):
+    with open(path) as script:
+        return script.read()
+
+
+def test_delta_brings_the_old_project_up_to_date(tmp_path):
+    path = str(tmp_path / 'board.vbs')
+    first = buildIncremental(board([('V1', 10), ('V2', 20), ('V3', 30)]), path)
+    assert first['full'] and first['delta'] is None
+    oldScript = read(path)
+
+    second = buildIncremental(board([('V1', 10), ('V2', 22), ('V4', 40)]), path)
+    assert (second['changed'], second['added'], second['removed'], second['full']) == \
+        (['PCB/V2'], ['PCB/V4'], ['PCB/V3'], False)
+    delta = read(second['delta'])
+    assert delta.count('oEditor.CreateCylinder') == 2
+    assert 'V1' not in delta and 'FR4' not in delta
+
+    updated, rebuilt = runScript(oldScript + delta), runScript(read(path))
+    assert updated.errors == rebuilt.errors == []
+    assert updated.objects == rebuilt.objects
+
+
+def test_unchanged_model_has_an_empty_delta(tmp_path):
+    path = str(tmp_path / 'board.vbs')
+    buildIncremental(board([('V1', 10)]), path)
+    report = buildIncremental(board([('V1', 10)]), path)
+    assert not (report['changed'] or report['added'] or report['removed'] or report['full'])
+    assert read(report['delta']) == ''
+
+
+def test_global_change_rebuilds_everything(tmp_path):
+    path = str(tmp_path / 'board.vbs')
+    buildIncremental(board([('V1', 10)]), path)
+    report = buildIncremental(board([('V1', 10)], Thickness=0.8), path)
+    assert report['full']
+    assert read(report['delta']) == read(path)
+    with open(path + '.manifest.json') as manifest:
+        assert sorted(json.load(manifest)['objects']) == ['PCB/FR4', 'PCB/V1']
+
+
+def test_box_and_its_holes_are_one_object():
+    model = board([])
+    modeler.hfssCylinder(model, 'Tool', 'Z', [25, 25, 0], 2, 1.6, 'mm')
+    booleans.hfssSubtract(model, 'FR4', 'Tool')
+    objects, _ = fingerprint(model.nodes)
+    assert list(objects) == ['PCB/FR4']
+    assert objects['PCB/FR4']['parts'] == ['FR4']
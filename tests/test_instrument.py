@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# @File    : test_instrument.py
+# @Software: PyCharm
+
+import io
+
+import pytest
+
+from hfss import mesh, scriptwriter
+from hfss.instrument import OTHER, Profiler
+from hfss.modeler import hfssCylinder, hfssDipole
+
+
+def test_from_imported_functions_are_profiled():
+    fid = io.StringIO()
+    with Profiler() as profiler:
+        hfssDipole(fid, 'Dip', 'Z', [0, 0, 0], 10, 0.5, 0.2, 'mm')
+    functions = profiler.report()['functions']
+    assert functions['hfssDipole']['calls'] == 1
+    assert functions['hfssCylinder']['calls'] == 2
+    assert functions['hfssDipole']['objects'] == 2
+    assert functions['hfssDipole']['bytes'] == len(fid.getvalue())
+    assert [record['function'] for record in profiler.assemblies] == ['hfssDipole']
+    assert set(profiler.stacks) == {'hfssDipole', 'hfssDipole;hfssCylinder'}
+
+
+def test_later_modules_are_profiled():
+    with Profiler() as profiler:
+        mesh.hfssAssignLengthOp(io.StringIO(), 'Length1', 'Dip1', 0.1, 'mm')
+    assert profiler.functions['hfssAssignLengthOp']['calls'] == 1
+
+
+def test_modules_restrict_the_profile():
+    with Profiler(modules=['hfss.mesh']) as profiler:
+        hfssCylinder(io.StringIO(), 'Via', 'Z', [0, 0, 0], 0.1, 1.6, 'mm')
+    assert 'hfssCylinder' not in profiler.functions
+    assert profiler.functions[OTHER]['objects'] == 1
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler:
+        pass
+    hfssCylinder(io.StringIO(), 'Via', 'Z', [0, 0, 0], 0.1, 1.6, 'mm')
+    assert scriptwriter.profiler is None and scriptwriter.hook is None
+    assert not profiler.functions
+
+
+def test_one_profiler_at_a_time():
+    with Profiler():
+        with pytest.raises(Exception):
+            Profiler().enable()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# @File    : test_interpreter.py
+# @Software: PyCharm
+
+import io
+
+import pytest
+
+from hfss import booleans, general, modeler
+from hfss.interpreter import compareScripts, runFile, runScript
+
+
+def error(fid, text):
+    errors = runScript(fid.getvalue() + text).errors
+    assert len(errors) == 1
+    return errors[0]
+
+
+def test_generated_script_runs(fid):
+    modeler.hfssBox(fid, 'FR4', [0, 0, 0], [10, 10, 1.6], 'mm', [5, 5, 0], 1, 'Z')
+    modeler.hfssDipole(fid, 'Dip', 'X', [0, 0, 5], 10, 0.5, 0.2, 'mm', 'r')
+    booleans.hfssIntersect(fid, ['Dip1', 'Dip2'], 'true')
+    modeler.hfssSplit(fid, ['FR4'], 'X')
+    modeler.hfssDuplicateAlongLine(fid, ['Dip1'], [0, 20, 0], 3, 'mm')
+    modeler.hfssDelete(fid, ['Dip2'])
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    assert sorted(report.objects) == ['Design1/Dip1', 'Design1/Dip1_1', 'Design1/Dip1_2',
+                                      'Design1/FR4']
+    assert report.objects['Design1/FR4'] == 'box'
+    assert report.nBooleans == 2
+    assert report.commands['duplicate'] == 1
+    assert '6 objects' not in str(report) and '4 objects' in str(report)
+
+
+@pytest.mark.parametrize('text, message', [
+    ('\nSet oBad = oMissing\n', "Variable is undefined: 'oMissing'"),
+    ('\noEditor.Fly 1\n', "doesn't support this property or method"),
+    ('\nCall Missing()\n', "Sub or Function not defined: 'Missing'"),
+    ('\noEditor.Delete Array("NAME:Selections", "Selections:=", "Ghost")\n',
+     'Unknown parts: Ghost'),
+    ('\noEditor.Subtract Array("NAME:Selections", "Blank Parts:=", "Box1", '
+     '"Tool Parts:=", ""), Array("NAME:SubtractParameters", "KeepOriginals:=", false)\n',
+     'Subtract needs blank and tool parts'),
+    ('\noEditor.Unite Array("NAME:Selections", "Selections:=", "Box1"), '
+     'Array("NAME:UniteParameters", "KeepOriginals:=", false)\n',
+     'Unite needs at least two parts'),
+])
+def test_errors_are_reported_with_their_line(fid, text, message):
+    modeler.hfssBox(fid, 'Box1', [0, 0, 0], [1, 1, 1], 'mm')
+    found = error(fid, text)
+    assert message in found
+    assert found.startswith('line {0}:'.format(fid.getvalue().count('\n') + 2))
+
+
+def test_duplicate_names(fid):
+    modeler.hfssBox(fid, 'Box1', [0, 0, 0], [1, 1, 1], 'mm')
+    modeler.hfssBox(fid, 'Box1', [2, 0, 0], [1, 1, 1], 'mm')
+    assert "A part named 'Box1' already exists" in runScript(fid.getvalue()).errors[0]
+
+
+def test_option_explicit():
+    assert runScript('x = 1\n').errors == []
+    assert "Variable is undefined: 'x'" in runScript('Option Explicit\nx = 1\n').errors[0]
+    assert runScript('Option Explicit\nDim x\nx = 1\n').errors == []
+
+
+def test_subs_and_functions():
+    report = runScript('Function Twice(a)\n'
+                       'Twice = a & a\n'
+                       'End Function\n'
+                       'Sub Show(a, b)\n'
+                       'Dim c\n'
+                       'c = Twice(a) & b\n'
+                       'End Sub\n'
+                       'Show "x", 1\n'
+                       'Call Show("y", 2)\n'
+                       'Show "z"\n')
+    assert len(report.errors) == 1
+    assert "Wrong number of arguments: 'show'" in report.errors[0]
+
+
+def test_type_mismatch():
+    assert runScript('x = "2" + 1\nDim y\nx = y - True\nx = "a" + "b"\n').errors == []
+    assert "Type mismatch: 'a'" in runScript('x = "a" + 1\n').errors[0]
+
+
+def test_external_parts_are_accepted():
+    fid = io.StringIO()
+    general.hfssUseActiveDesign(fid, 'Board')
+    booleans.hfssSubtract(fid, 'FR4', ['Hole1', 'Hole2'])
+    assert runScript(fid.getvalue()).errors == []
+
+
+def test_compare_and_run_file(fid, tmp_path):
+    modeler.hfssCylinder(fid, 'Via', 'Z', [0, 0, 0], 0.2, 1.6, 'mm')
+    text = fid.getvalue()
+    assert compareScripts(text, text) == []
+    assert compareScripts(text, text.replace('0.2mm', '0.3mm'))
+    assert compareScripts(text, text + '\noEditor.Delete Array("NAME:Selections", '
+                                       '"Selections:=", "Via")\n')
+    path = tmp_path / 'via.vbs'
+    path.write_text(text)
+    assert runFile(str(path)).objects == {'Design1/Via': 'cylinder'}
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# @File    : test_mesh.py
+# @Software: PyCharm
+
+import pytest
+
+from hfss import mesh, modeler
+from hfss.interpreter import runScript
+
+
+def array(fid):
+    modeler.hfssBox(fid, 'Air', [-50, -50, -50], [100, 100, 100], 'mm')
+    modeler.hfssBox(fid, 'FR4', [-40, -40, -10], [80, 80, 1.6], 'mm', [30, 30, 0], 0.05, 'Z')
+    for i in range(3):
+        modeler.hfssDipole(fid, 'Dip{0}_'.format(i), 'Z', [15 * i, 0, 0], 10, 0.5, 0.2, 'mm')
+
+
+def test_skin_depth():
+    assert mesh.skinDepth(10, 5.8e7) == pytest.approx(0.661e-6, rel=1e-3)
+    assert mesh.skinDepth(0.04, 5.8e7) == pytest.approx(10 * mesh.skinDepth(4, 5.8e7))
+
+
+@pytest.mark.parametrize('x, rounded', [(0.037, 0.02), (1, 1), (7.3, 5), (0.05, 0.05),
+                                        (0.0999, 0.05)])
+def test_one_two_five_series(x, rounded):
+    assert mesh._roundDown(x) == rounded
+
+
+def test_feature_sizes(fid):
+    array(fid)
+    sizes = mesh.featureSizes(fid.registry)
+    assert sizes['Dip0_1'] == pytest.approx(0.5e-3)
+    assert sizes['FR4'] == pytest.approx(0.1e-3)      # the hole
+    assert sizes['Air'] == pytest.approx(0.1)
+    assert mesh.featureSizes(fid.registry, Margin=1e-3)['Dip0_1'] == pytest.approx(0.2e-3)
+
+
+def test_auto_mesh_ops(fid):
+    array(fid)
+    modeler.hfssBox(fid, 'Foil', [-40, -40, 20], [80, 80, 0.0001], 'mm')
+    operations = mesh.hfssAutoMeshOps(fid, fid.registry, 10, 'mm',
+                                      Conductors=['Dip0_1', 'Dip0_2', 'Foil'])
+    lengths = dict((Name, (sorted(Parts), size)) for Name, Parts, size in operations)
+    assert lengths == {
+        'AutoLength1': (['Foil'], 2e-05),
+        'AutoLength2': (['FR4'], 0.02),
+        'AutoLength3': (sorted('Dip{0}_{1}'.format(i, j) for i in range(3) for j in (1, 2)),
+                        0.05),
+        # The foil is thinner than two skin depths.
+        'AutoSkinDepth': (['Dip0_1', 'Dip0_2'], 0.000661)}
+
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    assert report.commands['assignlengthop'] == 3
+    assert report.commands['assignskindepthop'] == 1
+
+
+def test_mesh_op_needs_existing_parts(fid):
+    mesh.hfssAssignLengthOp(fid, 'Gap', ['Ghost'], 0.05, 'mm')
+    assert 'Unknown parts: Ghost' in runScript(fid.getvalue()).errors[0]
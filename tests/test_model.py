@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# @File    : test_model.py
+# @Software: PyCharm
+
+import io
+
+from hfss import booleans, general, modeler
+from hfss.interpreter import runScript
+from hfss.model import Model, dropDeadObjects, foldRedundant, mergeSubtracts
+from hfss.scriptwriter import ScriptWriter
+
+
+def board(fid):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'PCB')
+    modeler.hfssBox(fid, 'FR4', [0, 0, 0], [50, 50, 1.6], 'mm')
+    for i in range(5):
+        modeler.hfssCylinder(fid, 'Hole{0}'.format(i), 'Z', [5 + 10 * i, 5, 0], 1, 1.6, 'mm')
+        booleans.hfssSubtract(fid, 'FR4', 'Hole{0}'.format(i))
+    modeler.hfssBox(fid, 'Scratch', [0, 0, 0], [1, 1, 1], 'mm')
+    modeler.hfssDelete(fid, ['Scratch'])
+
+
+def optimized(passes=None):
+    model = Model()
+    board(model)
+    return model.optimize(passes)
+
+
+def test_model_text_is_the_plain_script():
+    plain = io.StringIO()
+    board(plain)
+    assert Model().getvalue() == ''
+    model = Model()
+    board(model)
+    assert model.getvalue() == plain.getvalue()
+
+
+def test_subtracts_are_merged():
+    model = optimized([mergeSubtracts])
+    subtracts = [node for node in model.nodes if node.kind == 'subtract']
+    assert len(subtracts) == 1
+    assert subtracts[0].params['toolParts'] == ['Hole{0}'.format(i) for i in range(5)]
+
+
+def test_subtract_is_not_moved_across_a_use_of_its_blank():
+    model = Model()
+    modeler.hfssBox(model, 'FR4', [0, 0, 0], [50, 50, 1.6], 'mm')
+    modeler.hfssCylinder(model, 'H1', 'Z', [5, 5, 0], 1, 1.6, 'mm')
+    booleans.hfssSubtract(model, 'FR4', 'H1')
+    modeler.hfssDuplicateAlongLine(model, ['FR4'], [60, 0, 0], 2, 'mm')
+    modeler.hfssCylinder(model, 'H2', 'Z', [15, 5, 0], 1, 1.6, 'mm')
+    booleans.hfssSubtract(model, 'FR4', 'H2')
+    model.optimize([mergeSubtracts])
+    assert [node.kind for node in model.nodes] == \
+        ['box', 'cylinder', 'subtract', 'duplicate', 'cylinder', 'subtract']
+
+
+def test_dead_objects_are_dropped():
+    model = optimized([dropDeadObjects])
+    assert 'Scratch' not in model.getvalue()
+    assert not [node for node in model.nodes if node.kind == 'delete']
+
+
+def test_redundant_commands_are_folded():
+    model = Model()
+    modeler.hfssBox(model, 'FR4', [0, 0, 0], [50, 50, 1.6], 'mm')
+    # hfssSubtract writes nothing without tools, but a pass may leave none.
+    model.emit('subtract', dict(blankParts=['FR4'], toolParts=[], Clone='false'), '')
+    modeler.hfssDelete(model, [])
+    modeler.hfssDuplicateAlongLine(model, ['FR4'], [60, 0, 0], 1, 'mm')
+    model.write('')
+    model.optimize([foldRedundant])
+    assert [node.kind for node in model.nodes] == ['box']
+
+
+def test_optimized_script_builds_the_same_parts():
+    plain = io.StringIO()
+    board(plain)
+    fid = ScriptWriter()
+    optimized().writeTo(fid)
+    before, after = runScript(plain.getvalue()), runScript(fid.getvalue())
+    assert before.errors == after.errors == []
+    assert before.objects == after.objects
+    assert (before.nBooleans, after.nBooleans) == (5, 1)
+
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# @File    : test_package.py
+# @Software: PyCharm
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import hfss
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def run(code):
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                          capture_output=True, text=True).stdout.split()
+
+
+def test_import_loads_no_submodule_nor_numpy():
+    loaded = run('import sys, hfss\n'
+                 'print(" ".join(sorted(m for m in sys.modules\n'
+                 '                      if m.startswith("hfss.") or m == "numpy")))')
+    assert loaded == []
+
+
+def test_scalar_generators_do_not_need_numpy():
+    loaded = run('import sys, io\n'
+                 'from hfss.general import hfssNewProject\n'
+                 'from hfss.modeler import hfssCylinder\n'
+                 'hfssNewProject(io.StringIO())\n'
+                 'hfssCylinder(io.StringIO(), "Via", "Z", [0, 0, 0], 0.2, 1.6, "mm")\n'
+                 'print("numpy" in sys.modules)')
+    assert loaded == ['False']
+
+
+def test_lazy_attributes():
+    from hfss.scriptwriter import ScriptWriter
+    from hfss import modeler
+    assert hfss.ScriptWriter is ScriptWriter
+    assert hfss.modeler is modeler
+    assert set(hfss.__all__) <= set(dir(hfss))
+    for name in hfss.__all__:
+        getattr(hfss, name)
+    with pytest.raises(AttributeError):
+        hfss.nothing
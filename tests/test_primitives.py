@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# @File    : test_primitives.py
+# @Software: PyCharm
+
+import io
+
+import numpy as np
+import pytest
+
+from hfss import modeler
+from hfss.interpreter import runScript
+
+CENTERS = [[0, 0, 0], [1.5, 2, 0], [-3, 0.25, 1e-05]]
+
+
+def script(function, *args):
+    fid = io.StringIO()
+    function(fid, *args)
+    return fid.getvalue()
+
+
+# Script of one call per element: build(fid, i) creates element i.
+def elements(build, N):
+    fid = io.StringIO()
+    for i in range(N):
+        build(fid, i)
+    return fid.getvalue()
+
+
+@pytest.mark.parametrize('Centers', [CENTERS, np.array(CENTERS, dtype=float)])
+def test_cylinder_array_matches_cylinders(Centers):
+    Radii = [1, 0.5, 2]
+    expected = elements(lambda fid, i: modeler.hfssCylinder(
+        fid, 'V' + str(i + 1), 'Z', list(Centers[i]), Radii[i], 2, 'mm'), 3)
+    assert script(modeler.hfssCylinderArray, 'V', 'Z', Centers, [1, 0.5, 2], 2, 'mm') == expected
+
+
+def test_mixed_integers_and_floats_keep_their_format():
+    text = script(modeler.hfssCylinderArray, 'V', 'Z', CENTERS, 1, 2, 'mm')
+    assert '"XCenter:=", "0mm"' in text
+    assert '"0.0mm"' not in text
+
+
+def test_box_array_matches_boxes():
+    expected = elements(lambda fid, i: modeler.hfssBox(
+        fid, 'B' + str(i + 1), CENTERS[i], [1, 0.5, 2], 'mm'), 3)
+    assert script(modeler.hfssBoxArray, 'B', CENTERS, [1, 0.5, 2], 'mm') == expected
+
+
+def test_rectangle_array_matches_rectangles():
+    Widths = [1, 2.5, 3]
+    expected = elements(lambda fid, i: modeler.hfssRectangle(
+        fid, 'R' + str(i + 1), 'X', CENTERS[i], Widths[i], 4, 'mm'), 3)
+    assert script(modeler.hfssRectangleArray, 'R', 'X', CENTERS, [1, 2.5, 3], 4, 'mm') == \
+        expected
+
+
+def test_names_must_match_elements():
+    with pytest.raises(Exception):
+        script(modeler.hfssCylinderArray, ['V1'], 'Z', CENTERS, 1, 2, 'mm')
+
+
+def test_expressions_are_written_without_units():
+    Centers = [['x', 0, 0], [1.5, 'y/2', 0]]
+    expected = elements(lambda fid, i: modeler.hfssCylinder(
+        fid, 'V' + str(i + 1), 'Z', Centers[i], ['r', 1][i], 'h', 'mm'), 2)
+    text = script(modeler.hfssCylinderArray, 'V', 'Z', Centers, ['r', 1], 'h', 'mm')
+    assert text == expected
+    assert '"XCenter:=", "x"' in text and '"Height:=", "h"' in text
+
+
+def test_expression_arrays_are_written_without_units():
+    text = script(modeler.hfssBoxArray, 'B', np.array([['x', '0mm', '0mm']]), ['a', 'b', 1], 'mm')
+    assert '"XPosition:=", "x"' in text and '"YPosition:=", "0mm"' in text
+    assert '"XSize:=", "a"' in text and '"ZSize:=", "1mm"' in text
+
+
+def test_holes_missing_the_box_are_pruned():
+    fid = io.StringIO()
+    emitted, pruned = modeler.holeStats['emitted'], modeler.holeStats['pruned']
+    nPruned = modeler.hfssBox(fid, 'FR4', [0, 0, 0], [10, 10, 1.6], 'mm',
+                              [5, 5, 0], 1, 'Z',        # inside
+                              [11, 5, 0], 1.5, 'Z',     # grazes the side
+                              [20, 5, 0], 1, 'Z',       # misses
+                              [5, 5, 10], 1, 'X')       # above the box
+    assert nPruned == 2
+    assert modeler.holeStats['emitted'] - emitted == 2
+    assert modeler.holeStats['pruned'] - pruned == 2
+    text = fid.getvalue()
+    assert 'FR4_subhole1' in text and 'FR4_subhole2' in text
+    assert 'FR4_subhole3' not in text and 'FR4_subhole4' not in text
+    assert text.count('oEditor.Subtract') == 1
+
+
+def test_holes_with_expressions_are_kept():
+    fid = io.StringIO()
+    assert modeler.hfssBox(fid, 'FR4', [0, 0, 0], [10, 10, 1.6], 'mm',
+                           ['x0', 5, 0], 1, 'Z', [20, 5, 0], 'r', 'Z') == 0
+    assert fid.getvalue().count('oEditor.CreateCylinder') == 2
+
+
+def test_pruned_box_script_runs(fid):
+    modeler.hfssBox(fid, 'FR4', [0, 0, 0], [10, 10, 1.6], 'mm',
+                    [5, 5, 0], 1, 'Z', [20, 5, 0], 1, 'Z')
+    report = runScript(fid.getvalue())
+    assert report.errors == []
+    assert set(report.objects) == {'Design1/FR4'}
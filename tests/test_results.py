@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# @File    : test_results.py
+# @Software: PyCharm
+
+import numpy as np
+import pytest
+
+from hfss import general, results
+from hfss.interpreter import runScript
+from hfss.results import ReportCSV, Touchstone, readResults
+
+
+def number(value):
+    return '%.17g' % value
+
+
+# Writes a version 1 Touchstone file of the given complex matrices.
+def writeTouchstone(path, f, S, Format='RI', Unit='GHZ'):
+    N = S.shape[1]
+    scale = {'HZ': 1e9, 'MHZ': 1e3, 'GHZ': 1.0}[Unit]
+    lines = ['! written by test_results', '# {0} S {1} R 50'.format(Unit, Format)]
+    for fi, matrix in zip(f, S):
+        values = (matrix.T if N == 2 else matrix).ravel()
+        if Format == 'RI':
+            pairs = [(v.real, v.imag) for v in values]
+        elif Format == 'MA':
+            pairs = [(abs(v), np.degrees(np.angle(v))) for v in values]
+        else:
+            pairs = [(20 * np.log10(abs(v)), np.degrees(np.angle(v))) for v in values]
+        texts = [number(a) + ' ' + number(b) for a, b in pairs]
+        # From 3 ports on, every matrix row starts a line of at most 4 pairs.
+        rows = [texts] if N <= 2 else [texts[r * N:(r + 1) * N][i:i + 4]
+                                       for r in range(N) for i in range(0, N, 4)]
+        lines.append(number(fi * scale) + ' ' + ' '.join(rows[0]) + ' ! point')
+        lines += ['  ' + ' '.join(row) for row in rows[1:]]
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def sParameters(nPoints, N, seed=0):
+    rng = np.random.RandomState(seed)
+    f = np.linspace(1, 3, nPoints)
+    S = rng.uniform(0.1, 1, (nPoints, N, N)) * np.exp(1j * rng.uniform(-3, 3, (nPoints, N, N)))
+    return f, S
+
+
+def worstMatch(f, S):
+    return float(abs(S[:, 0, 0]).max())
+
+
+@pytest.mark.parametrize('N', [1, 2, 4, 5])
+@pytest.mark.parametrize('Format', ['RI', 'MA', 'DB'])
+def test_touchstone_round_trip(tmp_path, N, Format):
+    f, S = sParameters(21, N)
+    path = tmp_path / 'dut.s{0}p'.format(N)
+    writeTouchstone(path, f, S, Format, 'MHZ')
+    with Touchstone(str(path)) as ts:
+        assert (len(ts), ts.format, ts.reference) == (21, Format, 50.0)
+        frequencies, matrices = ts.load()
+        assert np.allclose(frequencies, f)
+        assert np.allclose(matrices, S)
+        assert np.allclose(ts.frequencies, f)
+
+
+def test_touchstone_slices(tmp_path):
+    f, S = sParameters(101, 2)
+    path = tmp_path / 'dut.s2p'
+    writeTouchstone(path, f, S, 'RI', 'HZ')
+    with Touchstone(str(path)) as ts:
+        fi, Si = ts[-1]
+        assert fi == pytest.approx(3) and np.allclose(Si, S[-1])
+        fs, Ss = ts[10:30:5]
+        assert np.allclose(fs, f[10:30:5]) and np.allclose(Ss, S[10:30:5])
+        fb, Sb = ts.between(f[40], f[60] - 1e-6)
+        assert np.allclose(fb, f[40:60]) and np.allclose(Sb, S[40:60])
+        assert len(ts.between(5, 6)[0]) == 0
+        with pytest.raises(IndexError):
+            ts[101]
+
+
+# ExportNetworkData writes the gamma and the port impedances of every point
+# as comment lines after it.
+@pytest.mark.parametrize('N', [2, 4])
+def test_touchstone_with_comment_lines(tmp_path, N):
+    f, S = sParameters(30, N)
+    path = tmp_path / 'dut.s{0}p'.format(N)
+    writeTouchstone(path, f, S)
+    lines = []
+    for line in path.read_text().splitlines():
+        if lines and line[:1].isdigit():
+            lines += ['! Gamma ! 1.2 0.3', '!Port Impedance 50 0 50 0', '   ! indented', '']
+        lines.append(line)
+    path.write_text('\n'.join(lines) + '\n! Gamma ! 1.2 0.3\n')
+    with Touchstone(str(path)) as ts:
+        assert len(ts) == 30
+        assert np.allclose(ts.load()[1], S)
+        assert np.allclose(ts[7:9][1], S[7:9])
+        assert np.allclose(ts.between(f[3], f[5])[0], f[3:6])
+
+
+def test_malformed_data(tmp_path):
+    path = tmp_path / 'dut.s1p'
+    path.write_text('# GHZ S RI R 50\n1 0.5 0.1\n2 0.5 x\n')
+    with Touchstone(str(path)) as ts:
+        assert ts[0][0] == 1
+        with pytest.raises(Exception):
+            ts.load()
+
+
+def test_touchstone_needs_its_ports(tmp_path):
+    path = tmp_path / 'dut.txt'
+    path.write_text('# GHZ S RI R 50\n1 0 0\n')
+    with pytest.raises(Exception):
+        Touchstone(str(path))
+    with Touchstone(str(path), nPorts=1) as ts:
+        assert ts[0][1][0, 0] == 0
+
+
+def test_csv_round_trip(tmp_path):
+    rows = np.column_stack([np.linspace(1, 3, 50), np.random.RandomState(1).randn(50, 2)])
+    path = tmp_path / 'report.csv'
+    path.write_text('"Freq [GHz]","dB(S(1,1)) []","dB(S(2,1)) []"\n' +
+                    ''.join(','.join(map(number, row)) + '\n' for row in rows))
+    with ReportCSV(str(path)) as report:
+        assert report.columns == ['Freq [GHz]', 'dB(S(1,1)) []', 'dB(S(2,1)) []']
+        assert np.allclose(report.load(), rows)
+        assert np.allclose(report[3], rows[3]) and np.allclose(report[:5], rows[:5])
+        assert np.allclose(report.between(rows[10, 0], rows[19, 0]), rows[10:20])
+        assert np.allclose(report.column('dB(S(2,1)) []'), rows[:, 2])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_read_results(tmp_path, workers):
+    paths, expected = [], {}
+    for i in range(4):
+        f, S = sParameters(30, 2, seed=i)
+        path = str(tmp_path / 'v{0}.s2p'.format(i))
+        writeTouchstone(tmp_path / 'v{0}.s2p'.format(i), f, S)
+        paths.append(path)
+        inBand = (f >= 2) & (f <= 2.5)
+        expected[path] = float(abs(S[inBand, 0, 0]).max())
+    found = readResults(paths, worstMatch, 2, 2.5, workers=workers)
+    assert found == pytest.approx(expected)
+
+
+def test_export_generators_run(fid):
+    general.hfssInsertSolution(fid, 'Setup1', 2.4)
+    general.hfssInterpolatingSweep(fid, 'Sweep1', 'Setup1', 2, 3)
+    results.hfssExportNetworkData(fid, 'C:\\results\\dip.s2p', 'Setup1', 'Sweep1', 'MA')
+    results.hfssExportReport(fid, 'Gain', 'Setup1', None, 'dB(GainTotal)', 'C:/results/gain.csv',
+                             'Far Fields', 'Theta', ['Phi', 'Freq'], 'Infinite Sphere1',
+                             designName='Design1')
+    text = fid.getvalue()
+    assert '"C:/results/dip.s2p"' in text and '15\n' in text
+    assert '"Setup1 : LastAdaptive"' in text
+    assert runScript(text).errors == []
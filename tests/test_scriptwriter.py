@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# @File    : test_scriptwriter.py
+# @Software: PyCharm
+
+import gzip
+import io
+import socket
+
+from hfss import general, modeler
+from hfss.scriptwriter import ScriptWriter
+
+
+class CountingTarget(io.StringIO):
+    def __init__(self):
+        io.StringIO.__init__(self)
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return io.StringIO.write(self, text)
+
+
+def build(fid):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'Design1')
+    for i in range(50):
+        modeler.hfssCylinder(fid, 'Via{0}'.format(i), 'Z', [i, 0, 0], 0.2, 1.6, 'mm')
+
+
+def test_same_text_as_a_plain_file():
+    plain = io.StringIO()
+    build(plain)
+    with ScriptWriter() as fid:
+        build(fid)
+        assert fid.getvalue() == plain.getvalue()
+
+
+def test_target_sees_few_large_writes():
+    plain = io.StringIO()
+    build(plain)
+    target = CountingTarget()
+    fid = ScriptWriter(target, chunkSize=4096)
+    build(fid)
+    fid.close()
+    assert target.getvalue() == plain.getvalue()
+    assert 1 < target.writes <= len(plain.getvalue()) // 4096 + 1
+
+
+def test_file_and_gzip_targets(tmp_path):
+    plain = io.StringIO()
+    build(plain)
+    with ScriptWriter(str(tmp_path / 'a.vbs')) as fid:
+        build(fid)
+    with ScriptWriter(str(tmp_path / 'a.vbs.gz')) as fid:
+        build(fid)
+    with open(str(tmp_path / 'a.vbs')) as script:
+        assert script.read() == plain.getvalue()
+    with gzip.open(str(tmp_path / 'a.vbs.gz'), 'rt') as script:
+        assert script.read() == plain.getvalue()
+
+
+def test_socket_target():
+    sender, receiver = socket.socketpair()
+    with ScriptWriter(sender) as fid:
+        general.hfssNewProject(fid)
+    sender.close()
+    received = b''
+    while True:
+        data = receiver.recv(4096)
+        if not data:
+            break
+        received += data
+    receiver.close()
+    plain = io.StringIO()
+    general.hfssNewProject(plain)
+    assert received.decode('utf-8') == plain.getvalue()
+
+
+def test_observers_see_every_block():
+    seen = []
+    fid = ScriptWriter(observers=[lambda kind, params: seen.append(kind)])
+    modeler.hfssBox(fid, 'FR4', [0, 0, 0], [10, 10, 1.6], 'mm')
+    modeler.hfssCylinder(fid, 'Via', 'Z', [1, 1, 0], 0.2, 1.6, 'mm')
+    assert seen == ['box', 'cylinder']
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# @File    : test_spatial.py
+# @Software: PyCharm
+
+import itertools
+
+import numpy as np
+
+from hfss import booleans, modeler
+from hfss.scriptwriter import ScriptWriter
+from hfss.spatial import ObjectRegistry
+
+
+def tracked():
+    registry = ObjectRegistry()
+    return ScriptWriter(observers=[registry.record]), registry
+
+
+def bruteForce(registry):
+    result = []
+    for a, b in itertools.combinations(sorted(registry.boxes), 2):
+        (loA, hiA), (loB, hiB) = registry.bounds(a), registry.bounds(b)
+        if np.all(np.minimum(hiA, hiB) - np.maximum(loA, loB) > 1e-12):
+            result.append((a, b))
+    return result
+
+
+def test_overlapping_solids_are_found():
+    fid, registry = tracked()
+    modeler.hfssBox(fid, 'A', [0, 0, 0], [10, 10, 1], 'mm')
+    modeler.hfssBox(fid, 'B', [5, 5, 0], [10, 10, 1], 'mm')
+    modeler.hfssBox(fid, 'C', [10, 0, 0], [5, 6, 1], 'mm')      # touches A only
+    modeler.hfssCylinder(fid, 'D', 'Z', [30, 30, 0], 1, 1, 'mm')
+    assert registry.overlaps() == [('A', 'B'), ('B', 'C')]
+    assert ('A', 'C') in registry.overlaps(Margin=1e-4)
+
+
+def test_sheets_and_holes_are_not_overlaps():
+    fid, registry = tracked()
+    modeler.hfssBox(fid, 'FR4', [0, 0, 0], [10, 10, 1.6], 'mm', [5, 5, 0], 1, 'Z')
+    modeler.hfssCylinder(fid, 'Via', 'Z', [5, 5, 0], 0.5, 1.6, 'mm')
+    modeler.hfssRectangle(fid, 'Patch', 'Z', [0, 0, 1.6], 10, 10, 'mm')
+    assert registry.overlaps() == []
+    assert ('FR4', 'Patch') in registry.overlaps(Margin=1e-6)
+
+
+def test_booleans_and_duplicates_are_followed():
+    fid, registry = tracked()
+    modeler.hfssBox(fid, 'A', [0, 0, 0], [1, 1, 1], 'mm')
+    modeler.hfssBox(fid, 'B', [1, 0, 0], [1, 1, 1], 'mm')
+    booleans.hfssUnite(fid, ['A', 'B'])
+    lo, hi = registry.bounds('A')
+    assert np.allclose(hi - lo, [2e-3, 1e-3, 1e-3])
+    assert 'B' not in registry.boxes
+
+    modeler.hfssDuplicateAlongLine(fid, ['A'], [0, 5, 0], 3, 'mm')
+    assert np.allclose(registry.bounds('A_2')[0], [0, 10e-3, 0])
+    modeler.hfssDelete(fid, ['A_1'])
+    assert sorted(registry.boxes) == ['A', 'A_2']
+
+
+def test_grid_agrees_with_brute_force():
+    rng = np.random.RandomState(1)
+    fid, registry = tracked()
+    modeler.hfssBoxArray(fid, 'Small', rng.uniform(0, 100, (300, 3)),
+                         rng.uniform(0.5, 4, (300, 3)), 'mm')
+    modeler.hfssBox(fid, 'Ground', [0, 0, 50], [100, 100, 0.5], 'mm')
+    assert registry.overlaps() == bruteForce(registry)
+
+
+def test_expressions_are_not_tracked():
+    fid, registry = tracked()
+    modeler.hfssBox(fid, 'A', [0, 0, 0], ['w', 1, 1], 'mm')
+    assert len(registry) == 0
+    assert registry.unresolved == 1
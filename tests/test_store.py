@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# @File    : test_store.py
+# @Software: PyCharm
+
+import numpy as np
+
+from hfss import booleans, modeler
+from hfss.interpreter import runScript
+from hfss.store import PrimitiveStore
+
+
+def board(fid, N):
+    modeler.hfssBox(fid, 'FR4', [0, 0, 0], [N, 10, 1.6], 'mm')
+    for i in range(N):
+        modeler.hfssCylinder(fid, 'Via' + str(i), 'Z', [i + 0.5, 5, 0], 0.2, 1.6, 'mm')
+    booleans.hfssSubtract(fid, 'FR4', ['Via' + str(i) for i in range(N)], 'true')
+    modeler.hfssRectangleArray(fid, 'Pad', 'Z', [[i, 0, 1.6] for i in range(N)], 1, 2, 'mm')
+    modeler.hfssBox(fid, 'Lid', [0, 0, 'h'], [N, 10, 1], 'mm')
+
+
+def test_store_replays_the_same_model(newScript):
+    direct, replayed = newScript(), newScript()
+    board(direct, 40)
+    store = PrimitiveStore(capacity=8)
+    board(store, 40)
+    store.writeTo(replayed)
+
+    assert len(store) == 1 + 40 + 1 + 40 + 1
+    assert (store.count('cylinder'), store.count('box'), store.count('rectangle')) == (40, 1, 40)
+    assert replayed.getvalue().count('oEditor.CreateCylinder') == 40
+    assert '"XSize:=", "40.0mm"' in replayed.getvalue()
+    assert '"ZPosition:=", "h"' in replayed.getvalue()
+
+    reports = [runScript(fid.getvalue()) for fid in (direct, replayed)]
+    assert reports[0].errors == reports[1].errors == []
+    assert reports[0].objects == reports[1].objects
+    assert direct.registry.overlaps() == replayed.registry.overlaps()
+    for name in direct.registry.boxes:
+        assert np.allclose(direct.registry.bounds(name), replayed.registry.bounds(name))
+
+
+def test_views():
+    store = PrimitiveStore()
+    modeler.hfssCylinder(store, 'Via', 'X', [1, 2, 3], 0.2, 1.6, 'mil')
+    modeler.hfssRectangle(store, 'Pad', 'Y', [0, 0, 0], 3, 4, 'mm')
+    modeler.hfssBox(store, 'Lid', [0, 0, 'h'], [1, 1, 1], 'mm')
+    via, = store.views('cylinder')
+    assert (via.Name, via.Axis, via.Units, via.Radius, via.Height) == \
+        ('Via', 'X', 'mil', 0.2, 1.6)
+    assert list(via.Center) == [1, 2, 3]
+    pad, = store.views('rectangle')
+    assert (pad.Name, pad.Axis, pad.Width, pad.Height) == ('Pad', 'Y', 3, 4)
+    assert store.views('box') == []
+    assert store.rows('cylinder').dtype.itemsize < 64
+
+
+def test_record_as_an_observer(newScript):
+    store = PrimitiveStore()
+    fid = newScript()
+    fid.observers.append(store.record)
+    board(fid, 5)
+    assert (store.count('cylinder'), store.count('box'), store.count('rectangle')) == (5, 1, 5)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# @File    : test_streaming.py
+# @Software: PyCharm
+
+import gzip
+import io
+
+from hfss import booleans, modeler
+from hfss.streaming import (hfssBoxIter, hfssCylinderIter, hfssDipoleIter, iterCalls,
+                            streamScript)
+
+
+def test_chunks_are_the_script_of_the_generator():
+    plain = io.StringIO()
+    modeler.hfssDipole(plain, 'Dip', 'Z', [0, 0, 0], 10, 0.5, 0.2, 'mm')
+    chunks = list(hfssDipoleIter('Dip', 'Z', [0, 0, 0], 10, 0.5, 0.2, 'mm'))
+    assert len(chunks) == 2
+    assert ''.join(chunks) == plain.getvalue()
+
+
+def test_nothing_runs_before_the_first_chunk():
+    calls = []
+
+    def generator(fid):
+        calls.append(1)
+        fid.write('x')
+
+    chunks = iterCalls(generator)
+    assert calls == []
+    assert list(chunks) == ['x'] and calls == [1]
+
+
+def test_box_with_holes():
+    Holes = []
+    for i in range(250):
+        Holes += [[1 + i % 10, 1 + i // 10, 0], 0.2, 'Z']
+    Holes += [[50, 50, 0], 0.2, 'Z']
+    plain = io.StringIO()
+    modeler.hfssBox(plain, 'Plate', [0, 0, 0], [11, 26, 1], 'mm', *Holes)
+    chunks = list(hfssBoxIter('Plate', [0, 0, 0], [11, 26, 1], 'mm', *Holes))
+    assert ''.join(chunks) == plain.getvalue()
+    assert len(chunks) == 1 + 250 + -(-250 // booleans.CHUNK_SIZE)
+
+
+def test_holes_are_pruned_as_they_are_streamed():
+    Holes = []
+    for i in range(10000):
+        Holes += [[i * 0.01, 0.5, 0], 0.001, 'Z']
+    chunks = hfssBoxIter('Plate', [0, 0, 0], [100, 1, 1], 'mm', *Holes)
+    emitted = modeler.holeStats['emitted']
+    next(chunks)
+    next(chunks)
+    # Only the first block of holes has been tested when its first cylinder
+    # is yielded.
+    assert modeler.holeStats['emitted'] - emitted < len(Holes) // 3
+    assert len(list(chunks)) == 10000 - 1 + -(-10000 // booleans.CHUNK_SIZE)
+    assert modeler.holeStats['emitted'] - emitted == 10000
+
+
+def test_stream_to_a_compressed_file(tmp_path):
+    path = str(tmp_path / 'vias.vbs.gz')
+    chunks = (chunk for i in range(100)
+              for chunk in hfssCylinderIter('Via' + str(i), 'Z', [i, 0, 0], 0.2, 1.6, 'mm'))
+    nChars = streamScript(chunks, path, chunkSize=1000)
+
+    plain = io.StringIO()
+    for i in range(100):
+        modeler.hfssCylinder(plain, 'Via' + str(i), 'Z', [i, 0, 0], 0.2, 1.6, 'mm')
+    with gzip.open(path, 'rt') as script:
+        assert script.read() == plain.getvalue()
+    assert nChars == len(plain.getvalue())
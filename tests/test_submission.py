@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# @File    : test_submission.py
+# @Software: PyCharm
+
+import asyncio
+
+import pytest
+
+from hfss import general, modeler
+from hfss.submission import (CANCELLED, DONE, FAILED, FakeExecutor, SubmissionQueue,
+                             SubprocessExecutor, solveSweep)
+
+
+class FailingExecutor(object):
+    async def run(self, script):
+        raise Exception('solver crashed')
+
+
+def build(fid, Length):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'Dipole')
+    modeler.hfssDipole(fid, 'Dip', 'Z', [0, 0, 0], Length, 0.5, 0.2, 'mm')
+
+
+def test_jobs_run_and_fail_independently():
+    async def main():
+        async with SubmissionQueue(FakeExecutor(check=False), concurrency=2) as queue:
+            for i in range(5):
+                queue.submit('job{0}.vbs'.format(i))
+        return queue
+
+    queue = asyncio.run(main())
+    assert queue.status() == {DONE: 5}
+
+    async def failing():
+        async with SubmissionQueue(FailingExecutor()) as queue:
+            queue.submit('bad.vbs')
+        return queue
+
+    queue = asyncio.run(failing())
+    assert queue.status() == {FAILED: 1}
+    assert 'crashed' in str(queue.errors()['bad.vbs'])
+
+
+def test_join_after_cancel_returns():
+    async def main():
+        queue = await SubmissionQueue(FakeExecutor(delay=10, check=False)).start()
+        for i in range(4):
+            queue.submit('job{0}.vbs'.format(i))
+        await asyncio.sleep(0.01)
+        await queue.cancel()
+        await asyncio.wait_for(queue.join(), 1)
+        return queue
+
+    queue = asyncio.run(main())
+    assert queue.status() == {CANCELLED: 4}
+
+
+def test_submit_needs_a_started_queue():
+    with pytest.raises(Exception):
+        SubmissionQueue(FakeExecutor()).submit('job.vbs')
+
+
+def test_solve_sweep_checks_every_script(tmp_path):
+    executor = FakeExecutor()
+    jobs = asyncio.run(solveSweep(build, {'Length': [40, 45, 50]}, str(tmp_path), executor,
+                                  concurrency=2, workers=1))
+    assert len(jobs) == 3
+    assert all(job.status == DONE and job.result.errors == [] for job in jobs.values())
+
+
+def test_subprocess_command():
+    executor = SubprocessExecutor(['ssh', 'host1', 'run', '{script}', '-v'])
+    assert executor.args('a.vbs') == ['ssh', 'host1', 'run', 'a.vbs', '-v']
+    assert SubprocessExecutor().args('a.vbs')[-1] == 'a.vbs'
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# @File    : test_sweep.py
+# @Software: PyCharm
+
+import io
+import json
+import os
+
+import pytest
+
+from hfss import general, modeler
+from hfss.interpreter import runFile
+from hfss.sweep import generateBatch, generateSweep
+
+
+def buildDipole(fid, Length, gapLen):
+    general.hfssNewProject(fid)
+    general.hfssInsertDesign(fid, 'Dipole')
+    dipoleGeometry(fid, Length, gapLen)
+
+
+def dipoleGeometry(fid, Length, gapLen):
+    modeler.hfssDipole(fid, 'Dip', 'Z', [0, 0, 0], Length, 0.5, gapLen, 'mm')
+
+
+GRID = {'Length': [40, 45, 50], 'gapLen': [0.2, 0.5]}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sweep_writes_one_script_per_point(tmp_path, workers):
+    written = []
+    paths = generateSweep(buildDipole, GRID, str(tmp_path), workers,
+                          lambda values, path: written.append(values))
+    assert sorted(paths) == sorted(written) == sorted(
+        (Length, gapLen) for Length in GRID['Length'] for gapLen in GRID['gapLen'])
+
+    for (Length, gapLen), path in paths.items():
+        expected = io.StringIO()
+        buildDipole(expected, Length, gapLen)
+        with open(path) as script:
+            assert script.read() == expected.getvalue()
+
+    with open(str(tmp_path / 'manifest.json')) as manifest:
+        manifest = json.load(manifest)
+    assert manifest['parameters'] == ['Length', 'gapLen']
+    assert len(manifest['variants']) == 6
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_batch_packs_designs_into_projects(tmp_path, workers):
+    designs = generateBatch(dipoleGeometry, GRID, str(tmp_path), designsPerProject=4,
+                            workers=workers)
+    assert designs['Variant_00001'] == {'Length': 40, 'gapLen': 0.2}
+    assert len(designs) == 6
+
+    scripts = sorted(name for name in os.listdir(str(tmp_path)) if name.endswith('.vbs'))
+    assert scripts == ['project_00001.vbs', 'project_00002.vbs']
+    objects = {}
+    for name in scripts:
+        report = runFile(str(tmp_path / name))
+        assert report.errors == []
+        assert report.commands['newproject'] == 1
+        objects.update(report.objects)
+    assert len(objects) == 2 * len(designs)
+    assert 'Variant_00006/Dip1' in objects
+
+    with open(str(tmp_path / 'manifest.json')) as manifest:
+        manifest = json.load(manifest)
+    assert manifest['designs'][4] == {'design': 'Variant_00005', 'values': [50, 0.2],
+                                      'path': 'project_00002.vbs'}
+
+
+def test_batch_needs_a_design_per_project(tmp_path):
+    with pytest.raises(Exception):
+        generateBatch(dipoleGeometry, GRID, str(tmp_path), designsPerProject=0)
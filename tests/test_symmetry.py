@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# @File    : test_symmetry.py
+# @Software: PyCharm
+
+import numpy as np
+import pytest
+
+from hfss import booleans, general, modeler
+from hfss.interpreter import runScript
+from hfss.model import Model
+from hfss.symmetry import applySymmetry, findSymmetry
+
+
+def design(geometry):
+    model = Model()
+    general.hfssNewProject(model)
+    general.hfssInsertDesign(model, 'Design1')
+    geometry(model)
+    return model
+
+
+def dipole(model):
+    modeler.hfssDipole(model, 'Dip', 'Z', [0, 0, 0], 10, 0.5, 0.2, 'mm')
+
+
+def patches(model):
+    modeler.hfssBox(model, 'Air', [-30, -30, -10], [60, 60, 20], 'mm')
+    modeler.hfssBox(model, 'FR4', [-20, -20, 0], [40, 40, 1.6], 'mm', [10, 10, 0], 1, 'Z',
+                    [-10, 10, 0], 1, 'Z', [10, -10, 0], 1, 'Z', [-10, -10, 0], 1, 'Z')
+    Starts = np.array([[x, y, 1.6] for x in (-15, 5) for y in (-15, 5)])
+    modeler.hfssBoxArray(model, 'Patch', Starts, [10, 10, 0.035], 'mm')
+
+
+def test_find_symmetry():
+    assert findSymmetry(design(dipole).nodes) == ['X', 'Y', 'Z']
+    assert findSymmetry(design(patches).nodes) == ['X', 'Y']
+
+    def shifted(model):
+        modeler.hfssDipole(model, 'Dip', 'Z', [1, 0, 0], 10, 0.5, 0.2, 'mm')
+    assert findSymmetry(design(shifted).nodes) == ['Y', 'Z']
+
+    def hole(model):
+        patches(model)
+        modeler.hfssCylinder(model, 'Drill', 'Z', [3, 0, 0], 0.5, 1.6, 'mm')
+        booleans.hfssSubtract(model, 'FR4', 'Drill')
+    assert findSymmetry(design(hole).nodes) == ['Y']
+
+    def variables(model):
+        modeler.hfssBox(model, 'FR4', [-20, -20, 0], [40, 40, 'h'], 'mm')
+    assert findSymmetry(design(variables).nodes) == []
+
+
+def test_dipole_is_cut_to_an_eighth():
+    model = design(dipole)
+    assert applySymmetry(model, CurrentAxis='Z') == {'X': 'H', 'Y': 'H', 'Z': 'E'}
+    text = model.getvalue()
+    assert '"Name:=", "Dip2"' not in text
+    assert text.count('oEditor.Split') == 2
+    assert text.count('oModule.AssignSymmetry') == 3
+    assert text.count('"IsPerfectE:=", true') == 1
+
+    report = runScript(text)
+    assert report.errors == []
+    assert set(report.objects) == {'Design1/Dip1', 'Design1/SymmetryRegion'}
+
+
+def test_quarter_model_in_an_existing_region():
+    model = design(patches)
+    types = applySymmetry(model, Boundaries={'X': 'e', 'Y': 'H'}, Region='Air')
+    assert types == {'X': 'E', 'Y': 'H'}
+    report = runScript(model.getvalue())
+    assert report.errors == []
+    assert set(report.objects) == {'Design1/Air', 'Design1/FR4', 'Design1/Patch4'}
+    assert report.commands['assignsymmetry'] == 2
+
+
+def test_plane_types_must_be_known():
+    with pytest.raises(Exception):
+        applySymmetry(design(dipole), Boundaries={'X': 'H'})
+    assert applySymmetry(design(dipole), CurrentAxis='Z', Planes='z') == {'Z': 'E'}
+    assert applySymmetry(Model()) == {}
+
+
+def test_subtracted_and_united_parts_do_not_mirror():
+    def mixed(model):
+        modeler.hfssBox(model, 'Right', [5, -5, -5], [10, 10, 10], 'mm')
+        modeler.hfssCylinder(model, 'Drill', 'Z', [10, 0, -5], 1, 10, 'mm')
+        booleans.hfssSubtract(model, 'Right', 'Drill')
+        modeler.hfssBox(model, 'Left', [-15, -5, -5], [10, 10, 10], 'mm')
+        modeler.hfssCylinder(model, 'Peg', 'Z', [-10, 0, -5], 1, 10, 'mm')
+        booleans.hfssUnite(model, ['Left', 'Peg'])
+    assert findSymmetry(design(mixed).nodes) == ['Y', 'Z']
+
+
+def test_region_covers_the_united_parts():
+    def rod(model):
+        modeler.hfssBox(model, 'Core', [-10, -10, -10], [20, 20, 20], 'mm')
+        modeler.hfssCylinder(model, 'Rod', 'X', [-40, 0, 0], 1, 80, 'mm')
+        booleans.hfssUnite(model, ['Core', 'Rod'])
+    model = design(rod)
+    assert applySymmetry(model, CurrentAxis='Z', Padding=0.005) == \
+        {'X': 'H', 'Y': 'H', 'Z': 'E'}
+    region = [node for node in model.nodes
+              if node.kind == 'box' and node.params['Name'] == 'SymmetryRegion'][0]
+    assert region.params['Start'] == [0, 0, 0]
+    assert region.params['Size'] == [45, 15, 15]
+    assert runScript(model.getvalue()).errors == []